@@ -1,7 +1,15 @@
 from google import genai
 from google.genai import types
-import random
-import string
+import os
+import sys
+
+# Make the shared fc_toolkit package importable when running this script directly
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from fc_toolkit import ToolDispatcher, client_from_env, error_response, generate_passwords, password_strength
+
+# Upper bounds on what one call may ask for, whatever arguments the model sends
+MAX_PASSWORD_LENGTH = 128
+MAX_BATCH_SIZE = 10_000
 
 # Step 1: Define a simple function declaration
 generate_password_declaration = {
@@ -12,7 +20,7 @@ generate_password_declaration = {
         "properties": {
             "length": {
                 "type": "integer",
-                "description": "The desired length of the password (minimum 8)",
+                "description": "The desired length of the password (minimum 8, maximum 128)",
             },
             "include_symbols": {
                 "type": "boolean", 
@@ -23,30 +31,76 @@ generate_password_declaration = {
     },
 }
 
+# A bulk variant for provisioning many accounts in one call
+generate_password_batch_declaration = {
+    "name": "generate_password_batch",
+    "description": "Generates many secure passwords at once, e.g. for provisioning a batch of accounts",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "count": {
+                "type": "integer",
+                "description": "How many passwords to generate (1-10000)",
+            },
+            "length": {
+                "type": "integer",
+                "description": "The desired length of each password (minimum 8, maximum 128)",
+            },
+            "include_symbols": {
+                "type": "boolean",
+                "description": "Whether to include special symbols in the passwords",
+            },
+        },
+        "required": ["count", "length", "include_symbols"],
+    },
+}
+
 # Step 2: Define the actual function
 def generate_password(length: int, include_symbols: bool) -> dict:
     """Generate a secure password with specified criteria"""
     if length < 8:
         length = 8  # Minimum security requirement
+    if length > MAX_PASSWORD_LENGTH:
+        return error_response("generate_password", "invalid_arguments",
+                              f"length must be at most {MAX_PASSWORD_LENGTH}")
     
-    # Define character sets
-    characters = string.ascii_letters + string.digits
-    if include_symbols:
-        characters += "!@#$%^&*"
-    
-    # Generate password
-    password = ''.join(random.choice(characters) for _ in range(length))
+    # Generate password from the OS CSPRNG (letters and digits, plus !@#$%^&* with symbols):
+    # random.choice is predictable and not meant for secrets
+    password = generate_passwords(1, length, include_symbols)[0]
     
     return {
         "password": password,
         "length": len(password),
         "has_symbols": include_symbols,
-        "strength": "Strong" if length >= 12 and include_symbols else "Good"
+        "strength": password_strength(length, include_symbols)
+    }
+
+def generate_password_batch(count: int, length: int, include_symbols: bool) -> dict:
+    """Generate many secure passwords with the same criteria in one pass"""
+    length = max(length, 8)
+    if length > MAX_PASSWORD_LENGTH:
+        return error_response("generate_password_batch", "invalid_arguments",
+                              f"length must be at most {MAX_PASSWORD_LENGTH}")
+    if not 1 <= count <= MAX_BATCH_SIZE:
+        return error_response("generate_password_batch", "invalid_arguments",
+                              f"count must be between 1 and {MAX_BATCH_SIZE}")
+    return {
+        "passwords": generate_passwords(count, length, include_symbols),
+        "count": count,
+        "length": length,
+        "has_symbols": include_symbols,
+        "strength": password_strength(length, include_symbols)
     }
 
 # Step 3: Set up Gemini with the function
-client = genai.Client()
-tools = types.Tool(function_declarations=[generate_password_declaration])
+# The dispatcher maps each function name to the function that implements it
+# and uses the declaration to validate the arguments the model sends
+dispatcher = ToolDispatcher(
+    {"generate_password": generate_password, "generate_password_batch": generate_password_batch},
+    declarations=[generate_password_declaration, generate_password_batch_declaration],
+)
+client = client_from_env()  # FC_STANDIN=replay:<file> runs against a local recording
+tools = types.Tool(function_declarations=[generate_password_declaration, generate_password_batch_declaration])
 config = types.GenerateContentConfig(tools=[tools])
 
 # Step 4: Ask Gemini to solve a problem
@@ -63,6 +117,5 @@ function_call = response.candidates[0].content.parts[0].function_call
 print(f"Function suggested: {function_call.name}")
 print(f"Arguments: {dict(function_call.args)}")
 
-# Step 6: Execute the function
-if function_call.name == "generate_password":
-    result = generate_password(**function_call.args)
\ No newline at end of file
+# Step 6: Execute the function through the dispatcher (no if-branch per function)
+result = dispatcher.call(function_call.name, function_call.args)
\ No newline at end of file
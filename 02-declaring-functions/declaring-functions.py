@@ -1,7 +1,19 @@
 from google import genai
 from google.genai import types
+import os
+import sys
 import requests
 
+# Make the shared fc_toolkit package importable when running this script directly
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from fc_toolkit import TTLCache, ToolDispatcher, client_from_env, http_get, single_flight
+
+JSONPLACEHOLDER_URL = "https://jsonplaceholder.typicode.com"
+
+# The user collection rarely changes, so keep it for 5 minutes and answer
+# every fetch_users / get_user_details call from the cached copy
+users_cache = TTLCache(maxsize=8, ttl=300)
+
 # Step 1: Define function declarations for API operations
 
 # Function 1: Fetch list of users with options
@@ -41,17 +53,27 @@ get_user_details_declaration = {
 }
 
 # Step 2: Implement the actual functions
+# Both functions go through the shared HTTP session so repeated tool calls
+# reuse the same keep-alive connection instead of reconnecting every time.
+# @single_flight makes identical calls that arrive at the same time share one execution
+
+def get_all_users() -> list:
+    """Returns the full user collection, fetching it only when the cache is empty or stale"""
+    def load():
+        response = http_get(f"{JSONPLACEHOLDER_URL}/users")
+        response.raise_for_status()
+        return response.json()
+
+    return users_cache.get_or_load("users", load)
 
+@single_flight
 def fetch_users(max_users: int, include_email: bool) -> dict:
     """Fetch users from JSONPlaceholder API"""
     try:
         # Limit max_users to reasonable range
         max_users = min(max_users, 10)
         
-        response = requests.get("https://jsonplaceholder.typicode.com/users")
-        response.raise_for_status()
-        
-        all_users = response.json()
+        all_users = get_all_users()
         limited_users = all_users[:max_users]
         
         # Format user list based on email preference
@@ -78,13 +100,17 @@ def fetch_users(max_users: int, include_email: bool) -> dict:
     except requests.RequestException as e:
         return {"error": f"Failed to fetch users: {str(e)}"}
 
+@single_flight
 def get_user_details(user_id: int) -> dict:
     """Get detailed information for a specific user"""
     try:
-        response = requests.get(f"https://jsonplaceholder.typicode.com/users/{user_id}")
-        response.raise_for_status()
-        
-        user = response.json()
+        # Look the user up in the cached collection first
+        user = next((u for u in get_all_users() if u["id"] == user_id), None)
+
+        if user is None:
+            response = http_get(f"{JSONPLACEHOLDER_URL}/users/{user_id}")
+            response.raise_for_status()
+            user = response.json()
         
         return {
             "id": user["id"],
@@ -101,7 +127,17 @@ def get_user_details(user_id: int) -> dict:
         return {"error": f"Failed to fetch user details: {str(e)}"}
 
 # Step 3: Set up Gemini with both functions
-client = genai.Client()
+# The dispatcher looks up the function to run by name, whichever one the model picks.
+# Passing the declarations lets it check and coerce the arguments (e.g. max_users
+# sent as 5.0, or outside 1-10) before the function runs
+dispatcher = ToolDispatcher(
+    {
+        "fetch_users": fetch_users,
+        "get_user_details": get_user_details,
+    },
+    declarations=[fetch_users_declaration, get_user_details_declaration],
+)
+client = client_from_env()  # FC_STANDIN=replay:<file> runs against a local recording
 tools = types.Tool(function_declarations=[fetch_users_declaration, get_user_details_declaration])
 config = types.GenerateContentConfig(tools=[tools])
 
@@ -121,14 +157,9 @@ print(f"Function suggested: {function_call1.name}")
 print(f"Arguments: {dict(function_call1.args)}")
 
 # Execute the function
-if function_call1.name == "fetch_users":
-    result1 = fetch_users(**function_call1.args)
-    
-    # Send result back to Gemini
-    function_response1 = types.Part.from_function_response(
-        name=function_call1.name,
-        response={"result": result1},
-    )
+if function_call1.name in dispatcher:
+    # Run the function and wrap its result (or error) for Gemini
+    function_response1 = dispatcher.dispatch(function_call1)
     
     contents1 = [
         types.Content(role="user", parts=[types.Part(text=user_question1)]),
@@ -162,14 +193,9 @@ print(f"Function suggested: {function_call2.name}")
 print(f"Arguments: {dict(function_call2.args)}")
 
 # Execute the function
-if function_call2.name == "get_user_details":
-    result2 = get_user_details(**function_call2.args)
-    
-    # Send result back to Gemini
-    function_response2 = types.Part.from_function_response(
-        name=function_call2.name,
-        response={"result": result2},
-    )
+if function_call2.name in dispatcher:
+    # Run the function and wrap its result (or error) for Gemini
+    function_response2 = dispatcher.dispatch(function_call2)
     
     contents2 = [
         types.Content(role="user", parts=[types.Part(text=user_question2)]),
@@ -183,4 +209,7 @@ if function_call2.name == "get_user_details":
         config=config,
     )
     
-    print(f"Final answer: {final_response2.text}")
\ No newline at end of file
+    print(f"Final answer: {final_response2.text}")
+
+print("\n" + "="*50)
+print(f"Users cache: {users_cache.stats.as_dict()}")
@@ -1,6 +1,13 @@
+import os
+import sys
+
 from google import genai
 from google.genai import types
 
+# Make the shared fc_toolkit package importable when running this script directly
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from fc_toolkit import ResponseCache, client_from_env
+
 # Step 1: Define a simple function for demonstration
 get_time_declaration = {
     "name": "get_current_time",
@@ -20,9 +27,13 @@ get_time_declaration = {
 
 
 # Step 2: Set up client and tools
-client = genai.Client()
+client = client_from_env()  # FC_STANDIN=replay:<file> runs against a local recording
 tools = types.Tool(function_declarations=[get_time_declaration])
 
+# Opt-in response cache: set FC_RESPONSE_CACHE=/path/to/cache.jsonl so that
+# asking the same prompt in the same mode again is answered from disk
+response_cache = ResponseCache.from_env()
+
 print("=== FUNCTION CALLING MODES DEMONSTRATION ===\n")
 
 # Test prompt that could use the function
@@ -58,7 +69,8 @@ tool_config=types.ToolConfig(
 """
 
 
-response = client.models.generate_content(
+response = response_cache.generate_content(
+    client,
     model="gemini-2.5-flash",
     contents=test_prompt,
     config=generation_config,
@@ -1,6 +1,12 @@
 from google import genai
 from google.genai import types
 import json
+import os
+import sys
+
+# Make the shared fc_toolkit package importable when running this script directly
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from fc_toolkit import UsageTracker, client_from_env
 
 # Step 1: Define a minimal function
 simple_function_declaration = {
@@ -19,12 +25,17 @@ simple_function_declaration = {
 }
 
 # Step 2: Set up Gemini
-client = genai.Client()
+client = client_from_env()  # FC_STANDIN=replay:<file> runs against a local recording
 tools = types.Tool(function_declarations=[simple_function_declaration])
 config = types.GenerateContentConfig(tools=[tools])
 
+# The tracker records usage_metadata per request, session and tool set,
+# and refuses requests projected to go over the prompt token budget
+usage_tracker = UsageTracker(max_prompt_tokens=2000)
+
 # Step 3: Make a simple request
-response = client.models.generate_content(
+response = usage_tracker.generate_content(
+    client,
     model="gemini-2.5-flash",
     contents="Say hello to Alice",
     config=config,
@@ -85,4 +96,10 @@ response_dict = response_to_dict(response)
 print("1. FORMATTED JSON RESPONSE:")
 print("=" * 50)
 print(json.dumps(response_dict, indent=2, ensure_ascii=False))
-# print(response)
\ No newline at end of file
+# print(response)
+
+print("\n2. RUNNING TOKEN TOTALS:")
+print("=" * 50)
+print(f"All requests: {usage_tracker.totals}")
+for tool_set, totals in usage_tracker.tool_sets.items():
+    print(f"Tool set [{tool_set}]: {totals}")
@@ -9,6 +9,9 @@ from google import genai
 from google.genai import types
 import re
 
+# Basic email regex pattern, compiled once instead of on every call
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
 # Define the function with docstring instead of having a separate declaration
 # This function cannot have default values if you want to use automatic function calling
 def validate_email(email: str, check_domain: bool) -> dict:
@@ -22,9 +25,6 @@ def validate_email(email: str, check_domain: bool) -> dict:
         A dictionary containing validation results, components, and any issues found.
     """
     
-    # Basic email regex pattern
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    
     result = {
         "email": email,
         "is_valid": False,
@@ -34,7 +34,7 @@ def validate_email(email: str, check_domain: bool) -> dict:
     }
     
     # Check if email matches basic pattern
-    if re.match(email_pattern, email):
+    if EMAIL_PATTERN.match(email):
         result["is_valid"] = True
         local_part, domain = email.split('@', 1)
         result["local_part"] = local_part
@@ -1,7 +1,62 @@
+import os
+import sys
+
 from google import genai
 from google.genai import types
 
+# Make the shared fc_toolkit package importable when running this script directly
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from fc_toolkit import (ForecastEngine, LocationResolver, Speculator, ToolDispatcher, client_from_env,
+                        declaration_from_function, from_result, run_plan_mode, single_flight)
+
+# The chain is almost always location -> forecast -> notification, so as soon as
+# get_user_location returns, the forecast for its full_location is started in the
+# background. The number of days is the model's choice: it is learned from the
+# forecast asked for in an earlier conversation (min_support=1, so one is enough),
+# and until then nothing is speculated: the first request below teaches it, the
+# plan mode run gets its forecast from speculation.
+# Only the read-only lookups are safe to speculate, never send_notification
+speculator = Speculator(
+    safe_tools={"get_user_location", "get_weather_forecast"},
+    min_support=1,
+    rules={
+        "get_user_location": {
+            "get_weather_forecast": {"location": from_result("full_location")},
+        },
+    },
+)
+
+# Locations are resolved against a gazetteer index built once, so "Seattle, WA", "seatle wa"
+# and "London, UK" all find their place without scanning every name. Set FC_GAZETTEER to a
+# GeoNames dump (or a CSV/JSONL file of places) to use it instead of the sample
+SAMPLE_PLACES = [
+    {"name": "Seattle", "admin1": "WA", "admin1_name": "Washington", "country": "US", "population": 755_078},
+    {"name": "London", "admin1": "ENG", "admin1_name": "England", "country": "GB", "population": 8_961_989,
+     "country_name": "United Kingdom"},
+    {"name": "London", "admin1": "ON", "admin1_name": "Ontario", "country": "CA", "population": 422_324,
+     "country_name": "Canada"},
+    {"name": "Toronto", "admin1": "ON", "admin1_name": "Ontario", "country": "CA", "population": 2_794_356},
+    {"name": "San Francisco", "admin1": "CA", "admin1_name": "California", "country": "US", "population": 808_437,
+     "aliases": ["SF"]},
+]
+places = LocationResolver.from_file(os.environ["FC_GAZETTEER"]) if os.environ.get("FC_GAZETTEER") \
+    else LocationResolver.from_records(SAMPLE_PLACES)
+
+# Mock weather data by resolved place. The same patterns are also held as arrays, so
+# get_weather_forecasts can compute many locations x days in one go
+WEATHER_PATTERNS = {
+    ("Seattle", "US"): {"base_temp": 15, "condition": "rainy", "variation": 3},
+    ("London", "GB"): {"base_temp": 12, "condition": "cloudy", "variation": 2},
+    ("Toronto", "CA"): {"base_temp": 8, "condition": "snowy", "variation": 4},
+    ("San Francisco", "US"): {"base_temp": 18, "condition": "sunny", "variation": 1}
+}
+forecasts = ForecastEngine(WEATHER_PATTERNS)
+
 # Step 1: Define sequential functions that depend on each other's results
+# The lookups are wrapped with @single_flight so that identical concurrent calls
+# share one execution. send_notification is not, every notification must be sent
+@speculator.wrap
+@single_flight
 def get_user_location(user_id: str) -> dict:
     """Gets the stored location for a user by their ID.
     
@@ -37,6 +92,8 @@ def get_user_location(user_id: str) -> dict:
             "full_location": ""
         }
 
+@speculator.wrap
+@single_flight
 def get_weather_forecast(location: str, days: int) -> dict:
     """Gets the weather forecast for a specific location and number of days.
     
@@ -47,29 +104,28 @@ def get_weather_forecast(location: str, days: int) -> dict:
     Returns:
         A dictionary containing weather forecast information.
     """
-    # Mock weather data based on location
-    weather_patterns = {
-        "seattle": {"base_temp": 15, "condition": "rainy", "variation": 3},
-        "london": {"base_temp": 12, "condition": "cloudy", "variation": 2},
-        "toronto": {"base_temp": 8, "condition": "snowy", "variation": 4},
-        "san francisco": {"base_temp": 18, "condition": "sunny", "variation": 1}
-    }
-    
-    # Find matching weather pattern
-    location_key = None
-    for city in weather_patterns:
-        if city in location.lower():
-            location_key = city
-            break
+    # Resolve the free-text location to one place, e.g. "London, ON" is not London, UK.
+    # Qualifiers like "area" or "downtown" are ignored, ones naming another region are not
+    place = places.resolve(location)
+    if place is None or place.conflicting:
+        result = {
+            "location": location,
+            "error": "Could not find this location",
+            "forecast": []
+        }
+        if place is not None:
+            result["did_you_mean"] = place.label
+        return result
     
-    if not location_key:
+    pattern = WEATHER_PATTERNS.get((place.name, place.country))
+    if not pattern:
         return {
             "location": location,
+            "resolved_location": place.label,
             "error": "Weather data not available for this location",
             "forecast": []
         }
     
-    pattern = weather_patterns[location_key]
     forecast = []
     
     for day in range(1, min(days + 1, 8)):  # Max 7 days
@@ -83,11 +139,36 @@ def get_weather_forecast(location: str, days: int) -> dict:
     
     return {
         "location": location,
+        "resolved_location": place.label,
         "days_requested": days,
         "forecast": forecast,
         "summary": f"{days}-day forecast for {location}"
     }
 
+def get_weather_forecasts(locations: list[str], days: int) -> dict:
+    """Gets the weather forecast for many locations at once, as one table.
+    
+    Args:
+        locations: The location strings (e.g., ['Seattle, WA', 'London, UK'])
+        days: Number of days to forecast (1-7)
+    
+    Returns:
+        A table with one row per location: condition, temperature for each day, low and high.
+    """
+    keys, labels, not_found = [], {}, []
+    for location in locations:
+        place = places.resolve(location)
+        if place is None or place.conflicting:
+            not_found.append(location)
+            continue
+        key = (place.name, place.country)
+        keys.append(key)
+        labels[key] = place.label
+    
+    table = forecasts.table(keys, days, labels)
+    table["not_found"] = not_found + table["not_found"]
+    return table
+
 def send_notification(user_id: str, message: str) -> dict:
     """Sends a notification message to a user.
     
@@ -121,26 +202,51 @@ def send_notification(user_id: str, message: str) -> dict:
     return notification_details
 
 # Step 2: Configure the client with automatic function calling
-client = genai.Client()
+client = client_from_env()  # FC_STANDIN=replay:<file> runs against a local recording
 
 # Pass all Python functions - SDK will handle sequential calling automatically
 config = types.GenerateContentConfig(
-    tools=[get_user_location, get_weather_forecast, send_notification]
+    tools=[get_user_location, get_weather_forecast, get_weather_forecasts, send_notification]
 )
 
 print("=== COMPOSITIONAL FUNCTION CALLING EXAMPLE ===\n")
 print("User request: Get weather for user123's location and notify them\n")
 
 # Step 3: Make request that requires sequential function calls
-response = client.models.generate_content(
-    model="gemini-2.5-flash",
-    contents="Can you look up where user123 is located, get a 3-day weather forecast for their city, and then send them a notification with the weather summary?",
-    config=config,
-)
+# The speculator pairs up calls made within one conversation only
+with speculator.conversation():
+    response = client.models.generate_content(
+        model="gemini-2.5-flash",
+        contents="Can you look up where user123 is located, get a 3-day weather forecast for their city, and then send them a notification with the weather summary?",
+        config=config,
+    )
 
 # Step 4: Display the final result
 print("Final response:")
 print(response.text)
+print(f"\nSpeculation: {speculator.stats}")
+
+# Step 5: The same request in plan mode
+# The model plans the whole chain in one call, with the forecast's location taken
+# from the location result, the chain runs locally and only the final results go
+# back for the answer: 2 model calls instead of 4
+print("\n=== PLAN MODE ===\n")
+tools = [get_user_location, get_weather_forecast, send_notification]
+declarations = [declaration_from_function(tool) for tool in tools]
+dispatcher = ToolDispatcher({tool.__name__: tool for tool in tools}, declarations)
+
+contents = [types.Content(role="user", parts=[types.Part(text=(
+    "Can you look up where user123 is located, get a 3-day weather forecast for their city, "
+    "and then send them a notification with the weather summary?"))])]
+with speculator.conversation():
+    plan_run = run_plan_mode(client, model="gemini-2.5-flash", contents=contents,
+                             declarations=declarations, dispatcher=dispatcher)
+
+for step in plan_run.steps:
+    print(f"{step.id}: {step.tool}({step.args})")
+print(f"\nFinal response ({plan_run.model_calls} model calls):")
+print(plan_run.response.text)
+print(f"\nSpeculation: {speculator.stats}")
 
 """ 
 print("\n" + "="*70)
@@ -1,48 +1,25 @@
+import os
+import sys
+
 from google import genai
 from google.genai import types
 
-# Step 1: Define function declarations
-check_balance_declaration = {
-    "name": "check_balance",
-    "description": "Checks the account balance for a given account ID",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "account_id": {
-                "type": "string",
-                "description": "The account ID to check (e.g., 'ACC123')",
-            }
-        },
-        "required": ["account_id"],
-    },
-}
-
-transfer_money_declaration = {
-    "name": "transfer_money",
-    "description": "Transfers money between accounts",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "from_account": {
-                "type": "string",
-                "description": "Source account ID",
-            },
-            "to_account": {
-                "type": "string",
-                "description": "Destination account ID",
-            },
-            "amount": {
-                "type": "number",
-                "description": "Amount to transfer",
-            }
-        },
-        "required": ["from_account", "to_account", "amount"],
-    },
-}
-
-# Step 2: Implement functions
+# Make the shared fc_toolkit package importable when running this script directly
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from fc_toolkit import ConversationHistory, ToolDispatcher, ToolRegistry, UsageTracker, client_from_env
+
+# Step 1: Create a registry, it builds each function declaration once
+# from the type hints and docstring, so no hand-written declaration dicts are needed
+registry = ToolRegistry()
+
+# Step 2: Implement and register the functions
+@registry.register
 def check_balance(account_id: str) -> dict:
-    """Mock function to check account balance"""
+    """Checks the account balance for a given account ID
+
+    Args:
+        account_id: The account ID to check (e.g., 'ACC123')
+    """
     balances = {
         "ACC123": 1500.00,
         "ACC456": 800.00,
@@ -56,8 +33,15 @@ def check_balance(account_id: str) -> dict:
         "currency": "USD"
     }
 
+@registry.register
 def transfer_money(from_account: str, to_account: str, amount: float) -> dict:
-    """Mock function to transfer money"""
+    """Transfers money between accounts
+
+    Args:
+        from_account: Source account ID
+        to_account: Destination account ID
+        amount: Amount to transfer
+    """
     return {
         "transaction_id": "TXN987654",
         "from_account": from_account,
@@ -68,14 +52,25 @@ def transfer_money(from_account: str, to_account: str, amount: float) -> dict:
     }
 
 # Step 3: Set up Gemini
-client = genai.Client()
-tools = types.Tool(function_declarations=[check_balance_declaration, transfer_money_declaration])
-config = types.GenerateContentConfig(tools=[tools])
+# registry.config() copies a config built once instead of rebuilding the declarations
+client = client_from_env()  # FC_STANDIN=replay:<file> runs against a local recording
+config = registry.config()
+dispatcher = ToolDispatcher.from_registry(registry)
 
 print("=== MULTI-TURN FUNCTION CALLING DEMO ===\n")
 
 # Step 4: Start a conversation that will require multiple function calls
-conversation_history = []
+# The history keeps the latest turn verbatim and compacts older ones; a transfer
+# makes any earlier balance check stale, so that result is dropped entirely
+conversation_history = ConversationHistory(
+    token_budget=4000,
+    keep_recent_turns=1,
+    supersedes={"transfer_money": ["check_balance"]},
+)
+
+# Every request goes through the usage tracker, which records the real token
+# counts and compacts the history further if a request would exceed 2000 prompt tokens
+usage_tracker = UsageTracker(max_prompt_tokens=2000)
 
 # First turn
 print("TURN 1: User asks for balance check")
@@ -86,7 +81,8 @@ conversation_history.append(
     types.Content(role="user", parts=[types.Part(text=user_message1)])
 )
 
-response1 = client.models.generate_content(
+response1 = usage_tracker.generate_content(
+    client,
     model="gemini-2.5-flash",
     contents=conversation_history,
     config=config,
@@ -97,21 +93,19 @@ function_call1 = response1.candidates[0].content.parts[0].function_call
 print(f"Function called: {function_call1.name}")
 print(f"Arguments: {dict(function_call1.args)}")
 
-result1 = check_balance(**function_call1.args)
+result1 = dispatcher.call(function_call1.name, function_call1.args)
 
 # Add model response and function result to history
 conversation_history.append(response1.candidates[0].content)
 conversation_history.append(
     types.Content(role="user", parts=[
-        types.Part.from_function_response(
-            name=function_call1.name,
-            response={"result": result1}
-        )
+        dispatcher.response_part(function_call1.name, result1)
     ])
 )
 
 # Get model's response after function execution
-final_response1 = client.models.generate_content(
+final_response1 = usage_tracker.generate_content(
+    client,
     model="gemini-2.5-flash",
     contents=conversation_history,
     config=config,
@@ -131,7 +125,8 @@ conversation_history.append(
     types.Content(role="user", parts=[types.Part(text=user_message2)])
 )
 
-response2 = client.models.generate_content(
+response2 = usage_tracker.generate_content(
+    client,
     model="gemini-2.5-flash",
     contents=conversation_history,
     config=config,
@@ -142,21 +137,19 @@ function_call2 = response2.candidates[0].content.parts[0].function_call
 print(f"Function called: {function_call2.name}")
 print(f"Arguments: {dict(function_call2.args)}")
 
-result2 = transfer_money(**function_call2.args)
+result2 = dispatcher.call(function_call2.name, function_call2.args)
 
 # Add to conversation history
 conversation_history.append(response2.candidates[0].content)
 conversation_history.append(
     types.Content(role="user", parts=[
-        types.Part.from_function_response(
-            name=function_call2.name,
-            response={"result": result2}
-        )
+        dispatcher.response_part(function_call2.name, result2)
     ])
 )
 
 # Get final response
-final_response2 = client.models.generate_content(
+final_response2 = usage_tracker.generate_content(
+    client,
     model="gemini-2.5-flash",
     contents=conversation_history,
     config=config,
@@ -165,4 +158,9 @@ final_response2 = client.models.generate_content(
 print(f"Model response: {final_response2.text}")
 conversation_history.append(final_response2.candidates[0].content)
 
-print("\n" + "="*50)
\ No newline at end of file
+print("\n" + "="*50)
+
+stats = conversation_history.stats
+print(f"Prompt tokens (estimated): {stats.sent_tokens} sent vs {stats.full_tokens} for the full history "
+      f"({stats.savings_ratio:.0%} saved)")
+print(f"Prompt tokens (actual): {usage_tracker.totals.prompt_tokens} over {usage_tracker.totals.requests} requests")
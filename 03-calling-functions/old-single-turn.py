@@ -33,13 +33,13 @@ validate_email_declaration = {
     },
 }
 
+# Basic email regex pattern, compiled once instead of on every call
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
 # Define the function
 def validate_email(email: str, check_domain: bool = True) -> dict:
     """Validate email address and return detailed analysis"""
     
-    # Basic email regex pattern
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    
     result = {
         "email": email,
         "is_valid": False,
@@ -49,7 +49,7 @@ def validate_email(email: str, check_domain: bool = True) -> dict:
     }
     
     # Check if email matches basic pattern
-    if re.match(email_pattern, email):
+    if EMAIL_PATTERN.match(email):
         result["is_valid"] = True
         local_part, domain = email.split('@', 1)
         result["local_part"] = local_part
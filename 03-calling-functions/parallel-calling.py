@@ -2,12 +2,38 @@
 Calling Mutiple Functions at the same time
 """
 
+import os
+import sys
+
 from google import genai
 from google.genai import types
 
+# Make the shared fc_toolkit package importable when running this script directly
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from fc_toolkit import (CityFacts, ToolDispatcher, client_from_env, get_function_calls, run_function_calls,
+                        stream_conversation)
+
 GEMINI_MODEL="gemini-2.5-flash"
 
-# Step 1: Define multiple independent functions with type hints and docstrings
+# Step 1: Load the facts about every city once
+# One normalized-name index into columnar data serves all the tools below.
+# Set FC_CITY_FACTS to a CSV/JSONL file of cities to use it instead of the sample
+SAMPLE_CITIES = [
+    {"name": "New York", "temperature": 22, "condition": "sunny", "tz_name": "EST", "tz_offset_minutes": -300,
+     "population": 8_300_000, "metro_population": 20_100_000},
+    {"name": "London", "temperature": 15, "condition": "cloudy", "tz_name": "GMT", "tz_offset_minutes": 0,
+     "population": 9_000_000, "metro_population": 15_800_000},
+    {"name": "Tokyo", "temperature": 28, "condition": "humid", "tz_name": "JST", "tz_offset_minutes": 540,
+     "population": 13_900_000, "metro_population": 37_400_000},
+    {"name": "Paris", "temperature": 18, "condition": "rainy", "tz_name": "CET", "tz_offset_minutes": 60,
+     "population": 2_200_000, "metro_population": 12_200_000},
+    {"name": "Sydney", "temperature": 25, "condition": "clear", "tz_name": "AEDT", "tz_offset_minutes": 660,
+     "population": 5_300_000, "metro_population": 5_400_000},
+]
+city_facts = CityFacts.from_file(os.environ["FC_CITY_FACTS"]) if os.environ.get("FC_CITY_FACTS") \
+    else CityFacts.from_records(SAMPLE_CITIES)
+
+# Step 2: Define multiple independent functions with type hints and docstrings
 def get_current_temperature(city: str) -> dict:
     """Gets the current temperature for a given city.
     
@@ -17,22 +43,7 @@ def get_current_temperature(city: str) -> dict:
     Returns:
         A dictionary containing temperature information for the city.
     """
-    # Mock temperature data
-    temperatures = {
-        "new york": {"temp": 22, "unit": "°C", "condition": "sunny"},
-        "london": {"temp": 15, "unit": "°C", "condition": "cloudy"},
-        "tokyo": {"temp": 28, "unit": "°C", "condition": "humid"},
-        "paris": {"temp": 18, "unit": "°C", "condition": "rainy"},
-        "sydney": {"temp": 25, "unit": "°C", "condition": "clear"}
-    }
-    
-    city_lower = city.lower()
-    if city_lower in temperatures:
-        result = temperatures[city_lower].copy()
-        result["city"] = city
-        return result
-    else:
-        return {"city": city, "temp": "N/A", "unit": "°C", "condition": "unknown"}
+    return city_facts.temperature_of(city)
     
 
 def get_time_zone(city: str) -> dict:
@@ -44,22 +55,7 @@ def get_time_zone(city: str) -> dict:
     Returns:
         A dictionary containing time zone information for the city.
     """
-    # Mock timezone data
-    timezones = {
-        "new york": {"timezone": "EST (UTC-5)", "current_time": "14:30"},
-        "london": {"timezone": "GMT (UTC+0)", "current_time": "19:30"},
-        "tokyo": {"timezone": "JST (UTC+9)", "current_time": "04:30"},
-        "paris": {"timezone": "CET (UTC+1)", "current_time": "20:30"},
-        "sydney": {"timezone": "AEDT (UTC+11)", "current_time": "06:30"}
-    }
-    
-    city_lower = city.lower()
-    if city_lower in timezones:
-        result = timezones[city_lower].copy()
-        result["city"] = city
-        return result
-    else:
-        return {"city": city, "timezone": "UTC+0", "current_time": "Unknown"}
+    return city_facts.time_zone_of(city)
     
 def get_population(city: str) -> dict:
     """Gets the population information for a given city.
@@ -70,50 +66,86 @@ def get_population(city: str) -> dict:
     Returns:
         A dictionary containing population information for the city.
     """
-    # Mock population data
-    populations = {
-        "new york": {"population": "8.3 million", "metro_area": "20.1 million"},
-        "london": {"population": "9.0 million", "metro_area": "15.8 million"},
-        "tokyo": {"population": "13.9 million", "metro_area": "37.4 million"},
-        "paris": {"population": "2.2 million", "metro_area": "12.2 million"},
-        "sydney": {"population": "5.3 million", "metro_area": "5.4 million"}
-    }
+    return city_facts.population_of(city)
+
+def get_city_profile(cities: list[str], fields: list[str]) -> dict:
+    """Gets several facts about several cities in one call.
+    
+    Args:
+        cities: The names of the cities (e.g., ['New York', 'London'])
+        fields: The facts to return, any of 'temperature' (in °C), 'condition', 'timezone', 'current_time', 'population', 'metro_area'
     
-    city_lower = city.lower()
-    if city_lower in populations:
-        result = populations[city_lower].copy()
-        result["city"] = city
-        return result
-    else:
-        return {"city": city, "population": "Unknown", "metro_area": "Unknown"}
+    Returns:
+        A table with one row per city and one column per requested fact.
+    """
+    return city_facts.profile(cities, fields)
 
 # Define Client
-client = genai.Client()
+client = client_from_env()  # FC_STANDIN=replay:<file> runs against a local recording
 
-# Define configuration using automatic function calling
+# Map each function name the model can call to the Python function that implements it
+available_functions = {
+    "get_current_temperature": get_current_temperature,
+    "get_time_zone": get_time_zone,
+    "get_population": get_population,
+    "get_city_profile": get_city_profile,
+}
+dispatcher = ToolDispatcher(available_functions)
+
+# Pass the functions as tools, but turn off automatic function calling
+# so that we can execute all of the parallel calls ourselves, concurrently
 config = types.GenerateContentConfig(
-    tools=[get_current_temperature, get_time_zone, get_population]
+    tools=list(available_functions.values()),
+    automatic_function_calling=types.AutomaticFunctionCallingConfig(disable=True),
 )
 
+def ask(prompt: str) -> str:
+    """Sends a prompt, runs every function call the model asks for, and returns the final answer"""
+    contents = [types.Content(role="user", parts=[types.Part(text=prompt)])]
+
+    response = client.models.generate_content(
+        model=GEMINI_MODEL,
+        contents=contents,
+        config=config,
+    )
+
+    # Collect every function call in the candidate, not just parts[0]
+    function_calls = get_function_calls(response)
+    if not function_calls:
+        return response.text
+
+    for function_call in function_calls:
+        print(f"Function called: {function_call.name}({dict(function_call.args or {})})")
+
+    # Run all the calls at the same time, the responses come back in call order
+    function_response_parts = run_function_calls(function_calls, dispatcher)
+
+    # Send all the results back to the model in a single follow-up turn
+    contents.append(response.candidates[0].content)
+    contents.append(types.Content(role="user", parts=function_response_parts))
+
+    final_response = client.models.generate_content(
+        model=GEMINI_MODEL,
+        contents=contents,
+        config=config,
+    )
+    return final_response.text
+
 print("=== PARALLEL FUNCTION CALLING EXAMPLE ===\n")
 print("User request: Get comprehensive information about Tokyo\n")
 
-response = client.models.generate_content(
-    model=GEMINI_MODEL,
-    contents="I'm planning a trip to Tokyo. Can you give me the current temperature, time zone, and population information for Tokyo? I need all this information at once.",
-    config=config
-)
+response_text = ask("I'm planning a trip to Tokyo. Can you give me the current temperature, time zone, and population information for Tokyo? I need all this information at once.")
 
 # Step 4: Display the final result
-# Automatic function calling handles all parallel execution behind the scenes
+# All the parallel function calls were executed concurrently by run_function_calls
 print("Final response:")
-print(response.text)
+print(response_text)
 
 """ print("\n" + "="*65)
 print("WHAT HAPPENED WITH PARALLEL FUNCTION CALLING:")
 print("1. Model analyzed the request for Tokyo information")
 print("2. Model identified need for temperature, timezone, AND population")
-print("3. SDK executed ALL THREE functions simultaneously (in parallel)")
+print("3. run_function_calls executed ALL THREE functions simultaneously (in parallel)")
 print("4. All function results were collected and sent back together")
 print("5. Model generated comprehensive response using all results")
 print("="*65) """
@@ -125,11 +157,32 @@ print("\n" + "="*65)
 print("Multiple cities example")
 print("="*65)
 
-response2 = client.models.generate_content(
+# get_city_profile lets the model answer this with one call instead of one call per city
+response2_text = ask("Compare the current temperature in New York and London right now.")
+
+print("\nResponse for multiple cities:")
+print(response2_text)
+
+"""
+Streaming Example
+"""
+print("\n" + "="*65)
+print("Streaming example")
+print("="*65)
+
+# With streaming, each function call starts running as soon as its part arrives,
+# and the final answer is printed chunk by chunk instead of all at the end
+streamed_contents = [types.Content(role="user", parts=[types.Part(
+    text="Give me a detailed travel briefing for Paris and Sydney: temperature, time zone and population for each."
+)])]
+
+print("\nStreamed response:")
+stream_conversation(
+    client,
     model=GEMINI_MODEL,
-    contents="Compare the current temperature in New York and London right now.",
+    contents=streamed_contents,
     config=config,
+    dispatcher=dispatcher,
+    on_text=lambda chunk: print(chunk, end="", flush=True),
 )
-
-print("\nResponse for multiple cities:")
-print(response2.text)
\ No newline at end of file
+print()
@@ -6,11 +6,21 @@ This example demonstrates a single function implementation for email validation
 
 from google import genai
 from google.genai import types
+import os
 import re
+import sys
+
+# Make the shared fc_toolkit package importable when running this script directly
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from fc_toolkit import ResponseCache, ToolDispatcher, client_from_env, summarize_emails
 
 GEMINI_MODEL = "gemini-2.5-flash"
 
-client = genai.Client()
+client = client_from_env()  # FC_STANDIN=replay:<file> runs against a local recording
+
+# Opt-in response cache: set FC_RESPONSE_CACHE=/path/to/cache.jsonl to answer
+# repeated prompts from disk instead of calling the model again
+response_cache = ResponseCache.from_env()
 
 # Declare the function
 validate_email_declaration = {
@@ -33,13 +43,35 @@ validate_email_declaration = {
     },
 }
 
+# Declare a second function that takes many addresses in one call
+validate_email_list_declaration = {
+    "name": "validate_email_list",
+    "description": "Validates many email addresses in one call and summarizes the problems found, for checking a whole mailing list at once",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "emails": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "The email addresses to validate",
+            },
+            "check_domain": {
+                "type": "boolean",
+                "description": "Whether to perform additional domain format checks (default: true)",
+                "default": True
+            },
+        },
+        "required": ["emails"],
+    },
+}
+
+# Basic email regex pattern, compiled once instead of on every call
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
 # Define the function
 def validate_email(email: str, check_domain: bool = True) -> dict:
     """Validate email address and return detailed analysis"""
     
-    # Basic email regex pattern
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    
     result = {
         "email": email,
         "is_valid": False,
@@ -49,7 +81,7 @@ def validate_email(email: str, check_domain: bool = True) -> dict:
     }
     
     # Check if email matches basic pattern
-    if re.match(email_pattern, email):
+    if EMAIL_PATTERN.match(email):
         result["is_valid"] = True
         local_part, domain = email.split('@', 1)
         result["local_part"] = local_part
@@ -89,9 +121,23 @@ def validate_email(email: str, check_domain: bool = True) -> dict:
     
     return result
 
+def validate_email_list(emails: list, check_domain: bool = True) -> dict:
+    """Validate many email addresses and return counts plus the invalid ones"""
+    # The same rules as validate_email, precompiled with a per-domain cache. It runs in this
+    # process: this script has no __main__ guard for worker processes to import it behind
+    # (python -m fc_toolkit.emails validates whole files across processes)
+    return summarize_emails(emails, check_domain)
+
+# Map the function name the model will call to the function that implements it,
+# the declaration is used to validate the arguments before the function runs
+dispatcher = ToolDispatcher(
+    {"validate_email": validate_email, "validate_email_list": validate_email_list},
+    declarations=[validate_email_declaration, validate_email_list_declaration],
+)
+
 # Set up the tool 
 # this is required for function declarations, not needed for automatic FC
-tools = types.Tool(function_declarations=[validate_email_declaration])
+tools = types.Tool(function_declarations=[validate_email_declaration, validate_email_list_declaration])
 
 # Add the tool to the model generation configuration
 config = types.GenerateContentConfig(
@@ -115,7 +161,8 @@ contents = [
 ]
 
 print("=== EMAIL VALIDATION ASSISTANT ===\n")
-response = client.models.generate_content(
+response = response_cache.generate_content(
+    client,
     model=GEMINI_MODEL,
     contents = contents,
     config = config,
@@ -135,8 +182,8 @@ print(f"Function Arguments: {dict(function_arguments)}")
 
 # Execute the function with the delivered arguments
 
-if function_name == "validate_email":
-    result = validate_email(**function_arguments)
+if function_name in dispatcher:
+    result = dispatcher.call(function_name, function_arguments)
 
     # Print out the raw function results
     print(f"\nEmail Validation Result:")
@@ -150,12 +197,7 @@ if function_name == "validate_email":
 
     # Create a function response part to send the function's results to model
     # This will consist of the name of the function that was called and the result from it
-    function_response_part = types.Part.from_function_response(
-        name=function_name,
-        response = {
-            "result": result
-        }
-    )
+    function_response_part = dispatcher.response_part(function_name, result)
 
     """ 
         LLMs are stateless so we need to send it the previous and new conversation
@@ -173,7 +215,8 @@ if function_name == "validate_email":
     )
 
     # Use the new prompt history to generate a friendly response from the model
-    final_response = client.models.generate_content(
+    final_response = response_cache.generate_content(
+        client,
         model=GEMINI_MODEL,
         config=config, # Use the same configuration
         contents=contents
@@ -0,0 +1 @@
+"""Benchmarks for the fc_toolkit helpers. Run them from the repository root, e.g. python -m benchmarks.http_pooling"""
@@ -0,0 +1,101 @@
+"""
+Benchmark: product catalog lookups and memory at millions of SKUs
+
+Builds a catalog of synthetic SKUs, then opens it in a fresh process and
+measures get_product_details-style lookups per second (hits and misses,
+random IDs in mixed case) and the process's resident memory before and
+after the lookups, next to the size of the catalog file.
+
+    python -m benchmarks.catalog --skus 10000000 --lookups 1000000
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from fc_toolkit.catalog import ProductCatalog, build_catalog
+
+NAMES = ["Wireless Headphones", "Smart Fitness Tracker", "4K Streaming Device", "Bluetooth Speaker",
+         "USB-C Charger", "Mechanical Keyboard", "Gaming Mouse", "Webcam"]
+
+
+def synthetic_products(count: int, seed: int = 1):
+    rng = random.Random(seed)
+    for i in range(count):
+        yield f"PROD-{i:08d}", f"{NAMES[i % len(NAMES)]} {i}", round(rng.uniform(5, 500), 2), rng.randrange(0, 500)
+
+
+def resident_kib() -> tuple:
+    """Resident memory of this process in KiB: (anonymous, file-backed)
+
+    Mapped catalog pages show up as file-backed: they live in the page cache,
+    are shared between processes and the kernel can drop them at any time.
+    """
+    with open("/proc/self/status") as f:
+        fields = dict(line.split(":", 1) for line in f)
+    return int(fields["RssAnon"].split()[0]), int(fields["RssFile"].split()[0])
+
+
+def probe(path: str, skus: int, lookups: int, seed: int) -> dict:
+    """Runs in a fresh process: open the catalog and time random lookups"""
+    rng = random.Random(seed)
+    # 90% hits, 10% misses, in mixed case like the model sends them
+    ids = [f"prod-{rng.randrange(skus):08d}" if rng.random() < 0.9 else f"PROD-X{i}" for i in range(lookups)]
+
+    before_open = resident_kib()
+    start = time.perf_counter()
+    catalog = ProductCatalog(path)
+    open_ms = (time.perf_counter() - start) * 1000
+    after_open = resident_kib()
+
+    start = time.perf_counter()
+    found = sum("error" not in catalog.get(product_id) for product_id in ids)
+    elapsed = time.perf_counter() - start
+
+    after = resident_kib()
+    return {"open_ms": open_ms, "lookups_per_sec": lookups / elapsed, "us_per_lookup": elapsed / lookups * 1e6,
+            "found": found, "anon_open_kib": after_open[0] - before_open[0],
+            "anon_after_kib": after[0] - before_open[0], "file_after_kib": after[1] - before_open[1]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--skus", type=int, default=10_000_000)
+    parser.add_argument("--lookups", type=int, default=1_000_000)
+    parser.add_argument("--catalog", help="reuse (or keep) the catalog file at this path")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--probe", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.probe:
+        print(json.dumps(probe(args.catalog, args.skus, args.lookups, args.seed)))
+        return
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = args.catalog or os.path.join(workdir, "catalog.dat")
+        if not os.path.exists(path):
+            start = time.perf_counter()
+            build_catalog(synthetic_products(args.skus, args.seed), path)
+            print(f"built {args.skus:,} SKUs in {time.perf_counter() - start:.1f}s")
+
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.catalog", "--probe", "--catalog", path,
+             "--skus", str(args.skus), "--lookups", str(args.lookups), "--seed", str(args.seed)],
+            check=True, capture_output=True, text=True).stdout
+        result = json.loads(output)
+
+        print(f"catalog file:      {os.path.getsize(path) / 2**20:,.0f} MiB")
+        print(f"open:              {result['open_ms']:.2f} ms, +{result['anon_open_kib']:,} KiB anonymous memory")
+        print(f"lookups:           {result['lookups_per_sec']:,.0f}/sec ({result['us_per_lookup']:.2f} us each, "
+              f"{result['found']:,} of {args.lookups:,} found)")
+        print(f"resident after:    +{result['anon_after_kib'] / 1024:,.1f} MiB anonymous, "
+              f"+{result['file_after_kib'] / 1024:,.0f} MiB of mapped catalog pages")
+
+
+if __name__ == "__main__":
+    main()
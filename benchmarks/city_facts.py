@@ -0,0 +1,116 @@
+"""
+Benchmark: city facts at 100k+ cities
+
+Loads synthetic cities into a CityFacts store and into the layout the
+lesson tools used to have (one dict of dicts per tool, each keyed by the
+lower-cased name), then compares:
+
+  - memory held by each layout once loaded
+  - answering "temperature, time zone and population" for a batch of cities
+    with three per-city tool calls vs one get_city_profile call per batch
+
+    python -m benchmarks.city_facts --cities 200000 --batch 10
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from fc_toolkit import CityFacts
+
+CONDITIONS = ["sunny", "cloudy", "rainy", "humid", "clear", "snowy", "windy"]
+ZONES = [("EST", -300), ("GMT", 0), ("CET", 60), ("IST", 330), ("JST", 540), ("AEDT", 660), ("PST", -480)]
+FIELDS = ["temperature", "condition", "timezone", "population", "metro_area"]
+
+
+def synthetic_cities(count: int, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    cities = []
+    for i in range(count):
+        tz_name, offset = ZONES[i % len(ZONES)]
+        population = rng.randrange(10_000, 15_000_000)
+        cities.append({"name": f"City {i}", "temperature": rng.randrange(-20, 45),
+                       "condition": CONDITIONS[i % len(CONDITIONS)], "tz_name": tz_name,
+                       "tz_offset_minutes": offset, "population": population,
+                       "metro_population": population + rng.randrange(0, 5_000_000)})
+    return cities
+
+
+def dict_layout(cities: list) -> tuple:
+    """The per-tool dicts the lesson functions used to hold"""
+    temperatures, timezones, populations = {}, {}, {}
+    for city in cities:
+        key = city["name"].lower()
+        temperatures[key] = {"temp": city["temperature"], "unit": "°C", "condition": city["condition"]}
+        timezones[key] = {"timezone": f"{city['tz_name']} (UTC{city['tz_offset_minutes'] // 60:+d})",
+                          "current_time": "12:00"}
+        populations[key] = {"population": f"{city['population'] / 1e6:.1f} million",
+                            "metro_area": f"{city['metro_population'] / 1e6:.1f} million"}
+    return temperatures, timezones, populations
+
+
+def measured(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cities", type=int, default=200_000)
+    parser.add_argument("--batch", type=int, default=10, help="cities per question")
+    parser.add_argument("--questions", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    cities = synthetic_cities(args.cities, args.seed)
+    layout, dict_seconds, dict_bytes = measured(lambda: dict_layout(cities))
+    facts, facts_seconds, facts_bytes = measured(lambda: CityFacts.from_records(cities))
+
+    print(f"{'layout':<28}{'load s':>8}{'memory MiB':>12}")
+    print("-" * 48)
+    print(f"{'dict per tool':<28}{dict_seconds:>8.2f}{dict_bytes / 2**20:>12.1f}")
+    print(f"{'CityFacts (columnar)':<28}{facts_seconds:>8.2f}{facts_bytes / 2**20:>12.1f}")
+
+    rng = random.Random(args.seed)
+    questions = [[f"city {rng.randrange(args.cities)}" for _ in range(args.batch)] for _ in range(args.questions)]
+
+    def per_city_calls():
+        temperatures, timezones, populations = layout
+        for batch in questions:
+            for city in batch:
+                # Each tool lower-cases and hashes the name on its own, then copies its entry
+                for table in (temperatures, timezones, populations):
+                    result = table[city.lower()].copy()
+                    result["city"] = city
+
+    def per_city_facts():
+        for batch in questions:
+            for city in batch:
+                facts.temperature_of(city)
+                facts.time_zone_of(city)
+                facts.population_of(city)
+
+    def profile_calls():
+        for batch in questions:
+            facts.profile(batch, FIELDS)
+
+    print()
+    print(f"{'answering {} cities x 3 facts'.format(args.batch):<36}{'tool calls':>12}{'questions/sec':>15}")
+    print("-" * 63)
+    for name, run, calls in (("3 calls per city, dict per tool", per_city_calls, 3 * args.batch),
+                             ("3 calls per city, CityFacts", per_city_facts, 3 * args.batch),
+                             ("1 get_city_profile call", profile_calls, 1)):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        print(f"{name:<36}{calls:>12}{args.questions / elapsed:>15,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Small helpers shared by the benchmark scripts
+"""
+
+import time
+
+
+def percentile(samples: list, pct: float) -> float:
+    """Returns the pct-th percentile (0-100) of samples using nearest rank"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(name: str, latencies: list, elapsed: float) -> dict:
+    """Builds a result row from per-call latencies (seconds) and the total wall time"""
+    return {
+        "name": name,
+        "calls": len(latencies),
+        "calls_per_sec": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def print_table(rows: list) -> None:
+    """Prints result rows as an aligned table"""
+    print(f"{'scenario':<28}{'calls':>8}{'calls/sec':>12}{'p50 ms':>10}{'p99 ms':>10}")
+    print("-" * 68)
+    for row in rows:
+        print(f"{row['name']:<28}{row['calls']:>8}{row['calls_per_sec']:>12.1f}"
+              f"{row['p50_ms']:>10.2f}{row['p99_ms']:>10.2f}")
+
+
+def timed(function, *args, **kwargs):
+    """Calls function and returns (result, seconds taken)"""
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
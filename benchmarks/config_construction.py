@@ -0,0 +1,100 @@
+"""
+Benchmark: per-request config construction with and without a ToolRegistry
+
+Compares three ways of producing the GenerateContentConfig for a request:
+  - hand-written declaration dicts turned into a Tool on every request
+  - automatic function calling style, inspecting each callable on every request
+  - a frozen ToolRegistry returning a copy of its prebuilt config
+
+    python -m benchmarks.config_construction --requests 2000
+"""
+
+import argparse
+import time
+
+from google.genai import types
+
+from fc_toolkit import ToolRegistry
+from fc_toolkit.registry import declaration_from_function
+
+
+def get_user_location(user_id: str) -> dict:
+    """Gets the stored location for a user by their ID.
+
+    Args:
+        user_id: The unique identifier for the user
+    """
+    return {}
+
+
+def get_weather_forecast(location: str, days: int) -> dict:
+    """Gets the weather forecast for a specific location and number of days.
+
+    Args:
+        location: The location string (e.g., 'Seattle, WA' or 'London, UK')
+        days: Number of days to forecast (1-7)
+    """
+    return {}
+
+
+def send_notification(user_id: str, message: str) -> dict:
+    """Sends a notification message to a user.
+
+    Args:
+        user_id: The unique identifier for the user
+        message: The notification message to send
+    """
+    return {}
+
+
+FUNCTIONS = [get_user_location, get_weather_forecast, send_notification]
+
+# The same declarations written out by hand, as the lesson scripts do
+DECLARATIONS = [declaration_from_function(f).model_dump(mode="json", exclude_none=True) for f in FUNCTIONS]
+
+
+def per_request_dicts():
+    return types.GenerateContentConfig(tools=[types.Tool(function_declarations=DECLARATIONS)])
+
+
+def per_request_inspection():
+    declarations = [types.FunctionDeclaration.from_callable_with_api_option(callable=f) for f in FUNCTIONS]
+    return types.GenerateContentConfig(tools=[types.Tool(function_declarations=declarations)])
+
+
+def make_registry_config():
+    registry = ToolRegistry()
+    for function in FUNCTIONS:
+        registry.register(function)
+    registry.freeze()
+    return registry.config
+
+
+def measure(function, requests: int) -> float:
+    """Returns the mean microseconds per call"""
+    function()
+    start = time.perf_counter()
+    for _ in range(requests):
+        function()
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    rows = [
+        ("declaration dicts per request", measure(per_request_dicts, args.requests)),
+        ("callable inspection per request", measure(per_request_inspection, args.requests)),
+        ("frozen ToolRegistry", measure(make_registry_config(), args.requests)),
+    ]
+
+    print(f"{'config construction':<36}{'us/request':>12}")
+    print("-" * 48)
+    for name, micros in rows:
+        print(f"{name:<36}{micros:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
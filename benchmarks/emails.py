@@ -0,0 +1,90 @@
+"""
+Benchmark: validating a mailing list of millions of addresses
+
+Generates a synthetic mailing list (a few thousand domains, about one
+address in ten malformed) and validates it:
+
+  - one validate_email call per address, as the single-turn.py tool does
+  - check_email in a loop: precompiled pattern, per-domain cache
+  - validate_emails across a process pool, streaming results in order
+  - validate_email_file, file to CSV, with the peak memory of the run
+
+    python -m benchmarks.emails --emails 5000000 --workers 8
+"""
+
+import argparse
+import os
+import random
+import resource
+import tempfile
+import time
+
+from fc_toolkit.emails import check_email, validate_email_file, validate_emails
+
+from .scenarios import load_functions
+
+BROKEN = ["{user}@@{domain}", "{user}{domain}", "{user}@", "{user}@{host}", "{user}@{host}..com", "{user} @{domain}"]
+
+
+def synthetic_emails(count: int, seed: int = 1):
+    rng = random.Random(seed)
+    hosts = [f"mail{i}" for i in range(3_000)]
+    tlds = ["com", "org", "net", "io", "co.uk", "de"]
+    for i in range(count):
+        user = f"user.{rng.randrange(10**7)}"
+        host = hosts[min(int(rng.paretovariate(1.0)) - 1, len(hosts) - 1)]
+        domain = f"{host}.{tlds[i % len(tlds)]}"
+        if rng.random() < 0.1:
+            yield rng.choice(BROKEN).format(user=user, domain=domain, host=host)
+        else:
+            yield f"{user}@{domain}"
+
+
+def timed(run) -> tuple:
+    start = time.perf_counter()
+    result = run()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--emails", type=int, default=2_000_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        source, target = os.path.join(workdir, "emails.txt"), os.path.join(workdir, "results.csv")
+        with open(source, "w", encoding="utf-8") as f:
+            f.writelines(email + "\n" for email in synthetic_emails(args.emails, args.seed))
+
+        # File to file first, before this process holds the whole list in memory
+        before_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        file_stats = validate_email_file(source, target, workers=args.workers)
+        file_peak_mib = max(0, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before_kib) / 1024
+        sizes = os.path.getsize(source) / 2**20, os.path.getsize(target) / 2**20
+
+    emails = list(synthetic_emails(args.emails, args.seed))
+    lesson_validate = load_functions("03-calling-functions/single-turn.py", ["validate_email"],
+                                     data=("EMAIL_PATTERN",))["validate_email"]
+
+    runs = [
+        ("validate_email per address", 1, lambda: sum(lesson_validate(e)["is_valid"] for e in emails)),
+        ("check_email loop", 1, lambda: sum(check_email(e)[0] for e in emails)),
+        (f"validate_emails, {args.workers} workers", args.workers,
+         lambda: sum(valid for _, valid, _ in validate_emails(emails, workers=args.workers))),
+    ]
+
+    print(f"{'{:,} addresses'.format(args.emails):<34}{'processes':>10}{'seconds':>10}{'emails/sec':>14}{'valid':>12}")
+    print("-" * 80)
+    for name, processes, run in runs:
+        seconds, valid = timed(run)
+        print(f"{name:<34}{processes:>10}{seconds:>10.2f}{args.emails / seconds:>14,.0f}{valid:>12,}")
+    print(f"{'validate_email_file (txt -> csv)':<34}{args.workers:>10}{file_stats.seconds:>10.2f}"
+          f"{file_stats.emails_per_sec:>14,.0f}{file_stats.valid:>12,}")
+    print(f"\npeak memory grew by {file_peak_mib:,.1f} MiB during the file run "
+          f"({sizes[0]:,.0f} MiB in, {sizes[1]:,.0f} MiB out)")
+
+
+if __name__ == "__main__":
+    main()
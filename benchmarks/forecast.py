@@ -0,0 +1,97 @@
+"""
+Benchmark: forecasts for thousands of locations, per-call loop vs ForecastEngine
+
+Forecasts batches of locations from a large set of synthetic weather
+patterns three ways:
+
+  - the get_weather_forecast loop: one dict per day, one call per location
+  - ForecastEngine.grid: the temperature grid alone, as a NumPy array
+  - ForecastEngine.table: the grid turned into the compact table the
+    get_weather_forecasts tool returns
+
+and reports location-days per second and the size of the JSON that would
+go back to the model per location.
+
+    python -m benchmarks.forecast --locations 100000 --batch 5000 --days 7
+"""
+
+import argparse
+import json
+import random
+import time
+
+from fc_toolkit import ForecastEngine
+
+CONDITIONS = ["sunny", "cloudy", "rainy", "snowy", "windy", "foggy", "humid"]
+
+
+def synthetic_patterns(count: int, seed: int = 1) -> dict:
+    rng = random.Random(seed)
+    return {f"Location {i}": {"base_temp": rng.randrange(-10, 35), "condition": rng.choice(CONDITIONS),
+                              "variation": rng.randrange(0, 6)} for i in range(count)}
+
+
+def per_day_forecast(location: str, pattern: dict, days: int) -> dict:
+    """The get_weather_forecast loop, once a location's pattern is found"""
+    forecast = []
+    for day in range(1, min(days + 1, 8)):  # Max 7 days
+        temp_variation = (day % 3 - 1) * pattern["variation"]
+        forecast.append({
+            "day": day,
+            "temperature": pattern["base_temp"] + temp_variation,
+            "condition": pattern["condition"],
+            "description": f"Day {day}: {pattern['base_temp'] + temp_variation}°C, {pattern['condition']}"
+        })
+    return {"location": location, "days_requested": days, "forecast": forecast,
+            "summary": f"{days}-day forecast for {location}"}
+
+
+def timed(run, repeat: int) -> tuple:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = run()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--locations", type=int, default=100_000, help="locations with a weather pattern")
+    parser.add_argument("--batch", type=int, default=5_000, help="locations per forecast request")
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    patterns = synthetic_patterns(args.locations, args.seed)
+    start = time.perf_counter()
+    engine = ForecastEngine(patterns)
+    print(f"{len(engine):,} locations loaded into arrays in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    rng = random.Random(args.seed)
+    keys = [f"Location {rng.randrange(args.locations)}" for _ in range(args.batch)]
+    rows, _ = engine.rows(keys)
+    cells = args.batch * min(args.days, 7)
+
+    results = [
+        ("per-call loop", timed(lambda: [per_day_forecast(key, patterns[key], args.days) for key in keys],
+                                args.repeat)),
+        ("ForecastEngine.grid", timed(lambda: engine.grid(rows, args.days), args.repeat)),
+        ("ForecastEngine.table", timed(lambda: engine.table(keys, args.days), args.repeat)),
+    ]
+
+    print()
+    print(f"{'{} locations x {} days'.format(args.batch, min(args.days, 7)):<24}{'ms':>10}"
+          f"{'location-days/sec':>20}{'JSON bytes/location':>22}")
+    print("-" * 76)
+    for name, (seconds, result) in results:
+        size = f"{len(json.dumps(result, ensure_ascii=False)) / args.batch:,.0f}" if name != "ForecastEngine.grid" \
+            else "-"
+        print(f"{name:<24}{seconds * 1000:>10.2f}{cells / seconds:>20,.0f}{size:>22}")
+
+    # Both produce the same temperatures
+    expected = [[day["temperature"] for day in f["forecast"]] for f in results[0][1][1]]
+    assert expected == results[1][1][1].tolist() == [row[2] for row in results[2][1][1]["rows"]]
+
+
+if __name__ == "__main__":
+    main()
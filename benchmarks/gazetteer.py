@@ -0,0 +1,146 @@
+"""
+Benchmark: resolving free-text locations over a gazetteer of millions of places
+
+Builds a LocationResolver over synthetic places (names shared between
+regions and countries, some with abbreviations) and times lookups of the
+kinds the model sends: bare names, "Name, REGION", "name country" without a
+comma, names among vaguer words ("downtown Name", "the Name area", "Name
+area, Country"), aliases, misspelled names and places that don't exist. The old
+get_weather_forecast approach, testing every known name against the
+location, is timed on a few of the same queries for comparison.
+
+    python -m benchmarks.gazetteer --places 2000000 --lookups 100000
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from benchmarks.catalog import resident_kib
+from fc_toolkit.gazetteer import LocationResolver
+
+SYLLABLES = ["ba", "ber", "bo", "ca", "chen", "da", "del", "dor", "el", "en", "fa", "gar", "go", "ha", "hil",
+             "ka", "kin", "la", "len", "lo", "ma", "mar", "mi", "mon", "na", "nor", "o", "pa", "pol", "ra",
+             "ren", "ri", "ro", "sa", "sel", "so", "ta", "ter", "to", "va", "ver", "wa", "wen", "ya", "zan"]
+PREFIXES = ["", "", "", "", "new ", "san ", "port ", "lake ", "north ", "saint "]
+COUNTRIES = ["US", "GB", "CA", "AU", "DE", "FR", "IN", "BR", "MX", "ZA", "NG", "JP", "ES", "IT", "AR", "KE"]
+VAGUE = ["downtown", "greater", "near", "central"]
+KINDS = ["name", "name, region", "name country", "downtown name", "the name area", "name area, country",
+         "alias", "misspelled", "unknown"]
+
+
+def synthetic_places(count: int, seed: int = 1) -> list:
+    """Places whose names repeat across regions like real ones do ("Springfield", "London")"""
+    rng = random.Random(seed)
+    distinct = max(1, count // 3)
+    bases = [(rng.choice(PREFIXES) + "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))).title()
+             for _ in range(distinct)]
+    places = []
+    for i in range(count):
+        # Every tenth place reuses one of a thousand common names, a few hundred times each at 2M places
+        name = bases[rng.randrange(min(1000, distinct)) if i % 10 == 0 else rng.randrange(distinct)]
+        country = COUNTRIES[rng.randrange(len(COUNTRIES))]
+        admin1 = f"R{rng.randrange(60):02d}"
+        aliases = ["".join(word[0] for word in name.split()).upper() + str(i // 20)] if i % 20 == 0 else []
+        places.append({"name": name, "admin1": admin1, "admin1_name": f"Region {admin1}", "country": country,
+                       "population": int(rng.paretovariate(1.1) * 500), "aliases": aliases})
+    return places
+
+
+def misspell(name: str, rng: random.Random) -> str:
+    words = name.split()
+    long_words = [i for i, word in enumerate(words) if len(word) >= 5]
+    if not long_words:
+        return name
+    i = rng.choice(long_words)
+    word = words[i]
+    at = rng.randrange(1, len(word) - 1)
+    edit = rng.randrange(3)
+    if edit == 0:
+        word = word[:at] + word[at + 1:]
+    elif edit == 1:
+        word = word[:at] + rng.choice("aeiou") + word[at:]
+    else:
+        word = word[:at - 1] + word[at] + word[at - 1] + word[at + 1:]
+    words[i] = word
+    return " ".join(words)
+
+
+def queries(places: list, count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    result = []
+    for i in range(count):
+        kind = KINDS[i % len(KINDS)]
+        place = places[rng.randrange(len(places))]
+        if kind == "alias":
+            while not place["aliases"]:
+                place = places[rng.randrange(len(places))]
+        text = {"name": place["name"].lower(),
+                "name, region": f"{place['name']}, {place['admin1']}",
+                "name country": f"{place['name'].upper()} {place['country']}",
+                "downtown name": f"{rng.choice(VAGUE)} {place['name']}",
+                "the name area": f"the {place['name']} area",
+                "name area, country": f"{place['name']} area, {place['country']}",
+                "alias": place["aliases"][0] if place["aliases"] else "",
+                "misspelled": misspell(place["name"], rng),
+                "unknown": f"Qx{rng.randrange(10**6)}ville"}[kind]
+        result.append((kind, text))
+    return result
+
+
+def percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--places", type=int, default=2_000_000)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    parser.add_argument("--scans", type=int, default=20, help="lookups to time with the old linear scan")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    places = synthetic_places(args.places, args.seed)
+    before = resident_kib()[0]
+    start = time.perf_counter()
+    resolver = LocationResolver.from_records(places)
+    build_seconds = time.perf_counter() - start
+    index_mib = (resident_kib()[0] - before) / 1024
+    print(f"{len(resolver):,} places, index built in {build_seconds:.1f}s, +{index_mib:,.0f} MiB")
+
+    workload = queries(places, args.lookups, args.seed)
+    latencies = {kind: [] for kind in KINDS}
+    resolved = {kind: 0 for kind in KINDS}
+    clock = time.perf_counter
+    total_start = clock()
+    for kind, text in workload:
+        start = clock()
+        match = resolver.resolve(text)
+        latencies[kind].append(clock() - start)
+        resolved[kind] += match is not None
+    total = clock() - total_start
+
+    print()
+    print(f"{'query kind':<20}{'lookups':>9}{'resolved':>10}{'mean us':>10}{'p99 us':>10}")
+    print("-" * 59)
+    for kind in KINDS:
+        samples = latencies[kind]
+        print(f"{kind:<20}{len(samples):>9,}{resolved[kind] / len(samples):>10.0%}"
+              f"{statistics.fmean(samples) * 1e6:>10.1f}{percentile(samples, 99) * 1e6:>10.1f}")
+    print(f"{'all':<20}{len(workload):>9,}{'':>10}{total / len(workload) * 1e6:>10.1f}"
+          f"{'':>10}  ({len(workload) / total:,.0f} lookups/sec)")
+
+    # The old way: test every known name against the location
+    known = [place["name"].lower() for place in places]
+    start = clock()
+    for _, text in workload[:args.scans]:
+        location = text.lower()
+        next((name for name in known if name in location), None)
+    scan_us = (clock() - start) / args.scans * 1e6
+    print(f"\nlinear substring scan over every name: {scan_us:,.0f} us per lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: tail latency with and without hedged requests
+
+The scripted stand-in answers most calls in about 50 ms, but a few
+(--slow-share) take --slow-latency. The same calls are made plainly and
+through ResilientClient with hedging after the p95 of recent calls, on
+both the blocking and the async API, and the latency percentiles are
+compared along with how often the hedge won.
+
+    python -m benchmarks.hedging --calls 400 --slow-share 0.03 --slow-latency 1.0
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fc_toolkit import ResilientClient, StandInClient
+from fc_toolkit.standin import text_step
+
+from .common import percentile
+
+MODEL = "gemini-2.5-flash"
+PROMPT = "What's the weather like in Seattle?"
+
+
+def heavy_tail(slow_share: float, slow_latency: float, seed: int):
+    rng = random.Random(seed)
+
+    def latency() -> float:
+        return slow_latency if rng.random() < slow_share else rng.uniform(0.04, 0.06)
+    return latency
+
+
+def timed_call(client) -> float:
+    start = time.perf_counter()
+    client.models.generate_content(model=MODEL, contents=PROMPT)
+    return time.perf_counter() - start
+
+
+async def timed_call_async(client, limit: asyncio.Semaphore) -> float:
+    async with limit:
+        start = time.perf_counter()
+        await client.aio.models.generate_content(model=MODEL, contents=PROMPT)
+        return time.perf_counter() - start
+
+
+def run_blocking(client, calls: int, threads: int) -> list:
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return list(executor.map(lambda _: timed_call(client), range(calls)))
+
+
+def run_async(client, calls: int, threads: int) -> list:
+    async def main():
+        limit = asyncio.Semaphore(threads)
+        return await asyncio.gather(*(timed_call_async(client, limit) for _ in range(calls)))
+    return asyncio.run(main())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--threads", type=int, default=8, help="calls in flight at once")
+    parser.add_argument("--slow-share", type=float, default=0.03, help="fraction of calls that are slow")
+    parser.add_argument("--slow-latency", type=float, default=1.0, help="latency of a slow call (s)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'mode':<20}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}{'hedges':>8}{'won':>6}")
+    print("-" * 70)
+    for api, run in (("blocking", run_blocking), ("async", run_async)):
+        for hedged in (False, True):
+            standin = StandInClient(mode="scripted", script=[text_step("It's 15°C and rainy.")],
+                                    latency=heavy_tail(args.slow_share, args.slow_latency, args.seed))
+            client = ResilientClient(standin, hedge=True, seed=args.seed) if hedged else standin
+
+            latencies = run(client, args.calls, args.threads)
+            # The first calls only teach the percentile, leave them out of the comparison
+            latencies = latencies[20:]
+            stats = client.stats if hedged else None
+            print(f"{api + (' + hedge' if hedged else ''):<20}"
+                  f"{percentile(latencies, 50) * 1000:>9.0f}{percentile(latencies, 95) * 1000:>9.0f}"
+                  f"{percentile(latencies, 99) * 1000:>9.0f}{max(latencies) * 1000:>9.0f}"
+                  f"{stats.hedges if stats else '-':>8}{stats.hedge_wins if stats else '-':>6}")
+            if hedged:
+                client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark: prompt tokens for long multi-turn sessions with and without compaction
+
+Simulates a banking session like multi-turn.py (alternating balance checks
+and transfers), and compares the estimated prompt tokens of resending the
+full history with those of a ConversationHistory.
+
+    python -m benchmarks.history_compaction --turns 50
+"""
+
+import argparse
+
+from google.genai import types
+
+from fc_toolkit import ConversationHistory, estimate_tokens
+
+
+def simulated_turn(i: int) -> list:
+    """The four Content objects of one turn: question, function call, result, answer"""
+    if i % 2 == 0:
+        question = f"What's the balance in account ACC{100 + i % 7}?"
+        call = types.FunctionCall(name="check_balance", args={"account_id": f"ACC{100 + i % 7}"})
+        result = {"account_id": f"ACC{100 + i % 7}", "balance": 1500.0 - i, "currency": "USD"}
+        answer = f"The balance in account ACC{100 + i % 7} is ${1500.0 - i:.2f}."
+    else:
+        question = f"Transfer ${10 * i} from ACC123 to ACC456"
+        call = types.FunctionCall(name="transfer_money",
+                                  args={"from_account": "ACC123", "to_account": "ACC456", "amount": 10 * i})
+        result = {"transaction_id": f"TXN{i:06d}", "from_account": "ACC123", "to_account": "ACC456",
+                  "amount": 10 * i, "status": "completed", "fee": 2.5}
+        answer = f"Done! ${10 * i} was transferred from ACC123 to ACC456 (transaction TXN{i:06d}, fee $2.50)."
+
+    return [
+        types.Content(role="user", parts=[types.Part(text=question)]),
+        types.Content(role="model", parts=[types.Part(function_call=call)]),
+        types.Content(role="user", parts=[types.Part.from_function_response(name=call.name, response={"result": result})]),
+        types.Content(role="model", parts=[types.Part(text=answer)]),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--budget", type=int, default=1000)
+    parser.add_argument("--keep-recent", type=int, default=2)
+    args = parser.parse_args()
+
+    history = ConversationHistory(token_budget=args.budget, keep_recent_turns=args.keep_recent,
+                                  supersedes={"transfer_money": ["check_balance"]})
+
+    print(f"{'turn':>6}{'full history':>16}{'compacted':>12}{'saved':>8}")
+    print("-" * 42)
+    for i in range(args.turns):
+        question, call, result, answer = simulated_turn(i)
+
+        # Each turn makes two requests: one for the function call, one for the answer
+        history.append(question)
+        history.contents()
+        history.extend([call, result])
+        sent = estimate_tokens(history.contents())
+        full = estimate_tokens(history.full_contents())
+        history.append(answer)
+
+        if (i + 1) in (1, 5, 10, 25, 50, 100, 200) or i + 1 == args.turns:
+            print(f"{i + 1:>6}{full:>16}{sent:>12}{1 - sent / full:>8.0%}")
+
+    stats = history.stats
+    print("-" * 42)
+    print(f"{stats.requests} requests: {stats.full_tokens} tokens with the full history, "
+          f"{stats.sent_tokens} compacted ({stats.savings_ratio:.0%} saved)")
+
+
+if __name__ == "__main__":
+    main()
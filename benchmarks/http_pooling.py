@@ -0,0 +1,62 @@
+"""
+Benchmark: pooled vs unpooled HTTP sessions for tool calls
+
+Runs the same GET workload against a local JSONPlaceholder stand-in with the
+shared session pooling turned on and off, and reports calls/sec and p99.
+
+    python -m benchmarks.http_pooling --calls 500 --threads 4 --connect-delay 0.005
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fc_toolkit import HttpSessionConfig, close_http, configure_http, http_get
+
+from .common import print_table, summarize, timed
+from .local_http import start_jsonplaceholder_server
+
+
+def run_scenario(name: str, base_url: str, config: HttpSessionConfig, calls: int, threads: int) -> dict:
+    """Issues calls GET requests over threads workers and summarizes their latency"""
+    configure_http(config)
+
+    def one_call(i):
+        response, seconds = timed(http_get, f"{base_url}/users/{i % 10 + 1}")
+        response.raise_for_status()
+        return seconds
+
+    # Warm up so the pooled run starts with an open connection, as it would in a live app
+    one_call(0)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        latencies = list(executor.map(one_call, range(calls)))
+    elapsed = time.perf_counter() - start
+
+    close_http()
+    return summarize(name, latencies, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--connect-delay", type=float, default=0.005,
+                        help="seconds added to each new connection to mimic a TLS handshake")
+    args = parser.parse_args()
+
+    server, base_url = start_jsonplaceholder_server(connect_delay=args.connect_delay)
+    try:
+        rows = [
+            run_scenario("pooling off", base_url, HttpSessionConfig(pooled=False), args.calls, args.threads),
+            run_scenario("pooling on", base_url, HttpSessionConfig(pool_maxsize=args.threads), args.calls, args.threads),
+        ]
+    finally:
+        server.shutdown()
+
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
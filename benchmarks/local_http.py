@@ -0,0 +1,77 @@
+"""
+Local stand-in for the JSONPlaceholder API
+
+Serves /users and /users/<id> over HTTP/1.1 with keep-alive so the tools can
+be exercised without network access. connect_delay adds a pause to every new
+connection to mimic the TCP+TLS handshake of the real https endpoint.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+USERS = [
+    {
+        "id": i,
+        "name": f"User {i}",
+        "username": f"user{i}",
+        "email": f"user{i}@example.com",
+        "phone": f"555-010{i % 10}",
+        "website": f"user{i}.example.com",
+        "company": {"name": f"Company {i}"},
+        "address": {"street": f"{i} Main St", "city": "Springfield"},
+    }
+    for i in range(1, 11)
+]
+
+
+def start_jsonplaceholder_server(connect_delay: float = 0.0, response_delay: float = 0.0):
+    """Starts the stand-in server on a free localhost port in a background thread.
+
+    Args:
+        connect_delay: Seconds to pause when a new connection is accepted
+        response_delay: Seconds to pause before answering each request
+
+    Returns:
+        A (server, base_url) tuple. Call server.shutdown() when done.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body are written separately; without this, Nagle + delayed ACK
+        # add ~40 ms to every response on a reused connection
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            if connect_delay:
+                time.sleep(connect_delay)
+            super().setup()
+
+        def do_GET(self):
+            if response_delay:
+                time.sleep(response_delay)
+
+            parts = self.path.strip("/").split("/")
+            if parts == ["users"]:
+                status, payload = 200, USERS
+            elif len(parts) == 2 and parts[0] == "users" and parts[1].isdigit() \
+                    and 1 <= int(parts[1]) <= len(USERS):
+                status, payload = 200, USERS[int(parts[1]) - 1]
+            else:
+                status, payload = 404, {}
+
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
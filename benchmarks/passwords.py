@@ -0,0 +1,72 @@
+"""
+Benchmark: generating passwords in bulk, random.choice vs the CSPRNG
+
+Generates a batch of passwords three ways:
+
+  - random.choice per character, as generate_password in
+    first-function-call.py did (Mersenne Twister, not for secrets)
+  - secrets.choice per character: the CSPRNG, one call per character
+  - generate_passwords: one CSPRNG buffer mapped with bytes.translate
+
+and reports passwords per second, then checks that generate_passwords
+draws every character equally often (chi-square over the character counts).
+
+    python -m benchmarks.passwords --count 100000 --length 16
+"""
+
+import argparse
+import random
+import secrets
+import time
+from collections import Counter
+
+from fc_toolkit.passwords import character_set, generate_passwords, random_characters
+
+
+def timed(run, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        run()
+    return (time.perf_counter() - start) / repeat
+
+
+def chi_square(text: str, characters: str) -> float:
+    """Pearson's statistic for text against a uniform draw from characters"""
+    counts = Counter(text)
+    expected = len(text) / len(characters)
+    return sum((counts[c] - expected) ** 2 / expected for c in characters)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000, help="passwords per batch")
+    parser.add_argument("--length", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--samples", type=int, default=2_000_000, help="characters for the uniformity check")
+    args = parser.parse_args()
+
+    count, length = args.count, args.length
+    print(f"{'{:,} passwords x {}'.format(count, length):<28}{'symbols':>9}{'seconds':>10}{'passwords/sec':>16}")
+    print("-" * 63)
+    for include_symbols in (False, True):
+        characters = character_set(include_symbols)
+        runs = [
+            ("random.choice", lambda: ["".join(random.choice(characters) for _ in range(length))
+                                       for _ in range(count)]),
+            ("secrets.choice", lambda: ["".join(secrets.choice(characters) for _ in range(length))
+                                        for _ in range(count)]),
+            ("generate_passwords", lambda: generate_passwords(count, length, include_symbols)),
+        ]
+        for name, run in runs:
+            seconds = timed(run, args.repeat)
+            print(f"{name:<28}{'yes' if include_symbols else 'no':>9}{seconds:>10.3f}{count / seconds:>16,.0f}")
+
+    print(f"\nuniformity over {args.samples:,} characters (expect about the degrees of freedom):")
+    for include_symbols in (False, True):
+        characters = character_set(include_symbols)
+        statistic = chi_square(random_characters(args.samples, characters), characters)
+        print(f"  {len(characters)} characters: chi-square {statistic:.1f}, {len(characters) - 1} degrees of freedom")
+
+
+if __name__ == "__main__":
+    main()
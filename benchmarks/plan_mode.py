@@ -0,0 +1,155 @@
+"""
+Benchmark: one round trip per step vs plan mode for compositional chains
+
+The compositional-calling.py chain (location -> forecast -> notification) is
+run for N users against the scripted stand-in. Step by step, each round of
+calls needs its own model round trip: 4 generate_content calls however many
+users there are. In plan mode the model sends the whole graph at once, the
+3 x N tool calls run locally with as much parallelism as the references
+allow, and the answer takes a second call. The speculative mode is step by
+step again, but with a Speculator starting each forecast as soon as its
+location is known, so the forecasts are ready when the model asks for them.
+
+    python -m benchmarks.plan_mode --latency 0.5 --users 3
+"""
+
+import argparse
+import json
+import time
+
+from google.genai import types
+
+from fc_toolkit import (Speculator, StandInClient, ToolDispatcher, declaration_from_function, from_result,
+                        get_function_calls, run_function_calls, run_plan_mode)
+from fc_toolkit.plan import PLAN_FUNCTION
+from fc_toolkit.standin import function_call_step, text_step
+
+from .scenarios import COMPOSITIONAL_DATA, load_functions
+
+MODEL = "gemini-2.5-flash"
+USERS = ["user123", "user456", "user789", "admin001"]
+NAMES = ["get_user_location", "get_weather_forecast", "send_notification"]
+SAFE_TOOLS = {"get_user_location", "get_weather_forecast"}
+
+
+def slow(function, seconds: float):
+    """Wraps a tool so it takes as long as a real backend call"""
+    def wrapper(**kwargs):
+        time.sleep(seconds)
+        return function(**kwargs)
+    wrapper.__name__ = function.__name__
+    wrapper.__doc__ = function.__doc__
+    wrapper.__wrapped__ = function
+    return wrapper
+
+
+def stepwise_script(users: list) -> list:
+    """Scripted model that asks for one layer of the chain per round trip"""
+    def forecasts(contents):
+        locations = [p.function_response.response["result"] for p in contents[-1].parts]
+        return {"function_calls": [{"name": "get_weather_forecast",
+                                    "args": {"location": loc["full_location"], "days": 3}} for loc in locations]}
+
+    def notifications(contents):
+        forecast = [p.function_response.response["result"] for p in contents[-1].parts]
+        return {"function_calls": [{"name": "send_notification", "args": {"user_id": user, "message": f["summary"]}}
+                                   for user, f in zip(users, forecast)]}
+
+    return [
+        function_call_step(*[("get_user_location", {"user_id": user}) for user in users]),
+        forecasts,
+        notifications,
+        text_step("Done, every user has been sent their forecast."),
+    ]
+
+
+def plan_script(users: list) -> list:
+    """Scripted model that sends the whole chain as one execute_plan call"""
+    steps = []
+    for i, user in enumerate(users):
+        steps += [
+            {"id": f"loc{i}", "tool": "get_user_location", "args_json": json.dumps({"user_id": user})},
+            {"id": f"forecast{i}", "tool": "get_weather_forecast",
+             "args_json": json.dumps({"location": {"$ref": f"loc{i}.full_location"}, "days": 3})},
+            {"id": f"notify{i}", "tool": "send_notification",
+             "args_json": json.dumps({"user_id": user, "message": {"$ref": f"forecast{i}.summary"}})},
+        ]
+    return [
+        function_call_step((PLAN_FUNCTION, {"steps": steps})),
+        text_step("Done, every user has been sent their forecast."),
+    ]
+
+
+def stepwise_run(client, declarations, dispatcher, prompt: str) -> int:
+    config = types.GenerateContentConfig(
+        tools=[types.Tool(function_declarations=declarations)],
+        automatic_function_calling=types.AutomaticFunctionCallingConfig(disable=True))
+    contents = [types.Content(role="user", parts=[types.Part(text=prompt)])]
+    calls = 0
+    while True:
+        response = client.models.generate_content(model=MODEL, contents=contents, config=config)
+        calls += 1
+        function_calls = get_function_calls(response)
+        if not function_calls:
+            return calls
+        parts = run_function_calls(function_calls, dispatcher)
+        contents += [response.candidates[0].content, types.Content(role="user", parts=parts)]
+
+
+def plan_run(client, declarations, dispatcher, prompt: str) -> int:
+    contents = [types.Content(role="user", parts=[types.Part(text=prompt)])]
+    run = run_plan_mode(client, model=MODEL, contents=contents, declarations=declarations, dispatcher=dispatcher)
+    assert run.results and not any("error_type" in r for r in run.results.values())
+    return run.model_calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.5, help="stand-in model latency per call (s)")
+    parser.add_argument("--tool-seconds", type=float, default=0.05, help="time each tool call takes (s)")
+    parser.add_argument("--users", type=int, default=3, choices=range(1, len(USERS) + 1))
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    functions = load_functions("03-calling-functions/compositional-calling.py", NAMES, data=COMPOSITIONAL_DATA)
+    tools = [slow(functions[name], args.tool_seconds) for name in NAMES]
+    declarations = [declaration_from_function(tool) for tool in tools]
+    dispatcher = ToolDispatcher({tool.__name__: tool for tool in tools}, declarations)
+
+    # The rule leaves days to the model, so it has to be learned: one unmeasured
+    # conversation is enough with min_support=1
+    speculator = Speculator(
+        safe_tools=SAFE_TOOLS, min_support=1,
+        rules={"get_user_location": {"get_weather_forecast": {"location": from_result("full_location")}}})
+    speculative = ToolDispatcher(
+        {tool.__name__: speculator.wrap(tool) if tool.__name__ in SAFE_TOOLS else tool for tool in tools},
+        declarations)
+
+    users = USERS[:args.users]
+    prompt = f"Send {', '.join(users)} a notification with their 3-day weather forecast."
+    with speculator.conversation():
+        stepwise_run(StandInClient(mode="scripted", script=stepwise_script(users)), declarations, speculative, prompt)
+
+    print(f"{'mode':<12}{'model calls':>14}{'total ms':>12}")
+    print("-" * 38)
+    modes = (("stepwise", stepwise_script, stepwise_run, dispatcher),
+             ("plan mode", plan_script, plan_run, dispatcher),
+             ("speculative", stepwise_script, stepwise_run, speculative))
+    for name, script, run, tool_dispatcher in modes:
+        elapsed = []
+        for _ in range(args.runs):
+            client = StandInClient(mode="scripted", script=script(users), latency=args.latency)
+            start = time.perf_counter()
+            # Each run is its own conversation, transitions are only paired up within one
+            with speculator.conversation():
+                model_calls = run(client, declarations, tool_dispatcher, prompt)
+            elapsed.append(time.perf_counter() - start)
+        print(f"{name:<12}{model_calls:>14}{sum(elapsed) / len(elapsed) * 1000:>12.0f}")
+
+    stats = speculator.stats
+    print(f"\nspeculation: {stats.launched} launched, {stats.hits} hits, {stats.misses} misses, {stats.wasted} wasted")
+    speculator.shutdown()
+
+
+if __name__ == "__main__":
+    main()
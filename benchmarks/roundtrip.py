@@ -0,0 +1,223 @@
+"""
+Benchmark: end-to-end function calling round trips against a local stand-in
+
+Runs the single-turn, multi-turn and compositional scenarios (request,
+function call, execute, send result back, final answer) against a scripted
+stand-in model with controllable latency, and reports:
+
+  - per-phase time: request build, model wait, arg parsing, tool execution,
+    response-part construction (measured on sequential sessions so that
+    GIL contention between sessions doesn't leak into the phase numbers)
+  - throughput (sessions/sec) and p99 session time with N concurrent sessions
+  - peak memory allocated while a session runs, and the memory blocks its
+    finished conversation keeps alive
+
+Results are saved as JSON so runs can be compared across versions:
+
+    python -m benchmarks.roundtrip --latency 0.05 --sessions 200 --concurrency 16
+    python -m benchmarks.roundtrip --compare benchmarks/results/roundtrip-<earlier>.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from google.genai import types
+
+from fc_toolkit import StandInClient, ToolDispatcher, get_function_calls
+
+from .common import percentile
+from .scenarios import SCENARIOS
+
+MODEL = "gemini-2.5-flash"
+PHASES = ["request_build", "model_wait", "arg_parsing", "tool_execution", "response_parts"]
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def run_session(client, scenario, dispatcher: ToolDispatcher) -> tuple:
+    """Plays one full conversation and returns (seconds spent in each phase, final contents)"""
+    clock = time.perf_counter
+    phases = dict.fromkeys(PHASES, 0.0)
+    contents = []
+
+    for user_turn in scenario.user_turns:
+        start = clock()
+        contents.append(types.Content(role="user", parts=[types.Part(text=user_turn)]))
+        config = scenario.registry.config()
+        phases["request_build"] += clock() - start
+
+        while True:
+            start = clock()
+            response = client.models.generate_content(model=MODEL, contents=contents, config=config)
+            phases["model_wait"] += clock() - start
+
+            start = clock()
+            function_calls = get_function_calls(response)
+            prepared = [dispatcher.prepare(call.name, call.args) for call in function_calls]
+            phases["arg_parsing"] += clock() - start
+
+            if not function_calls:
+                contents.append(response.candidates[0].content)
+                break
+
+            start = clock()
+            results = [function(**kwargs) for function, kwargs in prepared]
+            phases["tool_execution"] += clock() - start
+
+            start = clock()
+            contents.append(response.candidates[0].content)
+            contents.append(types.Content(role="user", parts=[
+                dispatcher.response_part(call.name, result) for call, result in zip(function_calls, results)]))
+            phases["response_parts"] += clock() - start
+
+    return phases, contents
+
+
+def measure_memory(scenario, sessions: int = 50) -> dict:
+    """Peak traced memory while a session runs and blocks retained by its conversation (no latency)"""
+    client = StandInClient(mode="scripted", script=scenario.script)
+    dispatcher = ToolDispatcher.from_registry(scenario.registry)
+    run_session(client, scenario, dispatcher)
+
+    kept, peaks = [], []
+    gc.collect()
+    gc.disable()
+    try:
+        tracemalloc.start()
+        blocks_before = sys.getallocatedblocks()
+        for _ in range(sessions):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            kept.append(run_session(client, scenario, dispatcher)[1])
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+        blocks_after = sys.getallocatedblocks()
+        tracemalloc.stop()
+    finally:
+        gc.enable()
+
+    return {
+        "peak_kib_per_session": sum(peaks) / sessions / 1024,
+        "retained_blocks_per_session": (blocks_after - blocks_before) / sessions,
+    }
+
+
+def measure_phases(scenario, latency: float, sessions: int) -> dict:
+    """Mean microseconds per session spent in each phase, sessions run one at a time"""
+    client = StandInClient(mode="scripted", script=scenario.script, latency=latency)
+    dispatcher = ToolDispatcher.from_registry(scenario.registry)
+    run_session(client, scenario, dispatcher)
+
+    totals = defaultdict(float)
+    for _ in range(sessions):
+        phases, _ = run_session(client, scenario, dispatcher)
+        for phase, seconds in phases.items():
+            totals[phase] += seconds
+    return {phase: totals[phase] / sessions * 1e6 for phase in PHASES}
+
+
+def measure_throughput(scenario, latency: float, sessions: int, concurrency: int) -> dict:
+    """Sessions/sec and session latency percentiles with concurrency sessions in flight"""
+    client = StandInClient(mode="scripted", script=scenario.script, latency=latency)
+    dispatcher = ToolDispatcher.from_registry(scenario.registry)
+    session_times = []
+
+    def one_session(_):
+        start = time.perf_counter()
+        run_session(client, scenario, dispatcher)
+        session_times.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one_session, range(sessions)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "sessions_per_sec": sessions / elapsed,
+        "session_p50_ms": percentile(session_times, 50) * 1000,
+        "session_p99_ms": percentile(session_times, 99) * 1000,
+    }
+
+
+def run_scenario(name: str, latency: float, sessions: int, concurrency: int, phase_sessions: int) -> dict:
+    scenario = SCENARIOS[name]()
+    return {
+        "scenario": name,
+        "sessions": sessions,
+        "concurrency": concurrency,
+        "latency_s": latency,
+        **measure_throughput(scenario, latency, sessions, concurrency),
+        "phase_us_per_session": measure_phases(scenario, latency, phase_sessions),
+        **measure_memory(scenario),
+    }
+
+
+def _version() -> str:
+    try:
+        return subprocess.check_output(["git", "describe", "--always", "--dirty"], text=True,
+                                       stderr=subprocess.DEVNULL, cwd=os.path.dirname(RESULTS_DIR)).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_report(results: list, baseline: dict = None) -> None:
+    baseline = {r["scenario"]: r for r in (baseline or {}).get("results", [])}
+    header = f"{'scenario':<15}{'sess/s':>9}{'p99 ms':>9}" + "".join(f"{p:>16}" for p in PHASES) \
+        + f"{'peak KiB':>10}{'kept blocks':>13}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['scenario']:<15}{r['sessions_per_sec']:>9.1f}{r['session_p99_ms']:>9.1f}"
+              + "".join(f"{r['phase_us_per_session'][p]:>14.1f}us" for p in PHASES)
+              + f"{r['peak_kib_per_session']:>10.1f}{r['retained_blocks_per_session']:>13.1f}")
+        old = baseline.get(r["scenario"])
+        if old:
+            print(f"{'  vs baseline':<15}{_delta(r['sessions_per_sec'], old['sessions_per_sec']):>9}"
+                  f"{_delta(r['session_p99_ms'], old['session_p99_ms']):>9}"
+                  + "".join(f"{_delta(r['phase_us_per_session'][p], old['phase_us_per_session'][p]):>16}"
+                            for p in PHASES)
+                  + f"{_delta(r['peak_kib_per_session'], old['peak_kib_per_session']):>10}"
+                  + f"{_delta(r['retained_blocks_per_session'], old['retained_blocks_per_session']):>13}")
+
+
+def _delta(new: float, old: float) -> str:
+    return f"{(new - old) / old:+.0%}" if old else "n/a"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--latency", type=float, default=0.05, help="stand-in model latency per request (s)")
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--phase-sessions", type=int, default=50, help="sequential sessions used for phase timings")
+    parser.add_argument("--output", help="where to save results (default: benchmarks/results/roundtrip-<version>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    results = [run_scenario(name, args.latency, args.sessions, args.concurrency, args.phase_sessions) for name in args.scenarios]
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(results, baseline)
+
+    version = _version()
+    output = args.output or os.path.join(RESULTS_DIR, f"roundtrip-{version}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"version": version, "python": platform.python_version(),
+                   "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results}, f, indent=2)
+    print(f"\nSaved results to {output}")
+
+
+if __name__ == "__main__":
+    main()
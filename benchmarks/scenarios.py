@@ -0,0 +1,143 @@
+"""
+Function calling scenarios for the benchmarks
+
+Each scenario reuses the real tool functions from a lesson script and pairs
+them with a stand-in model script that drives the same call sequence the
+live model would: request, function call, execute, send result back, answer.
+"""
+
+import ast
+import os
+from dataclasses import dataclass
+
+from fc_toolkit import ToolRegistry
+from fc_toolkit.standin import build_response, function_call_step, text_step
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Module state the compositional-calling.py tools read: the gazetteer and the weather patterns
+COMPOSITIONAL_DATA = ("SAMPLE_PLACES", "places", "WEATHER_PATTERNS")
+
+
+def load_functions(script: str, names: list, data: tuple = ()) -> dict:
+    """Loads top-level functions from a lesson script without running the script.
+
+    Only the imports, the requested function definitions and the top-level
+    assignments named in data (module state the functions use) are executed,
+    with the decorators removed, and print() is silenced so tools that log
+    don't flood the benchmark output.
+    """
+    path = os.path.join(REPO_ROOT, script)
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    body = []
+    for node in tree.body:
+        # fc_toolkit imports are only needed to build module state the functions use
+        if isinstance(node, (ast.Import, ast.ImportFrom)) and (data or not _imports_fc_toolkit(node)):
+            body.append(node)
+        elif isinstance(node, ast.FunctionDef) and node.name in names:
+            node.decorator_list = []
+            body.append(node)
+        elif isinstance(node, ast.Assign) and any(getattr(t, "id", None) in data for t in node.targets):
+            body.append(node)
+
+    namespace = {"__name__": "scenario_tools", "print": lambda *args, **kwargs: None}
+    exec(compile(ast.Module(body=body, type_ignores=[]), path, "exec"), namespace)
+    return {name: namespace[name] for name in names}
+
+
+def _imports_fc_toolkit(node) -> bool:
+    return isinstance(node, ast.ImportFrom) and (node.module or "").startswith("fc_toolkit")
+
+
+@dataclass
+class Scenario:
+    """A benchmarkable conversation.
+
+    Attributes:
+        name: Scenario name used in reports
+        user_turns: The user messages, sent one after another
+        registry: Tools available to the model
+        script: Stand-in model script (see StandInModel)
+    """
+    name: str
+    user_turns: list
+    registry: ToolRegistry
+    script: list
+
+
+def _registry(functions: dict) -> ToolRegistry:
+    registry = ToolRegistry()
+    for function in functions.values():
+        registry.register(function)
+    registry.freeze()
+    return registry
+
+
+def _last_result(contents: list) -> dict:
+    """The result of the most recent function response in the conversation"""
+    for content in reversed(contents):
+        for part in content.parts or ():
+            if part.function_response:
+                return part.function_response.response.get("result", {})
+    return {}
+
+
+def single_turn() -> Scenario:
+    functions = load_functions("03-calling-functions/single-turn.py", ["validate_email"], data=("EMAIL_PATTERN",))
+    return Scenario(
+        name="single-turn",
+        user_turns=["Please check if the email 'jdub@@company' is valid"],
+        registry=_registry(functions),
+        script=[
+            function_call_step(("validate_email", {"email": "jdub@@company", "check_domain": True})),
+            text_step(lambda contents: f"Result: {_last_result(contents).get('summary', '')}"),
+        ],
+    )
+
+
+def multi_turn() -> Scenario:
+    functions = load_functions("03-calling-functions/multi-turn.py", ["check_balance", "transfer_money"])
+    return Scenario(
+        name="multi-turn",
+        user_turns=["What's the balance in account ACC123?", "Transfer $200 from ACC123 to ACC456"],
+        registry=_registry(functions),
+        script=[
+            function_call_step(("check_balance", {"account_id": "ACC123"})),
+            text_step("The balance in account ACC123 is $1,500.00."),
+            function_call_step(("transfer_money", {"from_account": "ACC123", "to_account": "ACC456", "amount": 200})),
+            text_step("Done! $200 was transferred from ACC123 to ACC456."),
+        ],
+    )
+
+
+def compositional() -> Scenario:
+    functions = load_functions("03-calling-functions/compositional-calling.py",
+                               ["get_user_location", "get_weather_forecast", "send_notification"],
+                               data=COMPOSITIONAL_DATA)
+
+    def forecast_step(contents):
+        location = _last_result(contents).get("full_location", "")
+        return build_response(function_call_step(("get_weather_forecast", {"location": location, "days": 3})), contents)
+
+    def notify_step(contents):
+        summary = _last_result(contents).get("summary", "")
+        return build_response(function_call_step(("send_notification", {"user_id": "user123", "message": summary})),
+                              contents)
+
+    return Scenario(
+        name="compositional",
+        user_turns=["Can you look up where user123 is located, get a 3-day weather forecast for their city, "
+                    "and then send them a notification with the weather summary?"],
+        registry=_registry(functions),
+        script=[
+            function_call_step(("get_user_location", {"user_id": "user123"})),
+            forecast_step,
+            notify_step,
+            text_step("I've sent user123 their 3-day forecast for Seattle, WA."),
+        ],
+    )
+
+
+SCENARIOS = {"single-turn": single_turn, "multi-turn": multi_turn, "compositional": compositional}
@@ -0,0 +1,104 @@
+"""
+Benchmark: blocking vs streaming turns with early tool dispatch
+
+A parallel-calling.py style conversation (three function calls in one
+response, then a long final answer) is run against the scripted stand-in,
+once with blocking generate_content calls and once with
+stream_conversation. Reports time to the first byte of the final answer
+and total time.
+
+    python -m benchmarks.streaming --latency 0.3 --chunk-delay 0.05
+"""
+
+import argparse
+import time
+
+from google.genai import types
+
+from fc_toolkit import (StandInClient, ToolDispatcher, ToolRegistry, get_function_calls,
+                        run_function_calls, stream_conversation)
+from fc_toolkit.standin import function_call_step, text_step
+
+from .scenarios import load_functions
+
+MODEL = "gemini-2.5-flash"
+PROMPT = "I'm planning a trip to Tokyo. Can you give me the current temperature, time zone, and population?"
+ANSWER = ("Here's what you need for Tokyo: it's currently 28°C and humid, the time zone is JST (UTC+9) "
+          "where it's 04:30 right now, and the city has about 13.9 million people (37.4 million in the "
+          "metro area). Pack light clothes and an umbrella, and expect crowds on the trains. ") * 4
+
+
+def slow(function, seconds: float):
+    """Wraps a tool so it takes as long as a real backend call"""
+    def wrapper(city: str) -> dict:
+        time.sleep(seconds)
+        return function(city)
+    wrapper.__name__ = function.__name__
+    wrapper.__doc__ = function.__doc__
+    return wrapper
+
+
+def build(latency: float, chunk_delay: float, tool_seconds: list):
+    names = ["get_current_temperature", "get_time_zone", "get_population"]
+    functions = load_functions("03-calling-functions/parallel-calling.py", names, data=("SAMPLE_CITIES", "city_facts"))
+
+    registry = ToolRegistry()
+    for name, seconds in zip(names, tool_seconds):
+        registry.register(slow(functions[name], seconds))
+    registry.freeze()
+
+    script = [
+        function_call_step(*[(name, {"city": "Tokyo"}) for name in names]),
+        text_step(ANSWER),
+    ]
+    client = StandInClient(mode="scripted", script=script, latency=latency, chunk_chars=40, chunk_delay=chunk_delay)
+    return client, registry, ToolDispatcher.from_registry(registry)
+
+
+def blocking_run(client, registry, dispatcher) -> tuple:
+    start = time.perf_counter()
+    contents = [types.Content(role="user", parts=[types.Part(text=PROMPT)])]
+    response = client.models.generate_content(model=MODEL, contents=contents, config=registry.config())
+    parts = run_function_calls(get_function_calls(response), dispatcher)
+    contents += [response.candidates[0].content, types.Content(role="user", parts=parts)]
+    final = client.models.generate_content(model=MODEL, contents=contents, config=registry.config())
+    first_byte = total = time.perf_counter() - start
+    assert final.text
+    return first_byte, total
+
+
+def streaming_run(client, registry, dispatcher) -> tuple:
+    start = time.perf_counter()
+    first_byte = []
+
+    def on_text(chunk):
+        if not first_byte:
+            first_byte.append(time.perf_counter() - start)
+
+    contents = [types.Content(role="user", parts=[types.Part(text=PROMPT)])]
+    stream_conversation(client, model=MODEL, contents=contents, config=registry.config(),
+                        dispatcher=dispatcher, on_text=on_text)
+    return first_byte[0], time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.3, help="stand-in time to first chunk (s)")
+    parser.add_argument("--chunk-delay", type=float, default=0.05, help="stand-in time between chunks (s)")
+    parser.add_argument("--tool-seconds", type=float, nargs=3, default=[0.1, 0.4, 0.8])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    client, registry, dispatcher = build(args.latency, args.chunk_delay, args.tool_seconds)
+
+    print(f"{'mode':<12}{'first byte ms':>16}{'total ms':>12}")
+    print("-" * 40)
+    for name, run in (("blocking", blocking_run), ("streaming", streaming_run)):
+        results = [run(client, registry, dispatcher) for _ in range(args.runs)]
+        first_byte = sum(r[0] for r in results) / len(results)
+        total = sum(r[1] for r in results) / len(results)
+        print(f"{name:<12}{first_byte * 1000:>16.0f}{total * 1000:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,14 @@ Mock e-commerce inventory system
 In this scenario, the model can check the stock and price of a product by calling a function named get_product_details.
 """
 
+import os
+import tempfile
+
 from google import genai
 from google.genai import types
 
+from fc_toolkit import ProductCatalog
+
 client = genai.Client()
 
 # Declare the function
@@ -25,24 +30,69 @@ get_product_details_declaration = {
     }
 }
 
+# Batch variant for questions about many products at once ("which of these are in stock and under $100?")
+# One call and one compact table instead of one call and one result part per product
+get_product_details_batch_declaration = {
+    "name": "get_product_details_batch",
+    "description": "Get the price, name, and stock information for several product IDs at once, optionally keeping only the products that match the filters",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "product_ids": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "The product IDs to look up, e.g., [\"PROD-101\", \"PROD-205\"]"
+            },
+            "in_stock": {
+                "type": "boolean",
+                "description": "true to keep only products in stock, false to keep only sold out products"
+            },
+            "min_price": {
+                "type": "number",
+                "description": "Lowest price to include"
+            },
+            "max_price": {
+                "type": "number",
+                "description": "Highest price to include"
+            }
+        },
+        "required": ["product_ids"]
+    }
+}
+
+# Sample product database
+sample_products = [
+    ("PROD-101", "Wireless Noise-Cancelling Headphones", 249.99, 150),
+    ("PROD-205", "Smart Fitness Tracker", 89.95, 75),
+    ("PROD-315", "4K Ultra HD Streaming Device", 49.99, 0),
+    ("PROD-404", "Portable Bluetooth Speaker", 119.00, 210),
+]
+
+# The products are served from an indexed, memory-mapped catalog file that is opened once.
+# Point FC_PRODUCT_CATALOG at a full catalog (python -m fc_toolkit.catalog build products.csv <file>)
+# to use it instead of the sample
+catalog_path = os.environ.get("FC_PRODUCT_CATALOG")
+if catalog_path:
+    catalog = ProductCatalog(catalog_path)
+else:
+    # A directory of its own, so runs at the same time don't rebuild each other's file
+    sample_dir = tempfile.TemporaryDirectory(prefix="fc-sample-products-", ignore_cleanup_errors=True)
+    catalog = ProductCatalog.build(sample_products, os.path.join(sample_dir.name, "products.dat"))
+
 # Define the function
 def get_product_details(product_id: str) -> dict:
     """Gets product details using the product ID"""
+    # Case-insensitive, like product_id.upper() on the old dict
+    return catalog.get(product_id)
 
-    # Sample product database
-    products = {
-        "PROD-101": {"name": "Wireless Noise-Cancelling Headphones", "price": 249.99, "in_stock": 150},
-        "PROD-205": {"name": "Smart Fitness Tracker", "price": 89.95, "in_stock": 75},
-        "PROD-315": {"name": "4K Ultra HD Streaming Device", "price": 49.99, "in_stock": 0},
-        "PROD-404": {"name": "Portable Bluetooth Speaker", "price": 119.00, "in_stock": 210},
-    }
-
-    return products.get(product_id.upper(), {"error": "Product not found"})
+def get_product_details_batch(product_ids: list, in_stock: bool = None, min_price: float = None, max_price: float = None) -> dict:
+    """Gets the details of several products at once, filtered by stock and price"""
+    return catalog.get_many(product_ids, in_stock=in_stock, min_price=min_price, max_price=max_price)
 
 
 # Set up the tool 
 # this is required for function declarations, not needed for automatic FC
-tools = types.Tool(function_declarations=[get_product_details_declaration])
+tools = types.Tool(function_declarations=[get_product_details_declaration, get_product_details_batch_declaration])
 
 # Add the tool to the model generation configuration
 config = types.GenerateContentConfig(
@@ -0,0 +1,115 @@
+"""
+Shared helpers for the function calling demos
+
+The lesson scripts stay self-contained; anything that several scripts need
+(dispatching tool calls, HTTP sessions, caching, ...) lives here instead.
+"""
+
+from .batch import BatchRunner, BatchStats
+from .cache import CacheStats, TTLCache
+from .catalog import ProductCatalog, build_catalog, iter_product_file
+from .cityfacts import CityFacts, iter_city_file, normalize_city
+from .dispatch import ToolDispatcher
+from .forecast import ForecastEngine
+from .gazetteer import LocationResolver, PlaceMatch, iter_place_file, normalize_place
+from .emails import EmailStats, check_email, summarize_emails, validate_email_file, validate_emails
+from .errors import ToolError, error_response
+from .history import ConversationHistory, HistoryStats, estimate_tokens
+from .http_session import HttpSessionConfig, close_http, configure_http, get_session, http_get
+from .parallel import get_function_calls, run_function_calls, run_function_calls_async
+from .passwords import generate_passwords, password_strength, random_characters
+from .plan import PlanError, PlanRun, PlanStep, execute_plan, parse_plan, plan_declaration, run_plan_mode
+from .ratelimit import AdaptiveConcurrency, RateLimitedClient, RateLimitStats, TokenBucket, is_throttling_error
+from .registry import ToolRegistry, declaration_from_function, parse_docstring
+from .resilience import DeadlineExceeded, ResilienceStats, ResilientClient, is_retryable_error
+from .response_cache import ResponseCache, request_fingerprint
+from .singleflight import SingleFlight, SingleFlightStats, call_key, single_flight
+from .speculation import SpeculationStats, Speculator, from_result
+from .standin import ReplayMiss, StandInClient, StandInModel, client_from_env, serve_standin
+from .streaming import StreamedTurn, stream_conversation, stream_turn
+from .usage import TokenBudgetExceeded, UsageRecord, UsageTotals, UsageTracker, tool_set_key
+from .validation import InvalidArguments, compile_declaration, compile_schema
+
+__all__ = [
+    "BatchRunner",
+    "BatchStats",
+    "CacheStats",
+    "TTLCache",
+    "ProductCatalog",
+    "build_catalog",
+    "iter_product_file",
+    "CityFacts",
+    "iter_city_file",
+    "normalize_city",
+    "ToolDispatcher",
+    "ForecastEngine",
+    "LocationResolver",
+    "PlaceMatch",
+    "iter_place_file",
+    "normalize_place",
+    "EmailStats",
+    "check_email",
+    "summarize_emails",
+    "validate_email_file",
+    "validate_emails",
+    "ToolError",
+    "error_response",
+    "ConversationHistory",
+    "HistoryStats",
+    "estimate_tokens",
+    "HttpSessionConfig",
+    "close_http",
+    "configure_http",
+    "get_session",
+    "http_get",
+    "get_function_calls",
+    "run_function_calls",
+    "run_function_calls_async",
+    "generate_passwords",
+    "password_strength",
+    "random_characters",
+    "PlanError",
+    "PlanRun",
+    "PlanStep",
+    "execute_plan",
+    "parse_plan",
+    "plan_declaration",
+    "run_plan_mode",
+    "AdaptiveConcurrency",
+    "RateLimitedClient",
+    "RateLimitStats",
+    "TokenBucket",
+    "is_throttling_error",
+    "ToolRegistry",
+    "declaration_from_function",
+    "parse_docstring",
+    "DeadlineExceeded",
+    "ResilienceStats",
+    "ResilientClient",
+    "is_retryable_error",
+    "ResponseCache",
+    "request_fingerprint",
+    "SingleFlight",
+    "SingleFlightStats",
+    "call_key",
+    "single_flight",
+    "SpeculationStats",
+    "Speculator",
+    "from_result",
+    "ReplayMiss",
+    "StandInClient",
+    "StandInModel",
+    "client_from_env",
+    "serve_standin",
+    "StreamedTurn",
+    "stream_conversation",
+    "stream_turn",
+    "TokenBudgetExceeded",
+    "UsageRecord",
+    "UsageTotals",
+    "UsageTracker",
+    "tool_set_key",
+    "InvalidArguments",
+    "compile_declaration",
+    "compile_schema",
+]
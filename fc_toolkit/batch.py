@@ -0,0 +1,307 @@
+"""
+Batch runner for JSONL prompt files
+
+Streams prompts from a JSONL file and answers them with a bounded window of
+concurrent conversations, each with the full tool-calling loop. Results are
+written as JSONL in completion order, each tagged with the line index it
+came from, and progress is checkpointed so an interrupted run picks up
+where it stopped:
+
+    python -m fc_toolkit.batch prompts.jsonl results.jsonl --concurrency 32
+
+Only the lines in flight are held in memory. The checkpoint records a
+watermark (every line before it is done, with its byte offset in the input
+so a resume seeks straight to it), the few finished lines past the
+watermark, and how much of the output file was written when the checkpoint
+was taken. On resume the output is cut back to that point, so every line
+appears in the results exactly once.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+
+from google.genai import types
+
+from .dispatch import ToolDispatcher
+from .parallel import get_function_calls, run_function_calls
+
+DEFAULT_CONCURRENCY = 16
+
+
+@dataclass
+class BatchStats:
+    """Counters for one BatchRunner.run call.
+
+    Attributes:
+        completed: Lines answered in this run
+        failed: Lines that ended in an error record (included in completed)
+        skipped: Lines already done in an earlier run
+        model_calls: generate_content calls made
+        elapsed: Wall time of the run in seconds
+    """
+    completed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    model_calls: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def lines_per_sec(self) -> float:
+        return self.completed / self.elapsed if self.elapsed else 0.0
+
+
+class _Checkpoint:
+    """Tracks which input lines are done and saves that atomically"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.watermark = 0
+        self.watermark_offset = 0
+        self.output_offset = 0
+        self.done = set()
+        # Byte offset of every line read and not yet passed by the watermark
+        self.offsets = {}
+
+    def load(self) -> bool:
+        if not self.path or not os.path.exists(self.path):
+            return False
+        with open(self.path, encoding="utf-8") as f:
+            state = json.load(f)
+        self.watermark = state["watermark"]
+        self.watermark_offset = state["watermark_offset"]
+        self.output_offset = state["output_offset"]
+        self.done = set(state["done"])
+        return True
+
+    def is_done(self, index: int) -> bool:
+        return index < self.watermark or index in self.done
+
+    def mark_done(self, index: int) -> None:
+        self.done.add(index)
+        while self.watermark in self.done:
+            self.done.discard(self.watermark)
+            self.offsets.pop(self.watermark, None)
+            self.watermark += 1
+
+    def save(self, output_offset: int, input_offset: int) -> None:
+        # If the watermark line hasn't been read yet, every line read so far is done
+        # and the watermark line starts where reading stopped
+        self.watermark_offset = self.offsets.get(self.watermark, input_offset)
+        self.output_offset = output_offset
+        state = {"watermark": self.watermark, "watermark_offset": self.watermark_offset,
+                 "output_offset": output_offset, "done": sorted(self.done)}
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(temp_path, self.path)
+
+
+class BatchRunner:
+    """Answers every prompt in a JSONL file with a bounded number of conversations in flight.
+
+    Each input line is either a JSON string (the prompt) or an object holding
+    the prompt in prompt_field; the value of id_field, if present, is copied
+    to the result.
+
+    Args:
+        client: A genai.Client (or StandInClient)
+        model: Model name
+        config: GenerateContentConfig with the tools; with declarations
+            (automatic function calling off) the calls are executed by dispatcher
+        dispatcher: ToolDispatcher for the function calls the model makes
+        concurrency: Conversations in flight at once
+        max_rounds: Model calls allowed per prompt before giving up
+        prompt_field: Key holding the prompt in object lines
+        id_field: Key copied from the input line to the result, if present
+        checkpoint_every: Completed lines between checkpoints
+    """
+
+    def __init__(self, client, *, model: str, config=None, dispatcher: ToolDispatcher = None,
+                 concurrency: int = DEFAULT_CONCURRENCY, max_rounds: int = 10,
+                 prompt_field: str = "prompt", id_field: str = "id", checkpoint_every: int = 100):
+        self.client = client
+        self.model = model
+        self.config = config
+        self.dispatcher = dispatcher
+        self.concurrency = concurrency
+        self.max_rounds = max_rounds
+        self.prompt_field = prompt_field
+        self.id_field = id_field
+        self.checkpoint_every = checkpoint_every
+
+    def answer(self, prompt: str) -> dict:
+        """Runs one conversation to its final answer, executing any function calls on the way"""
+        contents = [types.Content(role="user", parts=[types.Part(text=prompt)])]
+        called, usage = [], {"prompt_tokens": 0, "candidates_tokens": 0}
+
+        for model_calls in range(1, self.max_rounds + 1):
+            response = self.client.models.generate_content(model=self.model, contents=contents, config=self.config)
+            if response.usage_metadata is not None:
+                usage["prompt_tokens"] += response.usage_metadata.prompt_token_count or 0
+                usage["candidates_tokens"] += response.usage_metadata.candidates_token_count or 0
+
+            function_calls = get_function_calls(response)
+            if not function_calls or self.dispatcher is None:
+                return {"text": response.text, "function_calls": called, "model_calls": model_calls, "usage": usage}
+
+            called += [call.name for call in function_calls]
+            parts = run_function_calls(function_calls, self.dispatcher)
+            contents += [response.candidates[0].content, types.Content(role="user", parts=parts)]
+
+        return {"error": f"No final answer after {self.max_rounds} model calls", "function_calls": called,
+                "model_calls": self.max_rounds, "usage": usage}
+
+    def _process(self, index: int, line: bytes) -> dict:
+        record = {"index": index}
+        try:
+            item = json.loads(line)
+            if isinstance(item, dict):
+                if self.id_field in item:
+                    record["id"] = item[self.id_field]
+                prompt = item[self.prompt_field]
+            else:
+                prompt = item
+            if not isinstance(prompt, str):
+                raise ValueError(f"{self.prompt_field} must be a string")
+            record.update(self.answer(prompt))
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+        return record
+
+    def run(self, input_path: str, output_path: str, checkpoint_path: str = None, resume: bool = True) -> BatchStats:
+        """Processes input_path, appending one result line per input line to output_path.
+
+        Args:
+            input_path: JSONL file of prompts, read line by line
+            output_path: JSONL file the results are written to, in completion order
+            checkpoint_path: Where progress is saved; defaults to output_path + ".checkpoint"
+            resume: Continue from the checkpoint if there is one; otherwise start over.
+                A checkpoint is ignored if output_path is missing or shorter than it says.
+
+        Returns:
+            The BatchStats for this run.
+        """
+        checkpoint = _Checkpoint(checkpoint_path or f"{output_path}.checkpoint")
+        resuming = resume and checkpoint.load()
+        if resuming and (not os.path.exists(output_path) or os.path.getsize(output_path) < checkpoint.output_offset):
+            # The results the checkpoint counts on are gone, so every line has to be redone
+            checkpoint = _Checkpoint(checkpoint.path)
+            resuming = False
+        stats = BatchStats()
+        start = time.perf_counter()
+
+        with open(input_path, "rb") as source, open(output_path, "r+b" if resuming else "wb") as sink, \
+                ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            if resuming:
+                # Anything written after the last checkpoint will be redone
+                sink.truncate(checkpoint.output_offset)
+                sink.seek(checkpoint.output_offset)
+                source.seek(checkpoint.watermark_offset)
+                stats.skipped = checkpoint.watermark
+
+            index, offset = checkpoint.watermark, checkpoint.watermark_offset
+            in_flight, since_checkpoint = {}, 0
+
+            def finish(done):
+                nonlocal since_checkpoint
+                for future in done:
+                    line_index = in_flight.pop(future)
+                    record = future.result()
+                    sink.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+                    checkpoint.mark_done(line_index)
+                    stats.completed += 1
+                    stats.failed += "error" in record
+                    stats.model_calls += record.get("model_calls", 0)
+                    since_checkpoint += 1
+                if since_checkpoint >= self.checkpoint_every:
+                    sink.flush()
+                    checkpoint.save(sink.tell(), offset)
+                    since_checkpoint = 0
+
+            for line in source:
+                line_index, line_offset = index, offset
+                index, offset = index + 1, offset + len(line)
+
+                if checkpoint.is_done(line_index):
+                    stats.skipped += 1
+                    continue
+                if not line.strip():
+                    checkpoint.offsets[line_index] = line_offset
+                    checkpoint.mark_done(line_index)
+                    continue
+
+                checkpoint.offsets[line_index] = line_offset
+                in_flight[executor.submit(self._process, line_index, line)] = line_index
+                if len(in_flight) >= self.concurrency:
+                    finish(wait(in_flight, return_when=FIRST_COMPLETED)[0])
+
+            while in_flight:
+                finish(wait(in_flight, return_when=FIRST_COMPLETED)[0])
+
+            sink.flush()
+            checkpoint.save(sink.tell(), offset)
+
+        stats.elapsed = time.perf_counter() - start
+        return stats
+
+
+def _load_tools(spec: str):
+    """Loads "module:attribute", a ToolRegistry or a list of functions, as (config, dispatcher)"""
+    import importlib
+
+    from .registry import ToolRegistry
+
+    module_name, _, attribute = spec.partition(":")
+    tools = getattr(importlib.import_module(module_name), attribute)
+    if not isinstance(tools, ToolRegistry):
+        registry = ToolRegistry()
+        for function in tools:
+            registry.register(function)
+        tools = registry
+    config = tools.config(automatic_function_calling=types.AutomaticFunctionCallingConfig(disable=True))
+    return config, ToolDispatcher.from_registry(tools)
+
+
+def main():
+    import argparse
+
+    from .ratelimit import AdaptiveConcurrency, RateLimitedClient
+    from .resilience import ResilientClient
+    from .standin import client_from_env
+
+    parser = argparse.ArgumentParser(description="Answer every prompt in a JSONL file")
+    parser.add_argument("input", help="JSONL file of prompts")
+    parser.add_argument("output", help="JSONL file to write the results to")
+    parser.add_argument("--model", default="gemini-2.5-flash")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--prompt-field", default="prompt", help="key holding the prompt in object lines")
+    parser.add_argument("--id-field", default="id", help="key copied from each input line to its result")
+    parser.add_argument("--tools", help="module:attribute holding a ToolRegistry or a list of tool functions")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and start over")
+    parser.add_argument("--rpm", type=int, help="requests per minute quota to stay under")
+    parser.add_argument("--tpm", type=int, help="tokens per minute quota to stay under")
+    parser.add_argument("--deadline", type=float, help="seconds each model call may take, retries included")
+    parser.add_argument("--hedge", action="store_true", help="duplicate model calls that run past the p95")
+    args = parser.parse_args()
+
+    client = client_from_env()
+    if args.rpm or args.tpm:
+        client = RateLimitedClient(client, rpm=args.rpm, tpm=args.tpm,
+                                   concurrency=AdaptiveConcurrency(maximum=args.concurrency))
+    if args.deadline or args.hedge:
+        client = ResilientClient(client, deadline=args.deadline, hedge=args.hedge,
+                                 max_workers=2 * args.concurrency)
+
+    config, dispatcher = _load_tools(args.tools) if args.tools else (None, None)
+    runner = BatchRunner(client, model=args.model, config=config, dispatcher=dispatcher,
+                         concurrency=args.concurrency, prompt_field=args.prompt_field, id_field=args.id_field)
+    stats = runner.run(args.input, args.output, resume=not args.restart)
+    print(f"{stats.completed} lines answered ({stats.failed} failed, {stats.skipped} already done) "
+          f"in {stats.elapsed:.1f}s, {stats.lines_per_sec:.1f} lines/sec, {stats.model_calls} model calls")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+In-memory cache with TTL expiry and LRU eviction
+
+Tools that read slowly changing reference data (like the JSONPlaceholder user
+list) can keep the last response around for a while instead of fetching it
+again on every call. Entries expire after ttl seconds, and once the cache is
+full the least recently used entry is evicted.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+
+_MISSING = object()
+
+
+@dataclass
+class CacheStats:
+    """Running counters for a cache.
+
+    Attributes:
+        hits: Lookups answered from the cache
+        misses: Lookups that found nothing usable (absent or expired)
+        evictions: Entries dropped to stay within maxsize
+        expirations: Entries dropped because their TTL ran out
+    """
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "hit_rate": round(self.hit_rate, 4)}
+
+
+class TTLCache:
+    """A thread-safe mapping whose entries expire and are evicted least recently used first.
+
+    Args:
+        maxsize: Maximum number of entries to keep
+        ttl: Seconds an entry stays valid after it is stored
+        clock: Function returning the current time in seconds (monotonic by default)
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 300.0, clock=time.monotonic):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        """Returns the cached value for key, or default if it is missing or expired"""
+        with self._lock:
+            value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def set(self, key, value) -> None:
+        """Stores value under key, evicting the least recently used entry if full"""
+        with self._lock:
+            self._store(key, value)
+
+    def get_or_load(self, key, loader):
+        """Returns the cached value for key, calling loader() to fill it on a miss.
+
+        Exceptions raised by loader are not cached and propagate to the caller.
+        """
+        with self._lock:
+            value = self._lookup(key)
+        if value is not _MISSING:
+            return value
+
+        value = loader()
+        with self._lock:
+            self._store(key, value)
+        return value
+
+    def invalidate(self, key) -> None:
+        """Removes key from the cache if present"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Removes every entry; the stats are kept"""
+        with self._lock:
+            self._entries.clear()
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return _MISSING
+
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return _MISSING
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def _store(self, key, value) -> None:
+        self._entries[key] = (self._clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
@@ -0,0 +1,417 @@
+"""
+Indexed on-disk product catalog
+
+A catalog file holds every product as a compact binary record plus an
+open-addressing hash index on the product ID, and is memory-mapped when
+opened. A lookup hashes the normalized ID, probes the index and unpacks one
+record, touching a couple of pages; only the pages actually read become
+resident, so a catalog with tens of millions of SKUs opens instantly.
+
+File layout (little endian):
+
+    header   magic "FCCAT001", product count, index slots, index offset
+    records  per product: key length (u16), name length (u16), price (f64),
+             in_stock (i64), upper-cased product ID, name (UTF-8)
+    index    slots x (hash u64, record offset u64); offset 0 marks a free slot
+
+Price and stock sit at fixed positions in a record, so update() changes them
+in place without rebuilding anything. New products and renames go to a small
+JSONL delta file next to the catalog, which is read into memory on open and
+folded into the main file by compact().
+
+    python -m fc_toolkit.catalog build products.csv catalog.dat
+    python -m fc_toolkit.catalog get catalog.dat prod-101
+"""
+
+import csv
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+from array import array
+
+MAGIC = b"FCCAT001"
+HEADER = struct.Struct("<8sQQQ")
+HEADER_SIZE = 64
+RECORD = struct.Struct("<HHdq")
+SLOT = struct.Struct("<QQ")
+PRICE_OFFSET = 4
+STOCK_OFFSET = 12
+MAX_LOAD = 0.7
+
+NOT_FOUND = {"error": "Product not found"}
+
+
+def normalize_product_id(product_id: str) -> str:
+    """The form IDs are stored and looked up in, same as get_product_details' product_id.upper()"""
+    return product_id.upper()
+
+
+def _hash(key: bytes) -> int:
+    # 0 marks a free slot in the index, so no key may hash to it
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little") or 1
+
+
+def _slots_for(count: int) -> int:
+    slots = 8
+    while slots * MAX_LOAD < count:
+        slots *= 2
+    return slots
+
+
+def iter_product_file(path: str):
+    """Streams product records from a CSV file (with a header row) or a JSONL file.
+
+    Each record needs product_id, name, price and in_stock.
+
+    Yields:
+        (product_id, name, price, in_stock) tuples.
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith((".jsonl", ".json", ".ndjson")):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            rows = csv.DictReader(f)
+        for row in rows:
+            yield row["product_id"], row["name"], float(row["price"]), int(row["in_stock"])
+
+
+def build_catalog(products, path: str) -> int:
+    """Writes a catalog file from (product_id, name, price, in_stock) tuples.
+
+    Records are streamed to disk as they come; only an 8-byte hash and an
+    8-byte offset per product are kept in memory to build the index. When a
+    product ID appears twice the last record wins.
+
+    Returns:
+        The number of distinct products written.
+    """
+    hashes, offsets = array("Q"), array("Q")
+    temp_path = f"{path}.tmp"
+
+    with open(temp_path, "w+b") as f:
+        f.write(b"\0" * HEADER_SIZE)
+        offset = HEADER_SIZE
+        for product_id, name, price, in_stock in products:
+            key = normalize_product_id(product_id).encode("utf-8")
+            name_bytes = name.encode("utf-8")
+            record = RECORD.pack(len(key), len(name_bytes), price, in_stock) + key + name_bytes
+            f.write(record)
+            hashes.append(_hash(key))
+            offsets.append(offset)
+            offset += len(record)
+
+        index_offset = offset
+        slots = _slots_for(len(hashes))
+        f.truncate(index_offset + slots * SLOT.size)
+        f.flush()
+
+        count = 0
+        with mmap.mmap(f.fileno(), 0) as view:
+            mask = slots - 1
+            for key_hash, record_offset in zip(hashes, offsets):
+                slot = key_hash & mask
+                while True:
+                    position = index_offset + slot * SLOT.size
+                    stored_hash, stored_offset = SLOT.unpack_from(view, position)
+                    if stored_offset == 0:
+                        count += 1
+                        break
+                    if stored_hash == key_hash and _key_at(view, stored_offset) == _key_at(view, record_offset):
+                        break
+                    slot = (slot + 1) & mask
+                SLOT.pack_into(view, position, key_hash, record_offset)
+            HEADER.pack_into(view, 0, MAGIC, count, slots, index_offset)
+            view.flush()
+
+    os.replace(temp_path, path)
+    return count
+
+
+def _key_at(view, offset: int) -> bytes:
+    key_length = int.from_bytes(view[offset:offset + 2], "little")
+    start = offset + RECORD.size
+    return view[start:start + key_length]
+
+
+class _Mapping:
+    """One opened version of the catalog file and its delta.
+
+    compact() swaps in a new one whole, so a lookup that took the old one
+    keeps reading a consistent file. The old map is closed once the last
+    reader drops it.
+    """
+
+    def __init__(self, path: str, delta_path: str, writable: bool):
+        self.file = open(path, "r+b" if writable else "rb")
+        access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+        self.view = mmap.mmap(self.file.fileno(), 0, access=access)
+        magic, self.count, self.slots, self.index_offset = HEADER.unpack_from(self.view, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a product catalog")
+        self.mask = self.slots - 1
+
+        # Products added or renamed since the last compact(), by normalized ID
+        self.delta = {}
+        if os.path.exists(delta_path):
+            with open(delta_path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        item = json.loads(line)
+                        self.delta[item["product_id"]] = (item["name"], item["price"], item["in_stock"])
+
+    def find(self, key: bytes):
+        """Returns the record offset for a normalized key, or None"""
+        view, key_hash = self.view, _hash(key)
+        slot = key_hash & self.mask
+        while True:
+            stored_hash, offset = SLOT.unpack_from(view, self.index_offset + slot * SLOT.size)
+            if offset == 0:
+                return None
+            if stored_hash == key_hash and _key_at(view, offset) == key:
+                return offset
+            slot = (slot + 1) & self.mask
+
+    def record(self, offset: int) -> dict:
+        key_length, name_length, price, in_stock = RECORD.unpack_from(self.view, offset)
+        start = offset + RECORD.size + key_length
+        return {"name": self.view[start:start + name_length].decode("utf-8"), "price": price, "in_stock": in_stock}
+
+    def close(self) -> None:
+        if not self.view.closed:
+            self.view.close()
+        self.file.close()
+
+    def __del__(self):
+        if hasattr(self, "view"):
+            self.close()
+
+
+class ProductCatalog:
+    """Read access and in-place updates for a catalog file built by build_catalog.
+
+    Lookups take no lock; update(), upsert() and compact() are serialized.
+
+    Args:
+        path: The catalog file
+        writable: Map the file read-write so update(), upsert() and compact() can change it
+    """
+
+    def __init__(self, path: str, writable: bool = False):
+        self.path = path
+        self.delta_path = f"{path}.delta"
+        self.writable = writable
+        self._lock = threading.Lock()
+        self._mapping = _Mapping(path, self.delta_path, writable)
+
+    @classmethod
+    def build(cls, products, path: str, writable: bool = False) -> "ProductCatalog":
+        """Builds a catalog file from (product_id, name, price, in_stock) tuples and opens it"""
+        build_catalog(products, path)
+        if os.path.exists(f"{path}.delta"):
+            os.remove(f"{path}.delta")
+        return cls(path, writable=writable)
+
+    def close(self) -> None:
+        self._mapping.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        mapping = self._mapping
+        return mapping.count + sum(1 for key in mapping.delta if mapping.find(key.encode("utf-8")) is None)
+
+    def __contains__(self, product_id: str) -> bool:
+        key, mapping = normalize_product_id(product_id), self._mapping
+        return key in mapping.delta or mapping.find(key.encode("utf-8")) is not None
+
+    def _check_writable(self) -> None:
+        if not self.writable:
+            raise PermissionError("Open the catalog with writable=True to change it")
+
+    def get(self, product_id: str) -> dict:
+        """Looks a product up by ID, case-insensitively.
+
+        Returns:
+            {"name", "price", "in_stock"}, or {"error": "Product not found"}.
+        """
+        key, mapping = normalize_product_id(product_id), self._mapping
+        if mapping.delta and key in mapping.delta:
+            name, price, in_stock = mapping.delta[key]
+            return {"name": name, "price": price, "in_stock": in_stock}
+        offset = mapping.find(key.encode("utf-8"))
+        if offset is None:
+            return dict(NOT_FOUND)
+        return mapping.record(offset)
+
+    def get_many(self, product_ids, in_stock: bool = None, min_price: float = None,
+                 max_price: float = None) -> dict:
+        """Looks up several products in one pass and keeps those matching the filters.
+
+        The result is a table instead of one object per product, so the
+        field names are sent once however many products match.
+
+        Args:
+            product_ids: Product IDs, case-insensitive; duplicates are looked up once
+            in_stock: True for products with stock only, False for sold out ones only
+            min_price: Lowest price to include
+            max_price: Highest price to include
+
+        Returns:
+            {"columns": [...], "rows": [[product_id, name, price, in_stock], ...],
+            "not_found": [...]} with rows in the order the IDs were given.
+        """
+        rows, not_found, seen = [], [], set()
+        for product_id in product_ids:
+            key = normalize_product_id(product_id)
+            if key in seen:
+                continue
+            seen.add(key)
+
+            product = self.get(key)
+            if "error" in product:
+                not_found.append(product_id)
+                continue
+            if in_stock is not None and (product["in_stock"] > 0) != in_stock:
+                continue
+            if min_price is not None and product["price"] < min_price:
+                continue
+            if max_price is not None and product["price"] > max_price:
+                continue
+            rows.append([key, product["name"], product["price"], product["in_stock"]])
+
+        return {"columns": ["product_id", "name", "price", "in_stock"], "rows": rows, "not_found": not_found}
+
+    def update(self, product_id: str, price: float = None, in_stock: int = None) -> bool:
+        """Changes the price and/or stock of an existing product in place.
+
+        Returns:
+            False if there is no such product.
+        """
+        self._check_writable()
+        key = normalize_product_id(product_id)
+        with self._lock:
+            mapping = self._mapping
+            if key in mapping.delta:
+                name, old_price, old_stock = mapping.delta[key]
+                self._append_delta(key, name, old_price if price is None else price,
+                                   old_stock if in_stock is None else in_stock)
+                return True
+
+            offset = mapping.find(key.encode("utf-8"))
+            if offset is None:
+                return False
+            if price is not None:
+                struct.pack_into("<d", mapping.view, offset + PRICE_OFFSET, price)
+            if in_stock is not None:
+                struct.pack_into("<q", mapping.view, offset + STOCK_OFFSET, in_stock)
+            return True
+
+    def upsert(self, product_id: str, name: str, price: float, in_stock: int) -> None:
+        """Adds a product or replaces one; renames and new products go to the delta file"""
+        self._check_writable()
+        key = normalize_product_id(product_id)
+        mapping = self._mapping
+        offset = mapping.find(key.encode("utf-8"))
+        if offset is not None and key not in mapping.delta and mapping.record(offset)["name"] == name:
+            self.update(key, price=price, in_stock=in_stock)
+            return
+        with self._lock:
+            self._append_delta(key, name, price, in_stock)
+
+    def _append_delta(self, key: str, name: str, price: float, in_stock: int) -> None:
+        with open(self.delta_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"product_id": key, "name": name, "price": price, "in_stock": in_stock}) + "\n")
+        self._mapping.delta[key] = (name, price, in_stock)
+
+    def flush(self) -> None:
+        """Makes in-place updates durable"""
+        if self.writable:
+            self._mapping.view.flush()
+
+    def items(self):
+        """Yields (product_id, name, price, in_stock) for every product, delta included"""
+        mapping = self._mapping
+        view, chunk = mapping.view, 65536 * SLOT.size
+        end = mapping.index_offset + mapping.slots * SLOT.size
+        # Walk the index a chunk at a time so a huge catalog isn't copied into memory at once
+        for start in range(mapping.index_offset, end, chunk):
+            for _, offset in SLOT.iter_unpack(view[start:min(start + chunk, end)]):
+                if not offset:
+                    continue
+                key = _key_at(view, offset).decode("utf-8")
+                if key in mapping.delta:
+                    continue
+                record = mapping.record(offset)
+                yield key, record["name"], record["price"], record["in_stock"]
+        for key, (name, price, in_stock) in list(mapping.delta.items()):
+            yield key, name, price, in_stock
+
+    def compact(self) -> int:
+        """Rebuilds the catalog file with the delta folded in, then reopens it.
+
+        Lookups running meanwhile finish on the old map, which is closed once
+        they drop it.
+
+        Returns:
+            The number of products in the rebuilt catalog.
+        """
+        self._check_writable()
+        with self._lock:
+            count = build_catalog(self.items(), f"{self.path}.compact")
+            os.replace(f"{self.path}.compact", self.path)
+            if os.path.exists(self.delta_path):
+                os.remove(self.delta_path)
+            self._mapping = _Mapping(self.path, self.delta_path, self.writable)
+        return count
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build, query and update product catalog files")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="build a catalog from a CSV or JSONL product file")
+    build.add_argument("source")
+    build.add_argument("catalog")
+
+    get = commands.add_parser("get", help="look products up")
+    get.add_argument("catalog")
+    get.add_argument("product_ids", nargs="+")
+
+    update = commands.add_parser("update", help="change the price and/or stock of a product in place")
+    update.add_argument("catalog")
+    update.add_argument("product_id")
+    update.add_argument("--price", type=float)
+    update.add_argument("--in-stock", type=int)
+
+    compact = commands.add_parser("compact", help="fold the delta file into the catalog")
+    compact.add_argument("catalog")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        print(f"{build_catalog(iter_product_file(args.source), args.catalog)} products written to {args.catalog}")
+    elif args.command == "get":
+        with ProductCatalog(args.catalog) as catalog:
+            for product_id in args.product_ids:
+                print(product_id, json.dumps(catalog.get(product_id)))
+    elif args.command == "update":
+        with ProductCatalog(args.catalog, writable=True) as catalog:
+            if not catalog.update(args.product_id, price=args.price, in_stock=args.in_stock):
+                parser.exit(1, f"{args.product_id}: product not found\n")
+            catalog.flush()
+    else:
+        with ProductCatalog(args.catalog, writable=True) as catalog:
+            print(f"{catalog.compact()} products in {args.catalog}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Columnar store of city facts
+
+Temperature, time zone and population lookups all start the same way: turn
+the city name into a key and find the city. CityFacts does that once per
+question. It keeps one index from normalized city name to a row number,
+and every fact in its own compact column (typed arrays for numbers, small
+code arrays for repeated strings like conditions and time zone names), so
+100k+ cities take a few megabytes and a multi-city, multi-field question is
+one pass over the requested rows.
+
+Data files are CSV (with a header row) or JSONL with the columns:
+
+    name, temperature, condition, tz_name, tz_offset_minutes, population, metro_population
+"""
+
+import csv
+import json
+import math
+import time
+from array import array
+
+COLUMNS = ("name", "temperature", "condition", "tz_name", "tz_offset_minutes", "population", "metro_population")
+PROFILE_FIELDS = ("temperature", "condition", "timezone", "current_time", "population", "metro_area")
+
+
+def normalize_city(name: str) -> str:
+    """Lookup key for a city name: case-insensitive, surrounding and repeated spaces ignored"""
+    return " ".join(name.split()).casefold()
+
+
+def _format_offset(minutes: int) -> str:
+    sign = "+" if minutes >= 0 else "-"
+    hours, rest = divmod(abs(minutes), 60)
+    return f"UTC{sign}{hours}" + (f":{rest:02d}" if rest else "")
+
+
+def _millions(count: int) -> str:
+    return f"{count / 1_000_000:.1f} million"
+
+
+def iter_city_file(path: str):
+    """Streams city records (dicts with the data file columns) from a CSV or JSONL file"""
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith((".jsonl", ".json", ".ndjson")):
+            yield from (json.loads(line) for line in f if line.strip())
+        else:
+            yield from csv.DictReader(f)
+
+
+class _Codes:
+    """A column of repeated strings stored as small integer codes"""
+
+    def __init__(self):
+        self.values = []
+        self.codes = array("H")
+        self._lookup = {}
+
+    def _code(self, value: str) -> int:
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def append(self, value: str) -> None:
+        self.codes.append(self._code(value))
+
+    def __setitem__(self, row: int, value: str) -> None:
+        self.codes[row] = self._code(value)
+
+    def __getitem__(self, row: int) -> str:
+        return self.values[self.codes[row]]
+
+
+class CityFacts:
+    """Temperature, condition, time zone and population for a set of cities, loaded once"""
+
+    def __init__(self):
+        self.names = []
+        self.index = {}
+        self.temperature = array("d")
+        self.condition = _Codes()
+        self.tz_name = _Codes()
+        self.tz_offset = array("h")
+        self.population = array("q")
+        self.metro_population = array("q")
+        # "JST (UTC+9)" strings by (tz_name, offset); there are only a few hundred distinct ones
+        self._timezones = {}
+
+    @classmethod
+    def from_records(cls, records) -> "CityFacts":
+        """Builds the store from dicts with the data file columns; a repeated city keeps its last record.
+
+        Other keys are ignored and missing columns left empty, so real-world
+        files with extra columns load as they are.
+        """
+        facts = cls()
+        for record in records:
+            facts.add(record["name"], *(record.get(column) for column in COLUMNS[1:]))
+        return facts
+
+    @classmethod
+    def from_file(cls, path: str) -> "CityFacts":
+        return cls.from_records(iter_city_file(path))
+
+    def add(self, name: str, temperature, condition: str, tz_name: str, tz_offset_minutes,
+            population, metro_population) -> None:
+        """Adds a city, or replaces the facts of one already there (values from a CSV file may be strings)"""
+        values = (
+            name,
+            float(temperature) if temperature not in ("", None) else math.nan,
+            condition or "unknown",
+            tz_name or "",
+            int(tz_offset_minutes or 0),
+            int(population or 0),
+            int(metro_population or 0),
+        )
+        columns = (self.names, self.temperature, self.condition, self.tz_name,
+                   self.tz_offset, self.population, self.metro_population)
+
+        key = normalize_city(name)
+        row = self.index.get(key)
+        if row is None:
+            self.index[key] = len(self.names)
+            for column, value in zip(columns, values):
+                column.append(value)
+        else:
+            for column, value in zip(columns, values):
+                column[row] = value
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def row(self, city: str):
+        """Row number of a city, or None"""
+        return self.index.get(normalize_city(city))
+
+    def _timezone(self, row: int) -> str:
+        key = (self.tz_name.codes[row], self.tz_offset[row])
+        text = self._timezones.get(key)
+        if text is None:
+            offset = _format_offset(self.tz_offset[row])
+            name = self.tz_name[row]
+            text = self._timezones[key] = f"{name} ({offset})" if name else offset
+        return text
+
+    def _current_time(self, row: int, utc_minute: int = None) -> str:
+        if utc_minute is None:
+            utc_minute = int(time.time() // 60)
+        minute = (utc_minute + self.tz_offset[row]) % 1440
+        return f"{minute // 60:02d}:{minute % 60:02d}"
+
+    # The three single-fact lookups return the same shapes the lesson's tools always have
+
+    def temperature_of(self, city: str) -> dict:
+        row = self.row(city)
+        if row is None or math.isnan(self.temperature[row]):
+            return {"city": city, "temp": "N/A", "unit": "°C", "condition": "unknown"}
+        temp = self.temperature[row]
+        return {"temp": int(temp) if temp.is_integer() else temp, "unit": "°C",
+                "condition": self.condition[row], "city": city}
+
+    def time_zone_of(self, city: str) -> dict:
+        row = self.row(city)
+        if row is None:
+            return {"city": city, "timezone": "UTC+0", "current_time": "Unknown"}
+        return {"timezone": self._timezone(row), "current_time": self._current_time(row), "city": city}
+
+    def population_of(self, city: str) -> dict:
+        row = self.row(city)
+        if row is None:
+            return {"city": city, "population": "Unknown", "metro_area": "Unknown"}
+        return {"population": _millions(self.population[row]),
+                "metro_area": _millions(self.metro_population[row]), "city": city}
+
+    def profile(self, cities, fields=None) -> dict:
+        """Answers several facts about several cities in one table.
+
+        Args:
+            cities: City names, case-insensitive
+            fields: Any of PROFILE_FIELDS; all of them when empty
+
+        Returns:
+            {"columns": ["city", *fields], "rows": [...], "not_found": [...],
+            "units": {...}} with one row per city found, in the order given.
+        """
+        fields = list(fields or PROFILE_FIELDS)
+        unknown = [f for f in fields if f not in PROFILE_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown field(s): {', '.join(unknown)}. Choose from {', '.join(PROFILE_FIELDS)}")
+
+        utc_minute = int(time.time() // 60)
+        getters = {
+            "temperature": lambda row: None if math.isnan(self.temperature[row]) else self.temperature[row],
+            "condition": lambda row: self.condition[row],
+            "timezone": self._timezone,
+            "current_time": lambda row: self._current_time(row, utc_minute),
+            "population": lambda row: self.population[row],
+            "metro_area": lambda row: self.metro_population[row],
+        }
+        selected = [getters[f] for f in fields]
+
+        rows, not_found = [], []
+        for city in cities:
+            row = self.row(city)
+            if row is None:
+                not_found.append(city)
+            else:
+                rows.append([self.names[row]] + [get(row) for get in selected])
+
+        result = {"columns": ["city"] + fields, "rows": rows, "not_found": not_found}
+        if "temperature" in fields:
+            result["units"] = {"temperature": "°C"}
+        return result
@@ -0,0 +1,146 @@
+"""
+Dispatch table for executing function calls
+
+Instead of one hand-written `if function_call.name == ...` branch per tool,
+a ToolDispatcher maps every tool name to its function once, along with a
+prepared adapter that checks the model's arguments against the function
+signature. Every outcome, success or failure, comes back in the same shape
+so it can be sent straight to the model as a function_response part.
+"""
+
+import inspect
+from types import MappingProxyType
+
+from google.genai import types
+
+from .errors import ToolError, error_response
+from .validation import compile_declaration
+
+
+class _BoundTool:
+    """A tool function plus what is needed to check and bind its arguments"""
+
+    __slots__ = ("name", "function", "is_async", "parameters", "required", "accepts_any", "validator")
+
+    def __init__(self, name: str, function, validator=None):
+        signature = inspect.signature(function)
+        params = signature.parameters.values()
+
+        self.name = name
+        self.function = function
+        self.validator = validator
+        self.is_async = inspect.iscoroutinefunction(function)
+        self.accepts_any = any(p.kind is p.VAR_KEYWORD for p in params)
+        self.parameters = frozenset(
+            p.name for p in params if p.kind in (p.POSITIONAL_OR_KEYWORD, p.KEYWORD_ONLY))
+        self.required = frozenset(
+            p.name for p in params
+            if p.kind in (p.POSITIONAL_OR_KEYWORD, p.KEYWORD_ONLY) and p.default is p.empty)
+
+    def bind(self, args) -> dict:
+        """Converts the model's args to keyword arguments, rejecting unknown or missing ones"""
+        if self.validator is not None:
+            # Coerces types and checks the declaration's constraints, raises InvalidArguments
+            kwargs = self.validator(args)
+        else:
+            kwargs = dict(args) if args else {}
+
+        missing = self.required.difference(kwargs)
+        if missing:
+            raise ToolError("invalid_arguments", f"Missing required argument(s): {', '.join(sorted(missing))}")
+
+        if not self.accepts_any:
+            unexpected = kwargs.keys() - self.parameters
+            if unexpected:
+                raise ToolError("invalid_arguments", f"Unexpected argument(s): {', '.join(sorted(unexpected))}")
+
+        return kwargs
+
+
+class ToolDispatcher:
+    """Executes function calls by name through a lookup table built once.
+
+    Args:
+        functions: Mapping of tool name to the Python function implementing it
+        declarations: Optional declarations (dicts or FunctionDeclarations) for
+            the tools; their parameter schemas are compiled into validators that
+            run before every call
+    """
+
+    def __init__(self, functions, declarations=None):
+        validators = dict(compile_declaration(d) for d in declarations or ())
+        self._tools = {name: _BoundTool(name, function, validators.get(name))
+                       for name, function in functions.items()}
+
+    @classmethod
+    def from_registry(cls, registry) -> "ToolDispatcher":
+        """Builds a dispatcher, with validators, for every tool in a ToolRegistry"""
+        return cls(registry.functions, registry.declarations.values())
+
+    def __contains__(self, name) -> bool:
+        return name in self._tools
+
+    def __len__(self) -> int:
+        return len(self._tools)
+
+    @property
+    def functions(self):
+        """Read-only mapping of tool name to Python function"""
+        return MappingProxyType({name: tool.function for name, tool in self._tools.items()})
+
+    def is_async(self, name: str) -> bool:
+        tool = self._tools.get(name)
+        return tool is not None and tool.is_async
+
+    def prepare(self, name: str, args):
+        """Looks up a tool and binds its arguments.
+
+        Returns:
+            A (function, kwargs) tuple ready to be called.
+
+        Raises:
+            ToolError: If the tool is unknown or the arguments don't fit its signature.
+        """
+        tool = self._tools.get(name)
+        if tool is None:
+            raise ToolError("unknown_function", f"Unknown function: {name}")
+        return tool.function, tool.bind(args)
+
+    def call(self, name: str, args) -> dict:
+        """Executes a blocking tool and returns its result, or an error payload if it failed"""
+        try:
+            function, kwargs = self.prepare(name, args)
+            if self.is_async(name):
+                raise ToolError("invalid_call", f"{name} is async, use call_async")
+            return function(**kwargs)
+        except ToolError as e:
+            return e.to_response(name)
+        except Exception as e:
+            return error_response(name, "execution_error", f"{name} failed: {str(e)}")
+
+    async def call_async(self, name: str, args) -> dict:
+        """Executes a tool from inside an event loop; blocking tools run inline"""
+        try:
+            function, kwargs = self.prepare(name, args)
+            if self.is_async(name):
+                return await function(**kwargs)
+            return function(**kwargs)
+        except ToolError as e:
+            return e.to_response(name)
+        except Exception as e:
+            return error_response(name, "execution_error", f"{name} failed: {str(e)}")
+
+    @staticmethod
+    def response_part(name: str, result) -> types.Part:
+        """Wraps a tool result (or error payload) in a function_response part"""
+        if isinstance(result, dict) and "error_type" in result:
+            return types.Part.from_function_response(name=name, response=result)
+        return types.Part.from_function_response(name=name, response={"result": result})
+
+    def dispatch(self, function_call) -> types.Part:
+        """Executes one FunctionCall and returns its function_response part"""
+        return self.response_part(function_call.name, self.call(function_call.name, function_call.args))
+
+    def dispatch_all(self, function_calls: list) -> types.Content:
+        """Executes FunctionCalls one by one and returns the user turn holding all the responses"""
+        return types.Content(role="user", parts=[self.dispatch(function_call) for function_call in function_calls])
@@ -0,0 +1,246 @@
+"""
+Email validation in bulk
+
+The validate_email tools in the lessons check one address per call and
+return a full dict for it. This module applies the same rules to mailing
+lists of any size:
+
+  - the pattern is compiled once, split at the "@" into a local part and a
+    domain pattern; the domain half, and the domain checks, run once per
+    distinct domain and are cached, since a list has few domains and
+    millions of addresses
+  - validate_emails() streams (email, is_valid, issues) for an iterable,
+    in input order, optionally validating chunks in a process pool with a
+    bounded number of chunks in flight, so memory stays flat however long
+    the input
+  - validate_email_file() does the same from a file of addresses to a CSV
+    or JSONL file of results
+
+    python -m fc_toolkit.emails addresses.txt results.csv --workers 8 --invalid-only
+
+summarize_emails() is the shape for a tool call: counts per issue and the
+invalid addresses, rather than a full dict per address.
+"""
+
+import csv
+import json
+import os
+import re
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import islice
+
+# The lessons' r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', split at the "@"
+_LOCAL_PART = re.compile(r"[a-zA-Z0-9._%+-]+")
+_DOMAIN = re.compile(r"[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+
+INVALID_FORMAT = "Invalid email format"
+DEFAULT_CHUNK_SIZE = 20_000
+DOMAIN_CACHE_SIZE = 65_536
+
+
+@lru_cache(maxsize=DOMAIN_CACHE_SIZE)
+def _check_domain(domain: str, check_domain: bool) -> tuple:
+    """(matches the pattern, issues) for a domain, computed once per domain"""
+    if not _DOMAIN.match(domain):
+        return False, ()
+    issues = []
+    if check_domain:
+        if len(domain) > 253:
+            issues.append("Domain exceeds 253 characters")
+        if ".." in domain:
+            issues.append("Domain contains consecutive dots")
+    return True, tuple(issues)
+
+
+def _format_issues(email: str) -> tuple:
+    # Try to identify specific issues
+    domain = email.split("@")[-1]
+    if "@" not in email:
+        return INVALID_FORMAT, "Missing @ symbol"
+    if email.count("@") > 1:
+        return INVALID_FORMAT, "Multiple @ symbols"
+    if not domain:
+        return INVALID_FORMAT, "Missing domain"
+    if "." not in domain:
+        return INVALID_FORMAT, "Domain missing top-level domain"
+    return (INVALID_FORMAT,)
+
+
+def check_email(email: str, check_domain: bool = True) -> tuple:
+    """(is_valid, issues) for one address, by the rules of the lessons' validate_email"""
+    local_part, at, domain = email.partition("@")
+    if at and "@" not in domain and _LOCAL_PART.fullmatch(local_part):
+        matches, issues = _check_domain(domain, check_domain)
+        if matches:
+            if check_domain and len(local_part) > 64:
+                issues = ("Local part exceeds 64 characters",) + issues
+            return not issues, issues
+    return False, _format_issues(email)
+
+
+def _check_chunk(emails: list, check_domain: bool) -> list:
+    return [check_email(email, check_domain) for email in emails]
+
+
+def validate_emails(emails, check_domain: bool = True, workers: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Validates any number of addresses, streaming the results in input order.
+
+    Args:
+        emails: Iterable of addresses; it is read a chunk at a time
+        check_domain: Apply the length and consecutive-dot checks
+        workers: Processes to validate in, None for the CPU count; 1 (the
+            default) validates in this process. Worker processes may re-import
+            the calling script, so only use more than 1 from code behind an
+            if __name__ == "__main__": guard
+        chunk_size: Addresses sent to a worker at a time
+
+    Yields:
+        (email, is_valid, issues) tuples, issues a tuple of strings.
+    """
+    emails = iter(emails)
+    workers = workers or os.cpu_count() or 1
+    first = list(islice(emails, chunk_size))
+    if workers == 1 or len(first) < chunk_size:
+        # One chunk isn't worth starting processes for
+        for chunk in _chunks(emails, chunk_size, first):
+            for email, (is_valid, issues) in zip(chunk, _check_chunk(chunk, check_domain)):
+                yield email, is_valid, issues
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Two chunks per worker in flight keep the workers busy while results are written out
+        in_flight = deque()
+        for chunk in _chunks(emails, chunk_size, first):
+            in_flight.append((chunk, executor.submit(_check_chunk, chunk, check_domain)))
+            if len(in_flight) >= 2 * workers:
+                yield from _results(*in_flight.popleft())
+        while in_flight:
+            yield from _results(*in_flight.popleft())
+
+
+def _chunks(emails, chunk_size: int, first: list):
+    chunk = first
+    while chunk:
+        yield chunk
+        chunk = list(islice(emails, chunk_size))
+
+
+def _results(chunk: list, future):
+    for email, (is_valid, issues) in zip(chunk, future.result()):
+        yield email, is_valid, issues
+
+
+@dataclass
+class EmailStats:
+    """Counts for a bulk validation.
+
+    Attributes:
+        total: Addresses checked
+        valid: Addresses that passed
+        issues: Issue -> addresses that have it
+        seconds: Wall time of the run
+    """
+    total: int = 0
+    valid: int = 0
+    issues: Counter = field(default_factory=Counter)
+    seconds: float = 0.0
+
+    @property
+    def invalid(self) -> int:
+        return self.total - self.valid
+
+    @property
+    def emails_per_sec(self) -> float:
+        return self.total / self.seconds if self.seconds else 0.0
+
+    def add(self, is_valid: bool, issues: tuple) -> None:
+        self.total += 1
+        self.valid += is_valid
+        if issues:
+            self.issues.update(issues)
+
+
+def summarize_emails(emails: list, check_domain: bool = True, max_listed: int = 100) -> dict:
+    """Validates a list of addresses and returns counts plus the invalid ones, for a tool result.
+
+    Args:
+        emails: The addresses
+        check_domain: Apply the length and consecutive-dot checks
+        max_listed: Most invalid addresses to list; the rest are only counted
+
+    Returns:
+        {"total", "valid", "invalid", "issues": {issue: count},
+        "invalid_emails": [[email, "issue; issue"], ...], "not_listed": n}
+    """
+    stats, listed = EmailStats(), []
+    for email, is_valid, issues in validate_emails(emails, check_domain):
+        stats.add(is_valid, issues)
+        if not is_valid and len(listed) < max_listed:
+            listed.append([email, "; ".join(issues)])
+    return {"total": stats.total, "valid": stats.valid, "invalid": stats.invalid,
+            "issues": dict(stats.issues.most_common()), "invalid_emails": listed,
+            "not_listed": stats.invalid - len(listed)}
+
+
+def iter_email_file(path: str):
+    """Streams addresses from a file with one per line, blank lines skipped"""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            email = line.strip()
+            if email:
+                yield email
+
+
+def validate_email_file(input_path: str, output_path: str, check_domain: bool = True, workers: int = 1,
+                        chunk_size: int = DEFAULT_CHUNK_SIZE, invalid_only: bool = False) -> EmailStats:
+    """Validates a file of addresses (one per line) into a CSV or JSONL file of results.
+
+    CSV rows are email, is_valid, issues ("; "-separated); JSONL lines are
+    {"email", "is_valid", "issues"}. Results are written as they arrive, in
+    input order.
+    """
+    stats, start = EmailStats(), time.perf_counter()
+    as_jsonl = output_path.endswith((".jsonl", ".ndjson"))
+    with open(output_path, "w", encoding="utf-8", newline="") as out:
+        writer = None if as_jsonl else csv.writer(out)
+        if writer:
+            writer.writerow(["email", "is_valid", "issues"])
+        results = validate_emails(iter_email_file(input_path), check_domain, workers, chunk_size)
+        for email, is_valid, issues in results:
+            stats.add(is_valid, issues)
+            if invalid_only and is_valid:
+                continue
+            if writer:
+                writer.writerow([email, is_valid, "; ".join(issues)])
+            else:
+                out.write(json.dumps({"email": email, "is_valid": is_valid, "issues": list(issues)}) + "\n")
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Validate a file of email addresses, one per line")
+    parser.add_argument("input", help="file with one address per line")
+    parser.add_argument("output", help=".csv or .jsonl file to write the results to")
+    parser.add_argument("--workers", type=int, help="processes to validate in (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--no-domain-checks", action="store_true", help="skip the length and '..' checks")
+    parser.add_argument("--invalid-only", action="store_true", help="only write the invalid addresses")
+    args = parser.parse_args()
+
+    stats = validate_email_file(args.input, args.output, not args.no_domain_checks, args.workers,
+                                args.chunk_size, args.invalid_only)
+    print(f"{stats.total:,} addresses, {stats.valid:,} valid, {stats.invalid:,} invalid "
+          f"in {stats.seconds:.1f}s ({stats.emails_per_sec:,.0f}/sec)")
+    for issue, count in stats.issues.most_common():
+        print(f"  {count:>12,}  {issue}")
+
+
+if __name__ == "__main__":
+    main()
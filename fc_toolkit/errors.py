@@ -0,0 +1,28 @@
+"""
+Error types shared by the dispatch helpers
+"""
+
+
+def error_response(name: str, kind: str, message: str, details: list = None) -> dict:
+    """Builds the uniform error payload sent back to the model"""
+    response = {"error": message, "error_type": kind, "function": name}
+    if details:
+        response["details"] = details
+    return response
+
+
+class ToolError(Exception):
+    """Raised when a call cannot be executed.
+
+    Attributes:
+        kind: Short machine-readable reason, e.g. "unknown_function" or "invalid_arguments"
+        details: Optional list of structured problems to pass back to the model
+    """
+
+    def __init__(self, kind: str, message: str, details: list = None):
+        super().__init__(message)
+        self.kind = kind
+        self.details = details
+
+    def to_response(self, name: str) -> dict:
+        return error_response(name, self.kind, str(self), self.details)
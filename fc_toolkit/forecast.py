@@ -0,0 +1,89 @@
+"""
+Forecasts for many locations at once
+
+get_weather_forecast builds one dict per day for one location. For
+dashboard questions ("the week ahead for all our 3,000 stores") that is a
+Python loop per location per day. ForecastEngine keeps every location's
+weather pattern in NumPy arrays and computes the whole locations x days
+temperature grid with one broadcast, using the same formula as
+get_weather_forecast:
+
+    temperature = base_temp + (day % 3 - 1) * variation
+
+table() turns the grid into one compact row per location, which is also
+much smaller for the model to read than nested per-day dicts.
+"""
+
+import numpy as np
+
+MAX_DAYS = 7
+
+
+class ForecastEngine:
+    """Weather patterns of many locations, held as arrays.
+
+    Args:
+        patterns: location key -> {"base_temp": ..., "condition": ..., "variation": ...},
+            the shape of get_weather_forecast's weather_patterns
+    """
+
+    def __init__(self, patterns: dict):
+        self.keys = list(patterns)
+        self.index = {key: row for row, key in enumerate(self.keys)}
+        values = patterns.values()
+        # Integer patterns give integer temperatures, like the per-day loop
+        self.base_temp = np.array([p["base_temp"] for p in values])
+        self.variation = np.array([p["variation"] for p in values])
+        self.conditions, codes = np.unique([p["condition"] for p in values], return_inverse=True)
+        self.condition = codes.astype(np.uint16)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def rows(self, keys) -> tuple:
+        """(rows, missing): row numbers of the known keys, in order, and the keys without a pattern"""
+        rows, missing = [], []
+        for key in keys:
+            row = self.index.get(key)
+            if row is None:
+                missing.append(key)
+            else:
+                rows.append(row)
+        return np.array(rows, dtype=np.intp), missing
+
+    def grid(self, rows, days: int) -> np.ndarray:
+        """Temperatures for rows x days 1..days (at most MAX_DAYS), shape (len(rows), days)"""
+        day = np.arange(1, max(0, min(days, MAX_DAYS)) + 1)
+        rows = np.asarray(rows, dtype=np.intp)
+        return self.base_temp[rows, None] + (day % 3 - 1)[None, :] * self.variation[rows, None]
+
+    def table(self, keys, days: int, labels: dict = None) -> dict:
+        """Forecasts for several locations as one table.
+
+        Args:
+            keys: Location keys to forecast
+            days: Number of days, 1-7
+            labels: key -> name to show for it; str(key) otherwise
+
+        Returns:
+            {"days": [1, ...], "unit": "°C", "columns": [...], "rows": [...],
+            "not_found": [...]} with one row per known location, in the order given:
+            location, condition, temperature per day, low, high.
+        """
+        rows, missing = self.rows(keys)
+        temperatures = self.grid(rows, days)
+        if temperatures.shape[1]:
+            lows, highs = temperatures.min(axis=1).tolist(), temperatures.max(axis=1).tolist()
+        else:
+            lows = highs = [None] * len(rows)
+        conditions = self.conditions[self.condition[rows]].tolist()
+
+        name = (lambda key: labels.get(key, str(key))) if labels else str
+        names = [name(self.keys[row]) for row in rows.tolist()]
+        return {
+            "days": list(range(1, temperatures.shape[1] + 1)),
+            "unit": "°C",
+            "columns": ["location", "condition", "temperatures", "low", "high"],
+            "rows": list(map(list, zip(names, conditions, temperatures.tolist(), lows, highs))),
+            "not_found": [name(key) for key in missing],
+        }
@@ -0,0 +1,503 @@
+"""
+Resolving free-text locations against a gazetteer
+
+get_weather_forecast used to find its city by testing every known name
+against the location string. LocationResolver does that work up front: it
+indexes every place under its normalized name (accents, case and
+punctuation dropped, "St."/"Ft."/"Mt." spelled out) and its aliases, and
+keeps a deletion index over the words of those names for misspellings. A
+lookup is a handful of dictionary probes however big the gazetteer is:
+
+    "Seattle, WA"    name, then a region code
+    "london uk"      name, then a country, no comma needed
+    "NYC"            alias
+    "Seatle"         one edit away from a known name
+
+Qualifiers after the name (region code or name, country code or name) pick
+between places that share a name; otherwise the most populous place wins.
+Qualifiers that name no known region or country ("Seattle area", "San
+Francisco downtown") are left unmatched but don't count against a place;
+ones naming another region or country ("Seattle, ON") are conflicting.
+
+Gazetteer files are GeoNames dumps (allCountries.txt, cities500.txt, ...),
+CSV with a header row, or JSONL, the last two with the columns:
+
+    name, admin1, admin1_name, country, country_name, population, latitude, longitude, aliases
+
+python -m fc_toolkit.gazetteer <file> "Seattle, WA" "londn, uk" resolves
+locations from the command line.
+"""
+
+import argparse
+import csv
+import json
+import math
+import re
+import time
+import unicodedata
+from array import array
+from dataclasses import dataclass, field
+from itertools import islice, product
+
+# Keyword arguments of LocationResolver.add, picked out of each record so extra columns are ignored
+PLACE_COLUMNS = ("name", "admin1", "country", "population", "latitude", "longitude", "admin1_name",
+                 "country_name", "aliases")
+
+# Common abbreviations inside place names, spelled out so "St. Louis" finds "Saint Louis"
+TOKEN_ALIASES = {"st": "saint", "ste": "sainte", "ft": "fort", "mt": "mount"}
+
+# Country spellings people use that aren't the ISO code or the country's name
+COUNTRY_ALIASES = {
+    "uk": "GB", "united kingdom": "GB", "great britain": "GB", "britain": "GB",
+    "usa": "US", "united states": "US", "united states of america": "US", "america": "US",
+    "uae": "AE", "south korea": "KR", "russia": "RU",
+}
+
+MIN_FUZZY_LENGTH = 4       # shorter words must be spelled right
+MAX_CORRECTIONS = 3        # spellings tried per misspelled word
+MAX_COMBINATIONS = 27      # corrected names tried per lookup
+
+_SEPARATORS = re.compile(r"[\W_]+")
+_ABBREVIATION = re.compile(r"[A-Z]{2,5}")
+_GEONAMES_COLUMNS = 19
+
+
+def normalize_place(text: str) -> str:
+    """Lookup key for a place name: accents, case, punctuation and extra spaces dropped, abbreviations spelled out"""
+    if not text.isascii():
+        text = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+    return " ".join(TOKEN_ALIASES.get(token, token) for token in _SEPARATORS.sub(" ", text.casefold()).split())
+
+
+def one_edit_apart(a: str, b: str) -> bool:
+    """True when one insertion, deletion, substitution or swap of neighbouring letters turns a into b"""
+    if a == b or abs(len(a) - len(b)) > 1:
+        return False
+    i = 0
+    while i < len(a) and i < len(b) and a[i] == b[i]:
+        i += 1
+    if len(a) > len(b):
+        return a[i + 1:] == b[i:]
+    if len(a) < len(b):
+        return a[i:] == b[i + 1:]
+    return a[i + 1:] == b[i + 1:] or (a[i] == b[i + 1] and a[i + 1] == b[i] and a[i + 2:] == b[i + 2:])
+
+
+def _deletions(token: str) -> set:
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+
+def _max_edits(token: str) -> int:
+    return 2 if len(token) >= 8 else 1
+
+
+def _number(value, cast, default):
+    return cast(float(value)) if value not in ("", None) else default
+
+
+def iter_place_file(path: str, feature_classes: str = "P"):
+    """Streams place records (dicts with the gazetteer columns) from a GeoNames dump, CSV or JSONL file.
+
+    Args:
+        path: GeoNames dump (.txt/.tsv), .csv or .jsonl file
+        feature_classes: GeoNames feature classes to keep ("P" is cities, towns
+            and villages); "" keeps everything. Ignored for CSV and JSONL.
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith((".jsonl", ".json", ".ndjson")):
+            yield from (json.loads(line) for line in f if line.strip())
+        elif path.endswith(".csv"):
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                columns = line.rstrip("\n").split("\t")
+                if len(columns) < _GEONAMES_COLUMNS or (feature_classes and columns[6] not in feature_classes):
+                    continue
+                # Alternate names are mostly translations; only abbreviations like NYC are worth indexing
+                aliases = [name for name in columns[3].split(",") if _ABBREVIATION.fullmatch(name)]
+                yield {"name": columns[1], "admin1": columns[10], "country": columns[8],
+                       "population": columns[14], "latitude": columns[4], "longitude": columns[5],
+                       "aliases": aliases}
+
+
+def load_geonames_names(path: str) -> dict:
+    """Reads code -> name from GeoNames admin1CodesASCII.txt ("US.WA") or countryInfo.txt ("US")"""
+    names = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("#") or not line.strip():
+                continue
+            columns = line.rstrip("\n").split("\t")
+            # countryInfo.txt has the name in its fifth column, admin1CodesASCII.txt in its second
+            names[columns[0]] = columns[4] if len(columns) > 5 else columns[1]
+    return names
+
+
+@dataclass
+class PlaceMatch:
+    """A gazetteer place that a location resolved to.
+
+    Attributes:
+        id: Row of the place in the resolver
+        name: Place name as written in the gazetteer
+        admin1: Region code (e.g. "WA"), "" when unknown
+        admin1_name: Region name (e.g. "Washington"), "" when unknown
+        country: ISO country code
+        population: Population, 0 when unknown
+        latitude: Latitude, NaN when unknown
+        longitude: Longitude, NaN when unknown
+        matched: How the name matched: "name", "alias" or "fuzzy"
+        edits: Spelling corrections made to the name
+        unmatched: Qualifiers from the location that the place doesn't fit
+        conflicting: The unmatched qualifiers that name some other region or country
+    """
+    id: int
+    name: str
+    admin1: str
+    admin1_name: str
+    country: str
+    population: int
+    latitude: float
+    longitude: float
+    matched: str
+    edits: int = 0
+    unmatched: list = field(default_factory=list)
+    conflicting: list = field(default_factory=list)
+
+    @property
+    def label(self) -> str:
+        """Name, region and country, like Seattle, WA, US"""
+        # GeoNames codes many regions by number ("08" is Ontario); the name reads better there
+        region = self.admin1 if self.admin1.isalpha() or not self.admin1_name else self.admin1_name
+        return ", ".join(part for part in (self.name, region, self.country) if part)
+
+    def to_dict(self) -> dict:
+        result = {"name": self.name, "region": self.admin1_name or self.admin1, "country": self.country,
+                  "label": self.label, "population": self.population, "matched": self.matched}
+        if not math.isnan(self.latitude):
+            result.update(latitude=round(self.latitude, 4), longitude=round(self.longitude, 4))
+        if self.unmatched:
+            result["unmatched"] = self.unmatched
+        if self.conflicting:
+            result["conflicting"] = self.conflicting
+        return result
+
+
+class LocationResolver:
+    """Resolves free-text locations ("Seattle, WA", "londn uk", "NYC") to gazetteer places.
+
+    Args:
+        fuzzy: Keep the spelling index; without it only exact names and aliases resolve
+    """
+
+    def __init__(self, fuzzy: bool = True):
+        self.fuzzy = fuzzy
+        self.names = []
+        self.region = array("I")  # place -> index into regions
+        self.regions = []         # (admin1, admin1_name, country), a few thousand for the whole world
+        self.population = array("q")
+        self.latitude = array("f")
+        self.longitude = array("f")
+        self.country_names = {}
+        self._region_ids = {}
+        self._region_terms = {}   # region -> normalized names a qualifier can use for it
+        self._all_terms = None    # names a qualifier can use for any region or country
+        self._heads = {}          # normalized name -> most populous place with that name
+        self._next = array("i")   # place -> next most populous place with the same name, -1 at the end
+        self._aliases = {}        # normalized alias -> place, or list of places
+        self._words = set()       # words of the names long enough to correct
+        self._deletes = {}        # word, or word with one letter deleted -> word, or list of words
+
+    @classmethod
+    def from_records(cls, records, fuzzy: bool = True) -> "LocationResolver":
+        """Builds the resolver from dicts with the gazetteer columns; other keys are ignored"""
+        resolver = cls(fuzzy=fuzzy)
+        for record in records:
+            resolver.add_record(record)
+        return resolver
+
+    @classmethod
+    def from_file(cls, path: str, admin1_codes: str = None, country_info: str = None,
+                  feature_classes: str = "P", min_population: int = 0, fuzzy: bool = True) -> "LocationResolver":
+        """Loads a gazetteer file.
+
+        Args:
+            path: GeoNames dump, CSV or JSONL file of places
+            admin1_codes: GeoNames admin1CodesASCII.txt, for region names ("Washington") in GeoNames dumps
+            country_info: GeoNames countryInfo.txt, for country names ("Canada")
+            feature_classes: GeoNames feature classes to keep, "" for all
+            min_population: Skip smaller places
+            fuzzy: Build the spelling index
+        """
+        admin1_names = load_geonames_names(admin1_codes) if admin1_codes else {}
+        resolver = cls(fuzzy=fuzzy)
+        if country_info:
+            resolver.country_names.update(load_geonames_names(country_info))
+        for record in iter_place_file(path, feature_classes):
+            if min_population and _number(record.get("population"), int, 0) < min_population:
+                continue
+            if admin1_names and not record.get("admin1_name"):
+                record["admin1_name"] = admin1_names.get(f"{record.get('country')}.{record.get('admin1')}", "")
+            resolver.add_record(record)
+        return resolver
+
+    def add_record(self, record: dict) -> int:
+        """Adds a place from a dict with the gazetteer columns, ignoring any other keys"""
+        return self.add(**{column: record[column] for column in PLACE_COLUMNS if record.get(column) is not None})
+
+    def add(self, name: str, admin1: str = "", country: str = "", population=0, latitude=None, longitude=None,
+            admin1_name: str = "", country_name: str = "", aliases=()) -> int:
+        """Adds a place and returns its id (values from a CSV file may be strings, aliases "|"-separated)"""
+        row = len(self.names)
+        country = (country or "").upper()
+        region = (admin1 or "", admin1_name or "", country)
+        region_id = self._region_ids.get(region)
+        if region_id is None:
+            region_id = self._region_ids[region] = len(self.regions)
+            self.regions.append(region)
+            self._all_terms = None
+        if country_name and self.country_names.get(country) != country_name:
+            self.country_names[country] = country_name
+            self._region_terms.clear()
+            self._all_terms = None
+
+        population = _number(population, int, 0)
+        self.names.append(name)
+        self.region.append(region_id)
+        self.population.append(population)
+        self.latitude.append(_number(latitude, float, math.nan))
+        self.longitude.append(_number(longitude, float, math.nan))
+
+        # Places sharing a name are chained most populous first, so an unqualified name stops at the head
+        key = normalize_place(name)
+        head = self._heads.get(key, -1)
+        if head == -1 or population > self.population[head]:
+            self._next.append(head)
+            self._heads[key] = row
+        else:
+            before = head
+            while self._next[before] != -1 and self.population[self._next[before]] >= population:
+                before = self._next[before]
+            self._next.append(self._next[before])
+            self._next[before] = row
+        self._index_words(key)
+
+        if isinstance(aliases, str):
+            aliases = aliases.split("|")
+        for alias in aliases:
+            alias_key = normalize_place(alias)
+            if alias_key and alias_key != key:
+                _add_to(self._aliases, alias_key, row)
+                self._index_words(alias_key)
+        return row
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _index_words(self, key: str) -> None:
+        if not self.fuzzy:
+            return
+        for word in key.split():
+            if len(word) < MIN_FUZZY_LENGTH or word in self._words:
+                continue
+            self._words.add(word)
+            for variant in _deletions(word) | {word}:
+                _add_to(self._deletes, variant, word)
+
+    def _known(self, key: str) -> bool:
+        return key in self._heads or key in self._aliases
+
+    def _corrections(self, word: str) -> list:
+        """(spelling, edits) of known words close to word, the closest first"""
+        if word in self._words or len(word) < MIN_FUZZY_LENGTH:
+            return [(word, 0)]
+        candidates = set()
+        for variant in _deletions(word) | {word}:
+            hit = self._deletes.get(variant)
+            if hit is not None:
+                candidates.update(hit if isinstance(hit, list) else (hit,))
+        # Sharing a deletion puts a candidate at most two edits away: a deletion from each word
+        scored = sorted((1 if one_edit_apart(word, candidate) else 2, candidate) for candidate in candidates)
+        return [(candidate, edits) for edits, candidate in scored if edits <= _max_edits(word)][:MAX_CORRECTIONS]
+
+    def _spellings(self, key: str, corrections: dict = None) -> list:
+        """(name, edits) for the known names a normalized name may be: itself, or its spelling corrections
+
+        corrections caches the corrections of each word between calls for the same location.
+        """
+        if self._known(key):
+            return [(key, 0)]
+        if not self.fuzzy:
+            return []
+        if corrections is None:
+            corrections = {}
+        for word in key.split():
+            if word not in corrections:
+                corrections[word] = self._corrections(word)
+        spellings = []
+        for combination in islice(product(*(corrections[word] for word in key.split())), MAX_COMBINATIONS):
+            edits = sum(e for _, e in combination)
+            corrected = " ".join(word for word, _ in combination)
+            if edits and self._known(corrected):
+                spellings.append((corrected, edits))
+        return spellings
+
+    def _terms(self, region: int) -> frozenset:
+        """Normalized region and country names a qualifier can use for a region"""
+        terms = self._region_terms.get(region)
+        if terms is None:
+            admin1, admin1_name, country = self.regions[region]
+            values = (admin1, admin1_name, country, self.country_names.get(country, ""))
+            terms = {normalize_place(value) for value in values if value}
+            terms.update(alias for alias, code in COUNTRY_ALIASES.items() if code == country)
+            terms = self._region_terms[region] = frozenset(terms)
+        return terms
+
+    @staticmethod
+    def _fits(qualifier: str, terms) -> bool:
+        # "or usa" is two qualifiers without the comma between them
+        return qualifier in terms or all(word in terms for word in qualifier.split())
+
+    def _unmatched(self, region: int, qualifiers: list) -> tuple:
+        """(unmatched, conflicting): qualifiers the region doesn't fit, and those of them naming another region"""
+        terms = self._terms(region)
+        unmatched = [q for q in qualifiers if not self._fits(q, terms)]
+        if not unmatched:
+            return unmatched, []
+        return unmatched, [q for q in unmatched if self._fits(q, self._every_term())]
+
+    def _every_term(self) -> frozenset:
+        """Terms of every region, built on first use"""
+        if self._all_terms is None:
+            self._all_terms = frozenset(COUNTRY_ALIASES).union(*map(self._terms, range(len(self.regions))))
+        return self._all_terms
+
+    def candidates(self, location: str, limit: int = 5) -> list:
+        """Places a free-text location may mean, the best first.
+
+        The text up to the first comma holds the name and every later part
+        is a qualifier ("Portland, OR, USA"). When that text isn't a place
+        name as a whole, every run of its words is tried as the name and
+        the words around it qualify it ("portland or", "downtown seattle",
+        "the toronto area, canada"). Places are ranked by qualifiers they
+        fit, then words left out of the name, then spelling corrections
+        needed, then population.
+
+        Args:
+            location: Free-text location
+            limit: Most places to return
+
+        Returns:
+            A list of PlaceMatch, empty when nothing matches the name.
+        """
+        parts = [part for part in (normalize_place(p) for p in location.split(",")) if part]
+        if not parts:
+            return []
+        words, rest = parts[0].split(), parts[1:]
+
+        # (start, end) word spans of the first part that may be the name, longest first
+        if self._known(parts[0]):
+            spans = [(0, len(words))]
+        else:
+            spans = [(start, start + length) for length in range(len(words), 0, -1)
+                     for start in range(len(words) - length + 1)]
+
+        found, corrections = [], {}
+        for start, end in spans:
+            left_out = len(words) - (end - start)
+            # Shorter names rank below limit places that fit every qualifier with fewer words left out
+            if sum(1 for item in found if not item[0] and item[1] < left_out) >= limit:
+                break
+            spellings = self._spellings(" ".join(words[start:end]), corrections)
+            if not spellings:
+                continue
+            around = [" ".join(words[:start]), " ".join(words[end:])]
+            qualifiers = [q for q in around if q] + rest
+            # Words no region fits ("downtown", "area") are unmatched by every place alike
+            vague = sum(1 for q in qualifiers if not self._fits(q, self._every_term()))
+            unmatched_in = {}
+
+            def rank(row, how, edits):
+                region = self.region[row]
+                unmatched = unmatched_in.get(region)
+                if unmatched is None:
+                    unmatched = unmatched_in[region] = self._unmatched(region, qualifiers)
+                return len(unmatched[0]), left_out, edits, -self.population[row], row, how, unmatched
+
+            for key, edits in spellings:
+                # Places sharing a name come most populous first: once limit of them fit every
+                # qualifier, the rest of that name can't make the list
+                row, fitting = self._heads.get(key, -1), 0
+                while row != -1 and fitting < limit:
+                    found.append(rank(row, "fuzzy" if edits else "name", edits))
+                    fitting += found[-1][0] == vague
+                    row = self._next[row]
+                aliased = self._aliases.get(key)
+                if aliased is not None:
+                    found.extend(rank(row, "alias", edits)
+                                 for row in (aliased if isinstance(aliased, list) else [aliased]))
+
+        places, seen = [], set()
+        for _, _, edits, _, row, how, unmatched in sorted(found, key=lambda item: item[:5]):
+            if row not in seen and len(places) < limit:
+                seen.add(row)
+                places.append(self.place(row, how, edits, *unmatched))
+        return places
+
+    def resolve(self, location: str):
+        """The place a free-text location most likely means, or None"""
+        matches = self.candidates(location, limit=1)
+        return matches[0] if matches else None
+
+    def place(self, row: int, matched: str = "name", edits: int = 0, unmatched: list = None,
+              conflicting: list = None) -> PlaceMatch:
+        admin1, admin1_name, country = self.regions[self.region[row]]
+        return PlaceMatch(id=row, name=self.names[row], admin1=admin1, admin1_name=admin1_name,
+                          country=country, population=self.population[row],
+                          latitude=self.latitude[row], longitude=self.longitude[row], matched=matched,
+                          edits=edits, unmatched=unmatched or [], conflicting=conflicting or [])
+
+
+def _add_to(index: dict, key: str, value) -> None:
+    """Adds value under key, keeping a single value unwrapped to save memory"""
+    current = index.get(key)
+    if current is None:
+        index[key] = value
+    elif isinstance(current, list):
+        if value not in current:
+            current.append(value)
+    elif current != value:
+        index[key] = [current, value]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve free-text locations against a gazetteer file")
+    parser.add_argument("gazetteer", help="GeoNames dump, CSV or JSONL file of places")
+    parser.add_argument("locations", nargs="+")
+    parser.add_argument("--admin1-codes", help="GeoNames admin1CodesASCII.txt")
+    parser.add_argument("--country-info", help="GeoNames countryInfo.txt")
+    parser.add_argument("--feature-classes", default="P")
+    parser.add_argument("--min-population", type=int, default=0)
+    parser.add_argument("--limit", type=int, default=3)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    resolver = LocationResolver.from_file(args.gazetteer, args.admin1_codes, args.country_info,
+                                          args.feature_classes, args.min_population)
+    print(f"loaded {len(resolver):,} places in {time.perf_counter() - start:.1f}s")
+
+    for location in args.locations:
+        start = time.perf_counter()
+        matches = resolver.candidates(location, args.limit)
+        elapsed_us = (time.perf_counter() - start) * 1e6
+        print(f"\n{location!r} ({elapsed_us:.0f} us)")
+        for match in matches:
+            print(f"  {match.label:<40} pop {match.population:>11,}  {match.matched}"
+                  + (f", unmatched {match.unmatched}" if match.unmatched else "")
+                  + (f", conflicting {match.conflicting}" if match.conflicting else ""))
+        if not matches:
+            print("  no match")
+
+
+if __name__ == "__main__":
+    main()
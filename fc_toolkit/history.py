@@ -0,0 +1,189 @@
+"""
+Bounded conversation history for multi-turn sessions
+
+Resending every user turn, model turn and function response on each
+generate_content call makes prompt tokens grow with the length of the
+session. ConversationHistory keeps the most recent turns verbatim and
+rolls older ones into compact text summaries:
+
+  - each old function_call / function_response pair becomes one short line
+  - results made stale by a later call (a check_balance before a
+    transfer_money) are dropped altogether
+  - if the total is still over the token budget, the oldest summaries go
+"""
+
+import json
+from dataclasses import dataclass
+
+from google.genai import types
+
+
+def estimate_part_tokens(part: types.Part) -> int:
+    """Rough token count for a part (about 4 characters per token)"""
+    if part.text:
+        chars = len(part.text)
+    elif part.function_call:
+        chars = len(part.function_call.name) + len(json.dumps(dict(part.function_call.args or {}), default=str))
+    elif part.function_response:
+        chars = len(part.function_response.name) + len(json.dumps(part.function_response.response, default=str))
+    else:
+        chars = 0
+    return chars // 4 + 1
+
+
+def estimate_tokens(contents: list) -> int:
+    """Rough token count for a list of Content objects"""
+    return sum(estimate_part_tokens(part) for content in contents for part in (content.parts or ()))
+
+
+def _is_user_message(content: types.Content) -> bool:
+    """True for a user turn typed by the person, as opposed to function responses"""
+    return content.role == "user" and any(part.text for part in content.parts or ())
+
+
+def _format_call(function_call) -> str:
+    args = ", ".join(f"{k}={v!r}" for k, v in dict(function_call.args or {}).items())
+    return f"{function_call.name}({args})"
+
+
+@dataclass
+class HistoryStats:
+    """Token totals across every request built from the history.
+
+    Attributes:
+        requests: Number of times contents() was called
+        full_tokens: Estimated prompt tokens had the full history been sent
+        sent_tokens: Estimated prompt tokens actually sent
+    """
+    requests: int = 0
+    full_tokens: int = 0
+    sent_tokens: int = 0
+
+    @property
+    def saved_tokens(self) -> int:
+        return self.full_tokens - self.sent_tokens
+
+    @property
+    def savings_ratio(self) -> float:
+        return self.saved_tokens / self.full_tokens if self.full_tokens else 0.0
+
+
+class _Turn:
+    """A user message and everything that followed it until the next user message"""
+
+    def __init__(self):
+        self.contents = []
+        self._summary = None
+
+    def tool_names(self) -> set:
+        return {part.function_call.name
+                for content in self.contents for part in content.parts or () if part.function_call}
+
+    def summary(self, max_result_chars: int) -> list:
+        """Compact form of the turn as (tool name or None, Content) items, built once"""
+        if self._summary is None:
+            self._summary = self._build_summary(max_result_chars)
+        return self._summary
+
+    def _build_summary(self, max_result_chars: int) -> list:
+        items, pending_calls = [], []
+
+        for content in self.contents:
+            for part in content.parts or ():
+                if part.function_call:
+                    pending_calls.append(part.function_call)
+                elif part.function_response:
+                    response = part.function_response
+                    call = next((c for c in pending_calls if c.name == response.name), None)
+                    if call is not None:
+                        pending_calls.remove(call)
+                    result = json.dumps(response.response, default=str, separators=(",", ":"))
+                    if len(result) > max_result_chars:
+                        result = result[:max_result_chars] + "..."
+                    line = f"[earlier tool call] {_format_call(call) if call else response.name} -> {result}"
+                    items.append((response.name, types.Content(role="model", parts=[types.Part(text=line)])))
+                elif part.text:
+                    items.append((None, types.Content(role=content.role, parts=[types.Part(text=part.text)])))
+        return items
+
+
+class ConversationHistory:
+    """Conversation history that stays within a prompt token budget.
+
+    Args:
+        token_budget: Target upper bound for the estimated prompt tokens of a request
+        keep_recent_turns: Number of most recent turns always sent verbatim
+        supersedes: Mapping of tool name to the tool names whose earlier results it
+            makes stale, e.g. {"transfer_money": ["check_balance"]}
+        max_result_chars: Longest function result kept in a summary line
+        count_tokens: Function estimating the tokens of a list of Content objects
+    """
+
+    def __init__(self, token_budget: int = 4000, keep_recent_turns: int = 2, supersedes: dict = None,
+                 max_result_chars: int = 200, count_tokens=estimate_tokens):
+        self.token_budget = token_budget
+        self.keep_recent_turns = max(1, keep_recent_turns)
+        self.supersedes = {name: set(stale) for name, stale in (supersedes or {}).items()}
+        self.max_result_chars = max_result_chars
+        self.count_tokens = count_tokens
+        self.stats = HistoryStats()
+        self._turns = []
+
+    def append(self, content: types.Content) -> None:
+        """Adds a Content (user message, model response or function responses) to the history"""
+        if not self._turns or _is_user_message(content):
+            self._turns.append(_Turn())
+        self._turns[-1].contents.append(content)
+
+    def extend(self, contents: list) -> None:
+        for content in contents:
+            self.append(content)
+
+    def full_contents(self) -> list:
+        """Every Content ever appended, uncompacted"""
+        return [content for turn in self._turns for content in turn.contents]
+
+    def contents(self, token_budget: int = None) -> list:
+        """Builds the contents to send with the next request and updates the stats.
+
+        Args:
+            token_budget: Overrides the history's token_budget for this request only
+        """
+        if token_budget is None:
+            token_budget = self.token_budget
+
+        recent = self._turns[-self.keep_recent_turns:]
+        older = self._turns[:-self.keep_recent_turns]
+
+        # Tools called after each older turn, used to spot stale results
+        later_tools, stale_after = set(), []
+        for turn in reversed(self._turns):
+            stale_after.append(set().union(*(self.supersedes.get(name, ()) for name in later_tools)))
+            later_tools |= turn.tool_names()
+        stale_after.reverse()
+
+        summarized = []
+        for index, turn in enumerate(older):
+            stale = stale_after[index]
+            turn_contents = [content for tool, content in turn.summary(self.max_result_chars)
+                             if tool is None or tool not in stale]
+            summarized.append(turn_contents)
+
+        recent_contents = [content for turn in recent for content in turn.contents]
+        recent_tokens = self.count_tokens(recent_contents)
+        summary_tokens = [self.count_tokens(turn_contents) for turn_contents in summarized]
+
+        # Drop the oldest summaries until the request fits the budget
+        total = recent_tokens + sum(summary_tokens)
+        first_kept = 0
+        while total > token_budget and first_kept < len(summarized):
+            total -= summary_tokens[first_kept]
+            first_kept += 1
+
+        contents = [content for turn_contents in summarized[first_kept:] for content in turn_contents]
+        contents.extend(recent_contents)
+
+        self.stats.requests += 1
+        self.stats.full_tokens += self.count_tokens(self.full_contents())
+        self.stats.sent_tokens += total
+        return contents
@@ -0,0 +1,105 @@
+"""
+Shared HTTP session for HTTP-backed tools
+
+Calling requests.get(...) directly opens a new connection (TCP, plus TLS for
+https) on every tool call. Routing tool traffic through one shared
+requests.Session keeps connections alive in a pool so later calls to the same
+host reuse them.
+"""
+
+import threading
+from dataclasses import dataclass
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+@dataclass
+class HttpSessionConfig:
+    """Settings for the shared tool session.
+
+    Attributes:
+        pooled: Reuse keep-alive connections; False opens a new connection per request
+        pool_connections: Number of per-host connection pools to keep
+        pool_maxsize: Maximum connections kept alive for a single host
+        pool_block: Wait for a free connection instead of exceeding pool_maxsize for a host
+        connect_timeout: Seconds to wait for a connection to be established
+        read_timeout: Seconds to wait for the server to send a response
+        max_retries: How many times to retry failed connections
+    """
+    pooled: bool = True
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    pool_block: bool = False
+    connect_timeout: float = 3.05
+    read_timeout: float = 10.0
+    max_retries: int = 0
+
+
+_config = HttpSessionConfig()
+_session = None
+_lock = threading.Lock()
+
+
+def _build_session(config: HttpSessionConfig) -> requests.Session:
+    """Creates a session whose adapters follow the given pool settings"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=config.pool_connections,
+        pool_maxsize=config.pool_maxsize,
+        pool_block=config.pool_block,
+        max_retries=config.max_retries,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def configure_http(config: HttpSessionConfig) -> None:
+    """Replaces the shared session settings, closing any open connections"""
+    global _config, _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+        _config = config
+        _session = None
+
+
+def get_session() -> requests.Session:
+    """Returns the shared session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _build_session(_config)
+    return _session
+
+
+def http_get(url: str, **kwargs) -> requests.Response:
+    """Sends a GET request through the shared session.
+
+    Args:
+        url: The URL to fetch
+        **kwargs: Extra arguments passed on to requests (params, headers, ...)
+
+    Returns:
+        The requests.Response. The configured timeouts apply unless a timeout is passed.
+    """
+    config = _config
+    kwargs.setdefault("timeout", (config.connect_timeout, config.read_timeout))
+
+    if not config.pooled:
+        # A throwaway session with a single connection, closed straight away
+        with _build_session(config) as session:
+            return session.get(url, **kwargs)
+
+    return get_session().get(url, **kwargs)
+
+
+def close_http() -> None:
+    """Closes the shared session and its pooled connections"""
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -0,0 +1,131 @@
+"""
+Concurrent execution of parallel function calls
+
+When the model returns several function_call parts in one candidate, each
+call is independent, so there is no reason to run them one after another.
+The helpers here run every call at the same time and hand back the
+function_response parts in the same order the calls were made, ready to be
+sent back to the model in a single follow-up turn.
+"""
+
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from google.genai import types
+
+from .dispatch import ToolDispatcher
+from .errors import ToolError, error_response
+from .singleflight import call_key
+
+# Default size of the thread pool used for blocking (regular def) tools
+DEFAULT_MAX_WORKERS = 8
+
+
+def get_function_calls(response, candidate_index: int = 0) -> list:
+    """Collects every function call part in a candidate.
+
+    Args:
+        response: A GenerateContentResponse returned by generate_content
+        candidate_index: Which candidate to read the parts from
+
+    Returns:
+        A list of FunctionCall objects, in the order the model emitted them.
+    """
+    if not response.candidates:
+        return []
+
+    content = response.candidates[candidate_index].content
+    if content is None or not content.parts:
+        return []
+
+    return [part.function_call for part in content.parts if part.function_call]
+
+
+async def _call_tool(function_call, dispatcher: ToolDispatcher, loop, executor, single_flight) -> types.Part:
+    """Runs a single function call and wraps the outcome in a response part"""
+    name = function_call.name
+
+    try:
+        function, kwargs = dispatcher.prepare(name, function_call.args)
+        is_async = dispatcher.is_async(name)
+
+        if single_flight is not None:
+            # Share one execution with any identical call already in flight
+            key = call_key(name, kwargs)
+            if is_async:
+                result = await single_flight.do_async(key, function, **kwargs)
+            else:
+                result = await loop.run_in_executor(
+                    executor, contextvars.copy_context().run, lambda: single_flight.do(key, function, **kwargs))
+        elif is_async:
+            result = await function(**kwargs)
+        else:
+            # Blocking tools run on the thread pool so they don't hold up the event loop;
+            # run_in_executor doesn't carry context variables over, so copy them explicitly
+            result = await loop.run_in_executor(executor, contextvars.copy_context().run, lambda: function(**kwargs))
+    except ToolError as e:
+        result = e.to_response(name)
+    except Exception as e:
+        result = error_response(name, "execution_error", f"{name} failed: {str(e)}")
+
+    return dispatcher.response_part(name, result)
+
+
+async def run_function_calls_async(function_calls: list, functions: dict,
+                                   max_workers: int = DEFAULT_MAX_WORKERS,
+                                   single_flight=None) -> list:
+    """Executes function calls concurrently from inside an event loop.
+
+    Args:
+        function_calls: The FunctionCall objects to execute
+        functions: A ToolDispatcher, or a mapping of function name to the Python callable (sync or async)
+        max_workers: Upper bound on threads used for blocking tools
+        single_flight: Optional SingleFlight group; identical calls that are in
+            flight at the same time (in this batch or any other) run only once
+
+    Returns:
+        A list of function_response Parts, in the same order as function_calls.
+    """
+    if not function_calls:
+        return []
+
+    dispatcher = functions if isinstance(functions, ToolDispatcher) else ToolDispatcher(functions)
+    loop = asyncio.get_running_loop()
+    workers = max(1, min(max_workers, len(function_calls)))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return await asyncio.gather(*(
+            _call_tool(function_call, dispatcher, loop, executor, single_flight)
+            for function_call in function_calls
+        ))
+
+
+def run_function_calls(function_calls: list, functions: dict,
+                       max_workers: int = DEFAULT_MAX_WORKERS,
+                       single_flight=None) -> list:
+    """Executes function calls concurrently and waits for all of them.
+
+    The total time is roughly that of the slowest call instead of the sum
+    of all calls.
+
+    Args:
+        function_calls: The FunctionCall objects to execute
+        functions: A ToolDispatcher, or a mapping of function name to the Python callable (sync or async)
+        max_workers: Upper bound on threads used for blocking tools
+        single_flight: Optional SingleFlight group; identical calls that are in
+            flight at the same time (in this batch or any other) run only once
+
+    Returns:
+        A list of function_response Parts, in the same order as function_calls.
+
+    Raises:
+        RuntimeError: If called while an event loop is running (in a notebook
+            or async code), where run_function_calls_async must be awaited instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(run_function_calls_async(function_calls, functions, max_workers, single_flight))
+    raise RuntimeError("run_function_calls can't run inside a running event loop; "
+                       "use await run_function_calls_async(...) instead")
@@ -0,0 +1,86 @@
+"""
+Passwords from the operating system's CSPRNG, one or thousands at a time
+
+generate_password in first-function-call.py picked every character with
+random.choice: a Mersenne Twister, which is predictable from its output and
+not meant for secrets, and one Python call per character. Here passwords
+are cut from os.urandom byte buffers (what secrets uses) mapped onto the
+character set with bytes.translate, so the per-character work happens in C.
+
+Mapping a byte to a character with byte % len(characters) would favour the
+first 256 % len(characters) characters, so bytes at or above the largest
+multiple of len(characters) below 256 are rejected instead: translate()
+deletes them while mapping the rest, and more bytes are drawn until there
+are enough.
+"""
+
+import math
+import secrets
+import string
+
+LETTERS_AND_DIGITS = string.ascii_letters + string.digits
+SYMBOLS = "!@#$%^&*"
+MIN_LENGTH = 8
+MAX_LENGTH = 256
+MAX_COUNT = 100_000
+
+_tables = {}
+
+
+def character_set(include_symbols: bool) -> str:
+    """The characters of the lesson's generate_password"""
+    return LETTERS_AND_DIGITS + SYMBOLS if include_symbols else LETTERS_AND_DIGITS
+
+
+def _table(characters: str) -> tuple:
+    """(translation table, bytes to delete, share of bytes kept) for a character set"""
+    table = _tables.get(characters)
+    if table is None:
+        if not 1 < len(characters) <= 256 or not characters.isascii() or len(set(characters)) != len(characters):
+            raise ValueError("characters must be 2 to 256 distinct ASCII characters")
+        accepted = 256 - 256 % len(characters)
+        mapping = bytes(ord(characters[b % len(characters)]) if b < accepted else 0 for b in range(256))
+        table = _tables[characters] = (mapping, bytes(range(accepted, 256)), accepted / 256)
+    return table
+
+
+def random_characters(count: int, characters: str) -> str:
+    """count characters drawn uniformly and independently from characters, from the CSPRNG"""
+    mapping, rejected, kept = _table(characters)
+    chunks, have = [], 0
+    while have < count:
+        # Ask for enough bytes that one draw nearly always suffices after rejections
+        wanted = count - have
+        drawn = secrets.token_bytes(math.ceil(wanted / kept * 1.02) + 16).translate(mapping, rejected)
+        chunks.append(drawn)
+        have += len(drawn)
+    return b"".join(chunks)[:count].decode("ascii")
+
+
+def generate_passwords(count: int, length: int = 16, include_symbols: bool = True) -> list:
+    """Generates count passwords of length characters in one pass over one random buffer.
+
+    Args:
+        count: Passwords to generate (1 to MAX_COUNT)
+        length: Characters per password, raised to MIN_LENGTH if shorter, at most MAX_LENGTH
+        include_symbols: Draw from letters, digits and SYMBOLS instead of letters and digits
+
+    Returns:
+        A list of count password strings.
+
+    Raises:
+        ValueError: If count or length is out of range, so one request can't
+            draw gigabytes from the CSPRNG.
+    """
+    if not 1 <= count <= MAX_COUNT:
+        raise ValueError(f"count must be between 1 and {MAX_COUNT}")
+    if length > MAX_LENGTH:
+        raise ValueError(f"length must be at most {MAX_LENGTH}")
+    length = max(length, MIN_LENGTH)
+    text = random_characters(count * length, character_set(include_symbols))
+    return [text[i:i + length] for i in range(0, len(text), length)]
+
+
+def password_strength(length: int, include_symbols: bool) -> str:
+    """The lesson's rating: Strong from 12 characters with symbols, Good otherwise"""
+    return "Strong" if length >= 12 and include_symbols else "Good"
@@ -0,0 +1,348 @@
+"""
+Plan mode: one model call for the whole tool graph
+
+Compositional calling normally costs one model round trip per dependent
+step: location -> forecast -> notification is four generate_content calls.
+In plan mode the model is asked once for a small dependency graph instead.
+It calls a single execute_plan function whose steps may reference the
+output of earlier steps:
+
+    {"id": "forecast", "tool": "get_weather_forecast",
+     "args_json": "{\"location\": {\"$ref\": \"loc.full_location\"}, \"days\": 3}"}
+
+The graph is executed locally, every step starting as soon as the steps it
+references have finished, and only the results of the final steps (the ones
+nothing else depends on) are sent back for the answer. N sequential model
+round trips become two.
+"""
+
+import contextvars
+import json
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+from google.genai import types
+
+from .dispatch import ToolDispatcher
+from .errors import ToolError, error_response
+from .parallel import DEFAULT_MAX_WORKERS
+from .streaming import _run_tool
+
+PLAN_FUNCTION = "execute_plan"
+
+REF_KEY = "$ref"
+
+
+class PlanError(ToolError):
+    """Raised when the model's plan can't be executed (unknown tool, bad reference, cycle, ...)"""
+
+    def __init__(self, message: str, details: list = None):
+        super().__init__("invalid_plan", message, details)
+
+
+@dataclass
+class PlanStep:
+    """One tool call in a plan.
+
+    Attributes:
+        id: Name other steps use to reference this step's result
+        tool: Tool to call
+        args: Arguments, where {"$ref": "<step id>.<field>"} values are filled in from earlier results
+        depends_on: Ids of the steps this one references
+    """
+    id: str
+    tool: str
+    args: dict
+    depends_on: frozenset = frozenset()
+
+
+@dataclass
+class PlanRun:
+    """What a plan mode request produced.
+
+    Attributes:
+        response: The final GenerateContentResponse
+        steps: The parsed plan, in topological order (empty if the model answered without one)
+        results: Result (or error payload) of every step, by step id
+        model_calls: generate_content calls made
+    """
+    response: types.GenerateContentResponse
+    steps: list = field(default_factory=list)
+    results: dict = field(default_factory=dict)
+    model_calls: int = 0
+
+
+def plan_declaration(tool_names) -> types.FunctionDeclaration:
+    """Declares the execute_plan function the model uses to hand over its plan.
+
+    Args:
+        tool_names: The tools a step may call
+    """
+    return types.FunctionDeclaration(
+        name=PLAN_FUNCTION,
+        description=(
+            "Runs a set of tool calls in one go. Plan every call needed to answer the request. "
+            "A step can use part of an earlier step's result as an argument by passing "
+            '{"$ref": "<step id>.<field>"} as the value, e.g. {"location": {"$ref": "loc.full_location"}}. '
+            "Steps that don't reference each other run at the same time."
+        ),
+        parameters=types.Schema(
+            type=types.Type.OBJECT,
+            properties={
+                "steps": types.Schema(
+                    type=types.Type.ARRAY,
+                    description="The tool calls to make",
+                    items=types.Schema(
+                        type=types.Type.OBJECT,
+                        properties={
+                            "id": types.Schema(type=types.Type.STRING,
+                                               description="Short unique name for this step, e.g. 'loc'"),
+                            "tool": types.Schema(type=types.Type.STRING, enum=sorted(tool_names),
+                                                 description="The tool to call"),
+                            "args_json": types.Schema(type=types.Type.STRING,
+                                                      description="The tool arguments as a JSON object"),
+                        },
+                        required=["id", "tool", "args_json"],
+                    ),
+                ),
+            },
+            required=["steps"],
+        ),
+    )
+
+
+def _references(value) -> set:
+    """Collects every "<step id>.<field>" reference inside an argument value"""
+    if isinstance(value, dict):
+        if set(value) == {REF_KEY} and isinstance(value[REF_KEY], str):
+            return {value[REF_KEY]}
+        return set().union(*map(_references, value.values())) if value else set()
+    if isinstance(value, list):
+        return set().union(*map(_references, value)) if value else set()
+    return set()
+
+
+def _resolve(value, results: dict):
+    """Replaces the references in an argument value with the referenced results"""
+    if isinstance(value, dict):
+        if set(value) == {REF_KEY} and isinstance(value[REF_KEY], str):
+            step_id, *path = value[REF_KEY].split(".")
+            resolved = results[step_id]
+            for key in path:
+                if isinstance(resolved, dict) and key in resolved:
+                    resolved = resolved[key]
+                elif isinstance(resolved, list) and key.isdigit() and int(key) < len(resolved):
+                    resolved = resolved[int(key)]
+                else:
+                    raise ToolError("invalid_reference", f"{value[REF_KEY]} is not in the result of {step_id}")
+            return resolved
+        return {key: _resolve(item, results) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_resolve(item, results) for item in value]
+    return value
+
+
+def parse_plan(args, tools) -> list:
+    """Checks the execute_plan arguments and builds the steps.
+
+    Args:
+        args: The args of the model's execute_plan call
+        tools: Names of the tools a step may call (a ToolDispatcher works too)
+
+    Returns:
+        The PlanSteps in topological order.
+
+    Raises:
+        PlanError: If a step is malformed, calls an unknown tool, references an
+            unknown step, or the references form a cycle.
+    """
+    raw_steps = (args or {}).get("steps")
+    if not isinstance(raw_steps, list) or not raw_steps:
+        raise PlanError("The plan has no steps")
+
+    steps, problems = {}, []
+    for index, raw in enumerate(raw_steps):
+        if not isinstance(raw, dict):
+            problems.append(f"steps[{index}] is not an object")
+            continue
+        step_id, tool = raw.get("id"), raw.get("tool")
+        if not step_id or not isinstance(step_id, str) or "." in step_id:
+            problems.append(f"steps[{index}] needs an id without dots")
+            continue
+        if step_id in steps:
+            problems.append(f"Duplicate step id: {step_id}")
+            continue
+        if tool not in tools:
+            problems.append(f"{step_id}: unknown tool {tool!r}")
+            continue
+
+        step_args = raw.get("args", raw.get("args_json", {}))
+        if isinstance(step_args, str):
+            try:
+                step_args = json.loads(step_args) if step_args.strip() else {}
+            except ValueError as e:
+                problems.append(f"{step_id}: args_json is not valid JSON ({e})")
+                continue
+        if not isinstance(step_args, dict):
+            problems.append(f"{step_id}: args must be a JSON object")
+            continue
+
+        depends_on = frozenset(ref.split(".", 1)[0] for ref in _references(step_args))
+        steps[step_id] = PlanStep(step_id, tool, step_args, depends_on)
+
+    for step in steps.values():
+        for dependency in sorted(step.depends_on - steps.keys()):
+            problems.append(f"{step.id} references unknown step {dependency!r}")
+    if problems:
+        raise PlanError("The plan can't be executed", problems)
+
+    # Kahn's algorithm, both to order the steps and to reject cycles
+    waiting = {step.id: set(step.depends_on) for step in steps.values()}
+    ordered = []
+    ready = [step_id for step_id, deps in waiting.items() if not deps]
+    while ready:
+        step_id = ready.pop(0)
+        ordered.append(steps[step_id])
+        del waiting[step_id]
+        for other, deps in waiting.items():
+            if step_id in deps:
+                deps.discard(step_id)
+                if not deps:
+                    ready.append(other)
+    if waiting:
+        raise PlanError(f"The plan has a reference cycle between: {', '.join(sorted(waiting))}")
+
+    return ordered
+
+
+def final_steps(steps: list) -> list:
+    """Returns the steps whose results no other step uses"""
+    used = set().union(*(step.depends_on for step in steps))
+    return [step for step in steps if step.id not in used]
+
+
+def _failed(result) -> bool:
+    return isinstance(result, dict) and "error_type" in result
+
+
+def execute_plan(steps: list, dispatcher: ToolDispatcher, max_workers: int = DEFAULT_MAX_WORKERS,
+                 executor: ThreadPoolExecutor = None) -> dict:
+    """Runs a plan with as much parallelism as its references allow.
+
+    Each step is submitted the moment the last step it references finishes,
+    rather than level by level. A step whose dependency failed is not run and
+    gets a "dependency_failed" error payload instead.
+
+    Args:
+        steps: PlanSteps in topological order, as returned by parse_plan
+        dispatcher: ToolDispatcher used to execute the calls
+        max_workers: Size of the temporary thread pool (ignored if executor is given)
+        executor: Thread pool to run the steps on
+
+    Returns:
+        The result, or error payload, of every step by step id.
+    """
+    owns_executor = executor is None
+    if owns_executor:
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    results, running = {}, {}
+    pending = list(steps)
+
+    def submit_ready():
+        # steps are in topological order, so the dependents of a step skipped here
+        # are reached later in the same pass
+        for step in list(pending):
+            if not step.depends_on.issubset(results):
+                continue
+            pending.remove(step)
+            failed = sorted(dep for dep in step.depends_on if _failed(results[dep]))
+            if failed:
+                results[step.id] = error_response(
+                    step.tool, "dependency_failed", f"Not run because {', '.join(failed)} failed")
+                continue
+            try:
+                call = types.FunctionCall(name=step.tool, args=_resolve(step.args, results))
+            except ToolError as e:
+                results[step.id] = e.to_response(step.tool)
+                continue
+            # Each worker runs in a copy of the caller's context (e.g. a Speculator conversation)
+            running[executor.submit(contextvars.copy_context().run, _run_tool, dispatcher, call)] = step.id
+
+    try:
+        submit_ready()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future)] = future.result()
+            submit_ready()
+    finally:
+        if owns_executor:
+            executor.shutdown(wait=False)
+
+    return results
+
+
+def run_plan_mode(client, *, model: str, contents: list, declarations, dispatcher: ToolDispatcher,
+                  include_all: bool = False, max_workers: int = DEFAULT_MAX_WORKERS) -> PlanRun:
+    """Answers a request with two model calls: one for the plan, one for the answer.
+
+    contents is extended in place with the plan turn, the results turn and
+    the final answer, so it holds the whole conversation afterwards.
+
+    Args:
+        client: A genai.Client (or StandInClient)
+        model: Model name
+        contents: The conversation so far, a list of Content
+        declarations: FunctionDeclarations of the tools the plan may use
+        dispatcher: ToolDispatcher that executes those tools
+        include_all: Send every step's result back instead of only the final steps'
+        max_workers: Thread pool size for the plan steps
+
+    Returns:
+        A PlanRun. If the model answered directly instead of planning, its
+        response is returned as is after one model call.
+    """
+    declarations = list(declarations)
+    tool = types.Tool(function_declarations=declarations + [plan_declaration(d.name for d in declarations)])
+    no_afc = types.AutomaticFunctionCallingConfig(disable=True)
+
+    plan_config = types.GenerateContentConfig(
+        tools=[tool],
+        automatic_function_calling=no_afc,
+        tool_config=types.ToolConfig(function_calling_config=types.FunctionCallingConfig(
+            mode=types.FunctionCallingConfigMode.ANY, allowed_function_names=[PLAN_FUNCTION])),
+    )
+    response = client.models.generate_content(model=model, contents=contents, config=plan_config)
+    content = response.candidates[0].content if response.candidates else None
+    plan_call = next((part.function_call for part in (content.parts if content else None) or ()
+                      if part.function_call and part.function_call.name == PLAN_FUNCTION), None)
+    if plan_call is None:
+        if content is not None:
+            contents.append(content)
+        return PlanRun(response=response, model_calls=1)
+
+    steps, results = [], {}
+    try:
+        steps = parse_plan(plan_call.args, dispatcher)
+        results = execute_plan(steps, dispatcher, max_workers=max_workers)
+        reported = steps if include_all else final_steps(steps)
+        payload = {"results": {step.id: results[step.id] for step in reported}}
+    except PlanError as e:
+        payload = e.to_response(PLAN_FUNCTION)
+
+    contents.append(content)
+    contents.append(types.Content(role="user", parts=[
+        types.Part.from_function_response(name=PLAN_FUNCTION, response=payload)]))
+
+    answer_config = types.GenerateContentConfig(
+        tools=[tool],
+        automatic_function_calling=no_afc,
+        tool_config=types.ToolConfig(function_calling_config=types.FunctionCallingConfig(
+            mode=types.FunctionCallingConfigMode.NONE)),
+    )
+    response = client.models.generate_content(model=model, contents=contents, config=answer_config)
+    if response.candidates and response.candidates[0].content is not None:
+        contents.append(response.candidates[0].content)
+
+    return PlanRun(response=response, steps=steps, results=results, model_calls=2)
@@ -0,0 +1,298 @@
+"""
+Client-side rate limiting with adaptive concurrency
+
+Fanning out many generate_content calls runs into the requests-per-minute
+and tokens-per-minute quotas, and the resulting 429s all retry at the same
+moment. RateLimitedClient wraps a client so that every call first:
+
+  - takes a slot from an AdaptiveConcurrency window, which grows by about one
+    slot per window of successful calls and halves on a throttling error (AIMD)
+  - takes one token from the requests bucket and its estimated cost from the
+    tokens bucket, waiting until the buckets have refilled enough
+
+The token cost is estimated before the call (prompt estimate plus the
+average response size) and corrected from usage_metadata afterwards, so the
+tokens bucket tracks what the API actually charged. Calls that are still
+throttled back off with full jitter, honouring the API's retryDelay hint.
+"""
+
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+
+from google.genai import errors
+
+from .standin import as_contents
+from .usage import UsageTracker
+
+
+def is_throttling_error(error: Exception) -> bool:
+    """True for a 429 / RESOURCE_EXHAUSTED error from the API"""
+    return isinstance(error, errors.APIError) and (error.code == 429 or error.status == "RESOURCE_EXHAUSTED")
+
+
+def retry_delay_hint(error: Exception) -> float:
+    """The retryDelay the API suggested in a 429, in seconds (0 if there is none)"""
+    details = getattr(error, "details", None)
+    if isinstance(details, dict):
+        details = details.get("error", details).get("details")
+    for detail in details or ():
+        if isinstance(detail, dict) and "retryDelay" in detail:
+            match = re.fullmatch(r"([\d.]+)s", str(detail["retryDelay"]))
+            if match:
+                return float(match.group(1))
+    return 0.0
+
+
+class TokenBucket:
+    """A token bucket refilled continuously at rate tokens per period.
+
+    acquire() reserves tokens straight away, letting the balance go negative,
+    and sleeps until the refill has paid the debt back. Callers are therefore
+    served in arrival order and a cost larger than the capacity still gets
+    through, just after a longer wait.
+
+    Args:
+        rate: Tokens added per period
+        period: Seconds per period, 60 for per-minute quotas
+        capacity: Most tokens the bucket can hold (defaults to rate, a full period's burst)
+    """
+
+    def __init__(self, rate: float, period: float = 60.0, capacity: float = None,
+                 clock=time.monotonic, sleep=time.sleep):
+        if rate <= 0 or period <= 0:
+            raise ValueError("rate and period must be positive")
+        self.rate = rate
+        self.period = period
+        self.capacity = capacity if capacity is not None else rate
+        self._per_second = rate / period
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self._per_second)
+        self._updated = now
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def acquire(self, amount: float = 1) -> float:
+        """Takes amount tokens, waiting until they are covered.
+
+        Returns:
+            The seconds spent waiting.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+            wait = -self._tokens / self._per_second if self._tokens < 0 else 0.0
+        if wait:
+            self._sleep(wait)
+        return wait
+
+    def adjust(self, amount: float) -> None:
+        """Takes amount more tokens (or gives -amount back) once the real cost is known"""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens - amount)
+
+
+class AdaptiveConcurrency:
+    """A concurrency limit that adapts with additive increase / multiplicative decrease.
+
+    Every successful call adds 1 / limit, so the limit grows by about one per
+    window of successes; a throttled call multiplies it by backoff, and calls
+    that failed for any other reason leave it as it is. Decreases
+    are at most once per cooldown seconds, so one burst of 429s from calls that
+    were already in flight only counts once.
+
+    Args:
+        initial: Starting limit
+        minimum: The limit never drops below this
+        maximum: The limit never grows above this
+        backoff: Factor applied to the limit on throttling
+        cooldown: Seconds between two decreases
+    """
+
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 64,
+                 backoff: float = 0.5, cooldown: float = 1.0, clock=time.monotonic):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._clock = clock
+        self._last_decrease = None
+        self._condition = threading.Condition()
+
+    def acquire(self) -> float:
+        """Waits for a free slot and takes it. Returns the seconds spent waiting"""
+        start = self._clock()
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+        return self._clock() - start
+
+    def release(self, throttled: bool = False, succeeded: bool = True) -> None:
+        """Gives the slot back and adapts the limit to how the call went"""
+        with self._condition:
+            self.in_flight -= 1
+            if throttled:
+                now = self._clock()
+                if self._last_decrease is None or now - self._last_decrease >= self.cooldown:
+                    self.limit = max(self.minimum, self.limit * self.backoff)
+                    self._last_decrease = now
+            elif succeeded:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+@dataclass
+class RateLimitStats:
+    """Counters for a RateLimitedClient.
+
+    Attributes:
+        requests: Calls sent to the API, retries included
+        throttled: Calls rejected with a throttling error
+        retries: Calls sent again after being throttled
+        waited: Seconds spent waiting for buckets and concurrency slots
+        estimated_tokens: Tokens reserved before the calls
+        actual_tokens: Tokens the API reported in usage_metadata
+    """
+    requests: int = 0
+    throttled: int = 0
+    retries: int = 0
+    waited: float = 0.0
+    estimated_tokens: int = 0
+    actual_tokens: int = 0
+
+
+class _RateLimitedModels:
+    def __init__(self, limiter: "RateLimitedClient"):
+        self._limiter = limiter
+
+    def generate_content(self, *, model: str, contents, config=None):
+        return self._limiter.generate_content(model=model, contents=contents, config=config)
+
+
+class RateLimitedClient:
+    """Wraps a client so generate_content stays inside RPM/TPM quotas.
+
+    Use it in place of the client: limited.models.generate_content(...).
+
+    Args:
+        client: A genai.Client (or StandInClient)
+        rpm: Requests allowed per period, None for no limit
+        tpm: Tokens allowed per period, None for no limit
+        period: Quota period in seconds
+        burst: Fraction of the quota that may go out at once, between 0 and 1. The
+            buckets refill at the rest of the quota, so no period ever sees more
+            than rpm / tpm (except for quotas so small that one call is the burst)
+        concurrency: AdaptiveConcurrency window; a default one is created if not given
+        usage: UsageTracker used to estimate prompt tokens and learn from usage_metadata
+        expected_output_tokens: Response size assumed until real responses have been seen
+        max_retries: How many times a throttled call is retried before the error is raised
+        base_delay: First retry backoff ceiling in seconds, doubled on every attempt
+        max_delay: Largest backoff ceiling in seconds
+    """
+
+    def __init__(self, client, *, rpm: int = None, tpm: int = None, period: float = 60.0, burst: float = 0.1,
+                 concurrency: AdaptiveConcurrency = None, usage: UsageTracker = None,
+                 expected_output_tokens: int = 256, max_retries: int = 5, base_delay: float = 1.0,
+                 max_delay: float = 60.0, seed: int = None, sleep=time.sleep):
+        if not 0 < burst < 1:
+            raise ValueError("burst must be between 0 and 1")
+        self.client = client
+        self.requests_bucket = self._bucket(rpm, period, burst, sleep) if rpm else None
+        self.tokens_bucket = self._bucket(tpm, period, burst, sleep) if tpm else None
+        self.concurrency = concurrency or AdaptiveConcurrency()
+        self.usage = usage or UsageTracker()
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.stats = RateLimitStats()
+        self.models = _RateLimitedModels(self)
+        # Moving average of response tokens, the part of the cost the prompt estimate can't see
+        self._output_tokens = float(expected_output_tokens)
+        self._random = random.Random(seed)
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _bucket(quota: int, period: float, burst: float, sleep) -> TokenBucket:
+        # Any period sees at most the burst plus one period of refill, which together make the quota.
+        # A bucket holds at least one call; when that is more than the burst (rpm=1 say), the refill
+        # keeps its share of the quota rather than dropping to nothing
+        capacity = max(1.0, quota * burst)
+        return TokenBucket(max(quota - capacity, quota * (1 - burst)), period, capacity=capacity, sleep=sleep)
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        ceiling = min(self.max_delay, self.base_delay * 2 ** attempt)
+        with self._lock:
+            jittered = self._random.uniform(0, ceiling)
+        return max(jittered, retry_delay_hint(error))
+
+    def generate_content(self, *, model: str, contents, config=None):
+        """Calls client.models.generate_content once the buckets and the concurrency window allow it"""
+        contents = as_contents(contents)
+        projected = self.usage.project_prompt_tokens(contents, config)
+
+        for attempt in range(self.max_retries + 1):
+            estimate = projected + int(self._output_tokens)
+            waited = self.concurrency.acquire()
+            throttled = succeeded = reserved = False
+            try:
+                if self.requests_bucket is not None:
+                    waited += self.requests_bucket.acquire(1)
+                if self.tokens_bucket is not None:
+                    waited += self.tokens_bucket.acquire(estimate)
+                    reserved = True
+                with self._lock:
+                    self.stats.requests += 1
+                    self.stats.retries += attempt > 0
+                    self.stats.waited += waited
+                    self.stats.estimated_tokens += estimate
+
+                response = self.client.models.generate_content(model=model, contents=contents, config=config)
+                succeeded = True
+            except Exception as e:
+                # A failed call used no tokens; hand back its estimate
+                if reserved:
+                    self.tokens_bucket.adjust(-estimate)
+                throttled = is_throttling_error(e)
+                if not throttled:
+                    raise
+                with self._lock:
+                    self.stats.throttled += 1
+                if attempt == self.max_retries:
+                    raise
+                error = e
+            finally:
+                self.concurrency.release(throttled=throttled, succeeded=succeeded)
+
+            if succeeded:
+                self._settle(response, config, projected, estimate)
+                return response
+            self._sleep(self._backoff(attempt, error))
+
+    def _settle(self, response, config, projected: int, estimate: int) -> None:
+        """Corrects the token reservation and the estimates from the response's usage_metadata"""
+        record = self.usage.record(response, config, projected=projected)
+        if not record.total_tokens:
+            return
+        if self.tokens_bucket is not None:
+            self.tokens_bucket.adjust(record.total_tokens - estimate)
+        with self._lock:
+            self.stats.actual_tokens += record.total_tokens
+            self._output_tokens = 0.8 * self._output_tokens + 0.2 * record.candidates_tokens
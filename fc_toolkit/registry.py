@@ -0,0 +1,156 @@
+"""
+Tool registry built once from signatures and docstrings
+
+Hand-written declaration dicts repeat what the function signature already
+says, and automatic function calling re-inspects every callable on every
+generate_content call. A ToolRegistry builds each FunctionDeclaration once,
+from the type hints and a Google-style docstring (or from an existing
+declaration dict), then freezes the set and builds the Tool and config once.
+Each request gets a shallow copy of them (a few microseconds, where building
+them takes a couple of hundred), so a caller changing its config or
+declarations can't change anyone else's.
+"""
+
+import inspect
+import re
+from types import MappingProxyType
+
+from google.genai import types
+
+# Section headers that end the "Args:" block of a Google-style docstring
+_SECTION_RE = re.compile(r"^(Args|Arguments|Returns|Raises|Yields|Examples?|Notes?):\s*$")
+_ARG_RE = re.compile(r"^(\*{0,2}\w+)\s*(?:\([^)]*\))?:\s*(.*)$")
+
+
+def parse_docstring(docstring: str) -> tuple:
+    """Splits a Google-style docstring into its summary and per-argument descriptions.
+
+    Returns:
+        A (summary, {argument name: description}) tuple.
+    """
+    lines = inspect.cleandoc(docstring or "").splitlines()
+    summary_lines, arg_descriptions = [], {}
+    section, current = None, None
+
+    for line in lines:
+        stripped = line.strip()
+        header = _SECTION_RE.match(stripped)
+        if header:
+            section, current = header.group(1), None
+            continue
+
+        if section is None:
+            summary_lines.append(stripped)
+        elif section in ("Args", "Arguments") and stripped:
+            match = _ARG_RE.match(stripped)
+            if match and not line.startswith(" " * 8):
+                current = match.group(1).lstrip("*")
+                arg_descriptions[current] = match.group(2)
+            elif current:
+                # Continuation line of the previous argument
+                arg_descriptions[current] += " " + stripped
+
+    summary = " ".join(" ".join(summary_lines).split())
+    return summary, arg_descriptions
+
+
+def declaration_from_function(function) -> types.FunctionDeclaration:
+    """Builds a FunctionDeclaration from a function's type hints and docstring"""
+    declaration = types.FunctionDeclaration.from_callable_with_api_option(callable=function)
+    summary, arg_descriptions = parse_docstring(function.__doc__)
+
+    declaration.description = summary or None
+    if declaration.parameters and declaration.parameters.properties:
+        for name, schema in declaration.parameters.properties.items():
+            if name in arg_descriptions:
+                schema.description = arg_descriptions[name]
+    return declaration
+
+
+class ToolRegistry:
+    """Holds the declarations and implementations of a set of tools.
+
+    Register tools with register() (or use it as a decorator), then read
+    .tool / .config() for requests and .functions to execute the calls. The
+    first time the Tool is built the registry is frozen: the declarations are
+    never rebuilt and further registrations are refused.
+    """
+
+    def __init__(self):
+        self._declarations = {}
+        self._functions = {}
+        self._tool = None
+        self._config = None
+
+    @property
+    def frozen(self) -> bool:
+        return self._tool is not None
+
+    def register(self, function=None, *, declaration: dict = None, name: str = None):
+        """Adds a tool to the registry.
+
+        Args:
+            function: The Python function implementing the tool
+            declaration: Optional hand-written declaration dict to use instead of
+                generating one from the function
+            name: Optional tool name, defaults to the declaration's or function's name
+
+        Returns:
+            The function unchanged, so register can be used as a decorator.
+        """
+        if function is None:
+            return lambda f: self.register(f, declaration=declaration, name=name)
+
+        if self.frozen:
+            raise RuntimeError("ToolRegistry is frozen, register all tools before building requests")
+
+        if declaration is not None:
+            built = types.FunctionDeclaration.model_validate(declaration)
+        else:
+            built = declaration_from_function(function)
+        if name:
+            built.name = name
+
+        self._declarations[built.name] = built
+        self._functions[built.name] = function
+        return function
+
+    def freeze(self) -> types.Tool:
+        """Builds the Tool (once), stops further registrations and returns a copy of the Tool"""
+        if self._tool is None:
+            self._tool = types.Tool(function_declarations=list(self._declarations.values()))
+        return self._copy_tool()
+
+    def _copy_tool(self) -> types.Tool:
+        # Shallow copies: nested parameter schemas are still shared, top-level fields are not
+        declarations = [declaration.model_copy() for declaration in self._tool.function_declarations]
+        return self._tool.model_copy(update={"function_declarations": declarations})
+
+    @property
+    def tool(self) -> types.Tool:
+        """A copy of the Tool listing every registered declaration, for one request"""
+        return self.freeze()
+
+    @property
+    def declarations(self):
+        """Read-only mapping of tool name to FunctionDeclaration"""
+        return MappingProxyType(self._declarations)
+
+    @property
+    def functions(self):
+        """Read-only mapping of tool name to Python function, for executing calls"""
+        return MappingProxyType(self._functions)
+
+    def config(self, **overrides) -> types.GenerateContentConfig:
+        """Returns a GenerateContentConfig with the registered tools, for one request.
+
+        Without overrides it is a copy of a config built once; overrides
+        (tool_config, temperature, ...) build a new config around a copy of
+        the prebuilt Tool.
+        """
+        tool = self.freeze()
+        if overrides:
+            return types.GenerateContentConfig(tools=[tool], **overrides)
+        if self._config is None:
+            self._config = types.GenerateContentConfig(tools=[self._tool])
+        return self._config.model_copy(update={"tools": [tool]})
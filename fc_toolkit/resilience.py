@@ -0,0 +1,275 @@
+"""
+Deadlines, retries and hedged requests for the model call
+
+Model latency has a long tail: most calls are quick, a few take many times
+longer, and those few set the p99 of a whole conversation. ResilientClient
+wraps a client and gives every generate_content call:
+
+  - a deadline for the whole call, retries included, and optionally a
+    timeout per attempt
+  - retries of retryable errors (429, 5xx, timeouts, dropped connections)
+    with jittered exponential backoff
+  - optional hedging: once an attempt has been running longer than the p95
+    of recent calls, a duplicate request is sent and whichever answers first
+    wins; the other is cancelled
+
+With client.aio the losing request is really cancelled. The blocking
+client.models API can't interrupt a request that is already running, so the
+loser is abandoned on its worker thread and its response discarded.
+"""
+
+import asyncio
+import functools
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from google.genai import errors
+
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a call hasn't succeeded by its deadline"""
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """True for errors worth another attempt: throttling, server errors, timeouts, dropped connections"""
+    if isinstance(error, errors.APIError):
+        return error.code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (TimeoutError, ConnectionError, asyncio.TimeoutError)) or \
+        type(error).__name__ in ("ConnectTimeout", "ReadTimeout", "ConnectError", "RemoteProtocolError")
+
+
+class LatencyTracker:
+    """Keeps the latencies of the most recent successful calls and answers percentile queries"""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> float:
+        """The pct-th percentile (0-100) of the recent latencies, nearest rank"""
+        with self._lock:
+            ordered = sorted(self._samples)
+        if not ordered:
+            return 0.0
+        rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+        return ordered[rank]
+
+
+@dataclass
+class ResilienceStats:
+    """Counters for a ResilientClient.
+
+    Attributes:
+        calls: generate_content calls made through the client
+        attempts: Attempts made, retries included (hedges not counted)
+        retries: Attempts made after a retryable failure
+        timeouts: Attempts that ran past their timeout
+        deadline_exceeded: Calls that failed because their deadline ran out
+        hedges: Duplicate requests sent
+        hedge_wins: Hedges that answered before the request they duplicated
+    """
+    calls: int = 0
+    attempts: int = 0
+    retries: int = 0
+    timeouts: int = 0
+    deadline_exceeded: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+
+    @property
+    def hedge_win_rate(self) -> float:
+        return self.hedge_wins / self.hedges if self.hedges else 0.0
+
+
+class _Models:
+    def __init__(self, resilient: "ResilientClient"):
+        self._resilient = resilient
+
+    def generate_content(self, *, model: str, contents, config=None):
+        return self._resilient.generate_content(model=model, contents=contents, config=config)
+
+
+class _AsyncModels:
+    def __init__(self, resilient: "ResilientClient"):
+        self._resilient = resilient
+
+    async def generate_content(self, *, model: str, contents, config=None):
+        return await self._resilient.generate_content_async(model=model, contents=contents, config=config)
+
+
+class _Aio:
+    def __init__(self, resilient: "ResilientClient"):
+        self.models = _AsyncModels(resilient)
+
+
+class ResilientClient:
+    """Wraps a client with deadlines, retries and hedging for generate_content.
+
+    Use it in place of the client: resilient.models.generate_content(...) or
+    await resilient.aio.models.generate_content(...).
+
+    Args:
+        client: A genai.Client, StandInClient, or another wrapper with .models
+        deadline: Seconds the whole call may take, retries included; None for no deadline
+        attempt_timeout: Seconds a single attempt may take before it is retried
+        max_retries: Retries after the first attempt
+        base_delay: Backoff ceiling for the first retry, doubled on every retry
+        max_delay: Largest backoff ceiling
+        hedge: Send a duplicate request when an attempt runs long
+        hedge_percentile: Percentile of recent latencies after which to hedge
+        hedge_delay: Fixed hedge delay in seconds, used instead of the percentile when given
+        min_samples: Calls to observe before hedging on the percentile
+        max_workers: Threads for the blocking API, abandoned hedges included
+    """
+
+    def __init__(self, client, *, deadline: float = None, attempt_timeout: float = None, max_retries: int = 3,
+                 base_delay: float = 0.5, max_delay: float = 8.0, hedge: bool = False,
+                 hedge_percentile: float = 95, hedge_delay: float = None, min_samples: int = 20,
+                 max_workers: int = 32, seed: int = None):
+        self.client = client
+        self.deadline = deadline
+        self.attempt_timeout = attempt_timeout
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_delay = hedge_delay
+        self.min_samples = min_samples
+        self.latencies = LatencyTracker()
+        self.stats = ResilienceStats()
+        self.models = _Models(self)
+        self.aio = _Aio(self)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._max_workers = max_workers
+        self._executor = None
+
+    def _count(self, **increments) -> None:
+        with self._lock:
+            for name, value in increments.items():
+                setattr(self.stats, name, getattr(self.stats, name) + value)
+
+    def current_hedge_delay(self):
+        """Seconds after which an attempt is hedged, or None if it won't be"""
+        if not self.hedge:
+            return None
+        if self.hedge_delay is not None:
+            return self.hedge_delay
+        if len(self.latencies) < self.min_samples:
+            return None
+        return self.latencies.percentile(self.hedge_percentile)
+
+    async def _attempt(self, start, timeout):
+        """Runs one attempt, hedged if it runs long. Raises asyncio.TimeoutError after timeout"""
+        clock = time.perf_counter
+        began = clock()
+        primary = asyncio.ensure_future(start())
+        started = {primary: began}
+        pending, errors_seen = {primary}, []
+        hedge_after = self.current_hedge_delay()
+
+        try:
+            while pending:
+                elapsed = clock() - began
+                waits = [timeout - elapsed if timeout is not None else None]
+                if hedge_after is not None:
+                    waits.append(hedge_after - elapsed)
+                wait_for = min((w for w in waits if w is not None), default=None)
+
+                done, pending = await asyncio.wait(pending, timeout=max(wait_for, 0) if wait_for is not None
+                                                   else None, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        errors_seen.append(task.exception())
+                        continue
+                    self.latencies.add(clock() - started[task])
+                    if task is not primary:
+                        self._count(hedge_wins=1)
+                    return task.result()
+
+                elapsed = clock() - began
+                if timeout is not None and elapsed >= timeout:
+                    raise asyncio.TimeoutError()
+                if hedge_after is not None and elapsed >= hedge_after and pending:
+                    # Duplicate the request once; the first answer wins
+                    hedge_after = None
+                    duplicate = asyncio.ensure_future(start())
+                    started[duplicate] = clock()
+                    pending.add(duplicate)
+                    self._count(hedges=1)
+            raise errors_seen[0]
+        finally:
+            for task in started:
+                if not task.done():
+                    task.cancel()
+
+    async def _call(self, start):
+        """Retries attempts until one succeeds, the error isn't retryable, or the deadline passes"""
+        self._count(calls=1)
+        deadline_at = time.perf_counter() + self.deadline if self.deadline is not None else None
+
+        for attempt in range(self.max_retries + 1):
+            remaining = deadline_at - time.perf_counter() if deadline_at is not None else None
+            if remaining is not None and remaining <= 0:
+                break
+            timeout = min((t for t in (self.attempt_timeout, remaining) if t is not None), default=None)
+
+            self._count(attempts=1, retries=attempt > 0)
+            try:
+                return await self._attempt(start, timeout)
+            except asyncio.TimeoutError:
+                self._count(timeouts=1)
+                error = None
+            except Exception as e:
+                if not is_retryable_error(e):
+                    raise
+                error = e
+
+            if attempt == self.max_retries:
+                if error is not None:
+                    raise error
+                break
+            ceiling = min(self.max_delay, self.base_delay * 2 ** attempt)
+            with self._lock:
+                delay = self._random.uniform(0, ceiling)
+            if deadline_at is not None:
+                delay = min(delay, max(0.0, deadline_at - time.perf_counter()))
+            await asyncio.sleep(delay)
+
+        self._count(deadline_exceeded=1)
+        if self.deadline is None:
+            raise DeadlineExceeded(f"generate_content timed out on all {self.max_retries + 1} attempts")
+        raise DeadlineExceeded(f"generate_content did not succeed within {self.deadline}s")
+
+    async def generate_content_async(self, *, model: str, contents, config=None):
+        """Calls client.aio.models.generate_content with deadlines, retries and hedging"""
+        return await self._call(lambda: self.client.aio.models.generate_content(
+            model=model, contents=contents, config=config))
+
+    def generate_content(self, *, model: str, contents, config=None):
+        """Calls client.models.generate_content with deadlines, retries and hedging"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers)
+        call = functools.partial(self.client.models.generate_content, model=model, contents=contents, config=config)
+        # Attempts run on the shared pool, so asyncio.run doesn't wait for an abandoned hedge on exit
+        return asyncio.run(self._call(lambda: asyncio.get_running_loop().run_in_executor(self._executor, call)))
+
+    def close(self) -> None:
+        """Shuts down the worker threads of the blocking API"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
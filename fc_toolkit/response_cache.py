@@ -0,0 +1,225 @@
+"""
+Persistent cache in front of generate_content
+
+Repeated prompts (the same email check, the same status question) don't
+need another model round trip. ResponseCache keys each request by a stable
+hash of the model, contents, tools, tool_config and the rest of the config,
+and keeps responses in an append-only JSONL file with an in-memory index of
+file offsets, so a hit is a dictionary lookup plus one seek and read.
+
+The cache is opt-in: ResponseCache.from_env() only enables it when the
+FC_RESPONSE_CACHE environment variable points at a cache file.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from google.genai import types
+
+from .cache import CacheStats
+
+ENV_VAR = "FC_RESPONSE_CACHE"
+
+
+def _canonical_tool(tool):
+    if callable(tool):
+        # Automatic function calling: identify the callable by name and declaration
+        declaration = types.FunctionDeclaration.from_callable_with_api_option(callable=tool)
+        return {"callable": declaration.model_dump(mode="json", exclude_none=True)}
+    if hasattr(tool, "model_dump"):
+        return tool.model_dump(mode="json", exclude_none=True)
+    return tool
+
+
+def _canonical_contents(contents):
+    if isinstance(contents, (str, types.Content, types.Part, dict)):
+        contents = [contents]
+    canonical = []
+    for item in contents:
+        if hasattr(item, "model_dump"):
+            item = item.model_dump(mode="json", exclude_none=True)
+        canonical.append(item)
+    return canonical
+
+
+def tool_names(config) -> set:
+    """Names of every function the config exposes, declared or passed as a callable"""
+    names = set()
+    for tool in getattr(config, "tools", None) or ():
+        if callable(tool):
+            names.add(tool.__name__)
+        for declaration in getattr(tool, "function_declarations", None) or ():
+            names.add(declaration.name)
+    return names
+
+
+def request_fingerprint(model: str, contents, config=None) -> str:
+    """Stable SHA-256 of everything that determines a generate_content response"""
+    config_dict = {}
+    if config is not None:
+        if isinstance(config, dict):
+            config = types.GenerateContentConfig.model_validate(config)
+        config_dict = config.model_dump(mode="json", exclude_none=True, exclude={"tools", "http_options"})
+        config_dict["tools"] = [_canonical_tool(tool) for tool in config.tools or ()]
+
+    payload = {"model": model, "contents": _canonical_contents(contents), "config": config_dict}
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class ResponseCache:
+    """On-disk (or in-memory) cache of generate_content responses.
+
+    Args:
+        path: JSONL file to persist entries in; None keeps everything in memory
+        ttl: Seconds a cached response stays valid
+        max_entries: Entries kept in the index; the least recently used are evicted
+        bypass_tools: Tool names whose presence in a request disables caching,
+            for tools whose results change from call to call
+        enabled: False turns every call into a plain pass-through
+    """
+
+    def __init__(self, path: str = None, ttl: float = 24 * 3600, max_entries: int = 10_000,
+                 bypass_tools=(), enabled: bool = True):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.bypass_tools = frozenset(bypass_tools)
+        self.enabled = enabled
+        self.stats = CacheStats()
+        self.bypassed = 0
+        self._index = OrderedDict()  # key -> (expires_at, offset, length) or (expires_at, json)
+        self._lock = threading.Lock()
+        self._garbage = 0
+
+        if enabled and path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._load()
+
+    @classmethod
+    def from_env(cls, **kwargs) -> "ResponseCache":
+        """Builds a cache backed by the file in $FC_RESPONSE_CACHE, or a disabled one if it is unset"""
+        path = os.environ.get(ENV_VAR)
+        return cls(path=path, enabled=bool(path), **kwargs)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _load(self) -> None:
+        """Rebuilds the in-memory index from the append-only file"""
+        if not os.path.exists(self.path):
+            return
+        now = time.time()
+        with open(self.path, "rb") as f:
+            offset = 0
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    key, expires_at = entry["key"], entry["expires_at"]
+                except (ValueError, KeyError):
+                    entry = None  # A torn write at the end of the file
+                if entry is not None:
+                    if key in self._index:
+                        self._garbage += 1
+                    if expires_at > now:
+                        self._index[key] = (expires_at, offset, len(line))
+                        self._index.move_to_end(key)
+                    else:
+                        self._index.pop(key, None)
+                        self._garbage += 1
+                offset += len(line)
+        self._evict()
+
+    def _evict(self) -> None:
+        while len(self._index) > self.max_entries:
+            self._index.popitem(last=False)
+            self._garbage += 1
+            self.stats.evictions += 1
+
+    def get(self, key: str):
+        """Returns the cached GenerateContentResponse for key, or None"""
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            if entry[0] <= time.time():
+                del self._index[key]
+                self._garbage += 1
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+            self._index.move_to_end(key)
+            self.stats.hits += 1
+
+            if self.path is not None:
+                # Read while holding the lock: a put() may compact the file and move every entry
+                with open(self.path, "rb") as f:
+                    f.seek(entry[1])
+                    line = f.read(entry[2])
+
+        if self.path is None:
+            return types.GenerateContentResponse.model_validate_json(entry[1])
+        # Parsing, the slow part, happens outside the lock
+        return types.GenerateContentResponse.model_validate(json.loads(line)["response"])
+
+    def put(self, key: str, response) -> None:
+        """Stores a response under key"""
+        expires_at = time.time() + self.ttl
+        response_json = response.model_dump_json(exclude_none=True)
+
+        with self._lock:
+            if key in self._index:
+                self._garbage += 1
+            if self.path is None:
+                self._index[key] = (expires_at, response_json)
+            else:
+                line = ('{"key":%s,"expires_at":%r,"response":%s}\n'
+                        % (json.dumps(key), expires_at, response_json)).encode()
+                with open(self.path, "ab") as f:
+                    offset = f.tell()
+                    f.write(line)
+                self._index[key] = (expires_at, offset, len(line))
+            self._index.move_to_end(key)
+            self._evict()
+
+            if self.path is not None and self._garbage > max(1000, len(self._index)):
+                self._compact()
+
+    def _compact(self) -> None:
+        """Rewrites the file with only the live entries (called with the lock held)"""
+        temp_path = self.path + ".tmp"
+        new_index = OrderedDict()
+        with open(self.path, "rb") as source, open(temp_path, "wb") as target:
+            for key, (expires_at, offset, length) in self._index.items():
+                source.seek(offset)
+                line = source.read(length)
+                new_index[key] = (expires_at, target.tell(), length)
+                target.write(line)
+        os.replace(temp_path, self.path)
+        self._index = new_index
+        self._garbage = 0
+
+    def should_bypass(self, config) -> bool:
+        return bool(self.bypass_tools) and not self.bypass_tools.isdisjoint(tool_names(config))
+
+    def generate_content(self, client, *, model: str, contents, config=None):
+        """Returns a cached response for an identical earlier request, or calls the model and caches it"""
+        if not self.enabled or self.should_bypass(config):
+            if self.enabled:
+                self.bypassed += 1
+            return client.models.generate_content(model=model, contents=contents, config=config)
+
+        key = request_fingerprint(model, contents, config)
+        response = self.get(key)
+        if response is not None:
+            return response
+
+        response = client.models.generate_content(model=model, contents=contents, config=config)
+        if response.candidates:
+            self.put(key, response)
+        return response
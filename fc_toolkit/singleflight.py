@@ -0,0 +1,159 @@
+"""
+Single-flight coalescing of identical tool calls
+
+When several sessions ask for the same thing at the same moment (the same
+get_user_details(3), the same get_weather_forecast("Seattle, WA", 3)), only
+the first call actually runs. Calls with the same function name and
+arguments that arrive while it is still in flight wait for it and all receive
+its result. Nothing is cached once the call finishes.
+"""
+
+import asyncio
+import functools
+import inspect
+import json
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+
+
+def _canonical(value):
+    """Normalizes argument values so equivalent calls produce the same key"""
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        # The model often sends 3.0 where the schema says integer
+        return int(value)
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return repr(value)
+
+
+def call_key(name: str, args: dict) -> str:
+    """Builds a stable key for a function call from its name and arguments"""
+    return name + ":" + json.dumps(_canonical(dict(args or {})), sort_keys=True, separators=(",", ":"))
+
+
+@dataclass
+class SingleFlightStats:
+    """Counters for a SingleFlight group.
+
+    Attributes:
+        calls: Every call made through the group
+        executions: Calls that actually ran the function
+        coalesced: Calls that waited for an identical in-flight call instead
+    """
+    calls: int = 0
+    executions: int = 0
+    coalesced: int = 0
+
+
+class SingleFlight:
+    """Tracks in-flight calls by key so that duplicates share one execution"""
+
+    def __init__(self):
+        self.stats = SingleFlightStats()
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> concurrent.futures.Future
+        self._async_calls = {}  # (event loop id, key) -> asyncio.Future
+
+    def do(self, key: str, function, *args, **kwargs):
+        """Runs function(*args, **kwargs) unless a call with the same key is already running.
+
+        Returns the result of the shared execution; if it raised, every waiting
+        caller gets the same exception.
+        """
+        with self._lock:
+            self.stats.calls += 1
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.stats.executions += 1
+            else:
+                self.stats.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(function(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return future.result()
+
+    async def do_async(self, key: str, function, *args, **kwargs):
+        """Async version of do() for coroutine functions, shared within one event loop"""
+        loop_key = (id(asyncio.get_running_loop()), key)
+
+        with self._lock:
+            self.stats.calls += 1
+            future = self._async_calls.get(loop_key)
+            leader = future is None
+            if leader:
+                future = asyncio.get_running_loop().create_future()
+                self._async_calls[loop_key] = future
+                self.stats.executions += 1
+            else:
+                self.stats.coalesced += 1
+
+        if not leader:
+            return await asyncio.shield(future)
+
+        try:
+            future.set_result(await function(*args, **kwargs))
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._async_calls[loop_key]
+        return future.result()
+
+
+# Group used by the single_flight decorator and the dispatch helpers by default
+default_group = SingleFlight()
+
+
+def single_flight(function=None, *, group: SingleFlight = None):
+    """Decorator that coalesces concurrent identical calls to a tool.
+
+    The wrapper keeps the original name, docstring and signature, so it can be
+    listed in a function declaration table or passed straight to automatic
+    function calling.
+
+    Args:
+        function: The tool to wrap (sync or async)
+        group: The SingleFlight group to track calls in, default_group if not given
+    """
+    if function is None:
+        return lambda f: single_flight(f, group=group)
+
+    group = group or default_group
+    signature = inspect.signature(function)
+
+    def key_for(args, kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return call_key(function.__name__, bound.arguments)
+
+    if inspect.iscoroutinefunction(function):
+        @functools.wraps(function)
+        async def async_wrapper(*args, **kwargs):
+            return await group.do_async(key_for(args, kwargs), function, *args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        return group.do(key_for(args, kwargs), function, *args, **kwargs)
+    return wrapper
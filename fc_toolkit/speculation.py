@@ -0,0 +1,263 @@
+"""
+Speculative pre-execution of predictable next tool calls
+
+Compositional chains are often the same every time: get_user_location is
+followed by get_weather_forecast(location=<its full_location>, ...). Instead
+of waiting a full model round trip before running the next tool, a
+Speculator starts the predicted call in the background as soon as the first
+one returns, and hands the result over instantly if the model does ask for
+exactly that call.
+
+Predictions come from configured rules and/or are learned from the calls
+seen so far: for each observed A -> B transition it counts, per argument of
+B, whether the value was a field of A's result or a constant. A rule may
+leave out arguments the model chooses (how many days to forecast); those
+are filled in from what was learned, or the call isn't speculated.
+Transitions are only learned between calls of the same conversation, so
+wrap each conversation in `with speculator.conversation():`. Only tools
+listed in safe_tools are ever speculated, so side-effecting tools like
+send_notification never run unless the model asks for them.
+"""
+
+import contextlib
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from .singleflight import call_key
+
+
+class from_result:
+    """Marks a rule argument as "take this field from the previous tool's result" """
+
+    def __init__(self, field: str):
+        self.field = field
+
+    def __repr__(self) -> str:
+        return f"from_result({self.field!r})"
+
+
+@dataclass
+class SpeculationStats:
+    """Counters for a Speculator.
+
+    Attributes:
+        launched: Speculative calls started
+        hits: Real calls answered by a speculative result
+        misses: Real calls of a safe tool that had no matching speculation
+        wasted: Speculative results that expired unused
+    """
+    launched: int = 0
+    hits: int = 0
+    misses: int = 0
+    wasted: int = 0
+
+
+# Returned by _take when there is no speculative result, since a tool may return None
+_MISSING = object()
+
+
+def _hashable(value) -> bool:
+    try:
+        hash(value)
+        return True
+    except TypeError:
+        return False
+
+
+class Speculator:
+    """Predicts and pre-executes the next tool call in a chain.
+
+    Args:
+        safe_tools: Names of tools without side effects that may be run speculatively
+        rules: Configured transitions, {after: {next_tool: {arg: value or from_result(field)}}}
+        learn: Learn transitions from observed calls in addition to the rules
+        min_support: Times a transition must be seen before a learned prediction is used
+        ttl: Seconds an unused speculative result is kept
+        max_workers: Threads available for speculative calls
+    """
+
+    def __init__(self, safe_tools=(), rules: dict = None, learn: bool = True, min_support: int = 2,
+                 ttl: float = 30.0, max_workers: int = 4):
+        self.safe_tools = frozenset(safe_tools)
+        self.rules = rules or {}
+        self.learn = learn
+        self.min_support = min_support
+        self.ttl = ttl
+        self.stats = SpeculationStats()
+        self._functions = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="speculation")
+        self._pending = {}  # call key -> (expires_at, future)
+        self._transitions = Counter()  # (A, B) -> times seen
+        self._sources = defaultdict(Counter)  # (A, B, arg) -> Counter of ("field", f) / ("const", v)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._previous = {}  # conversation -> (name, result) of its last call
+        self._conversation = contextvars.ContextVar("speculation_conversation", default=None)
+
+    @contextlib.contextmanager
+    def conversation(self):
+        """Scopes learning to one conversation: only calls made inside it are paired up as transitions"""
+        key = object()
+        token = self._conversation.set(key)
+        try:
+            yield
+        finally:
+            self._conversation.reset(token)
+            with self._lock:
+                self._previous.pop(key, None)
+
+    def wrap(self, function):
+        """Wraps a tool so its calls are observed and can be answered from speculation.
+
+        The wrapper keeps the name, docstring and signature of the tool, so it
+        works in a dispatcher table and with automatic function calling.
+        """
+        name = function.__name__
+        signature = inspect.signature(function)
+        self._functions[name] = function
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+
+            result = self._take(name, arguments)
+            if result is _MISSING:
+                result = function(**arguments)
+            self.observe(name, arguments, result)
+            return result
+
+        return wrapper
+
+    def _take(self, name: str, arguments: dict):
+        """Returns the speculative result for this exact call, or _MISSING"""
+        key = call_key(name, arguments)
+        with self._lock:
+            entry = self._pending.pop(key, None)
+            if entry is None and name in self.safe_tools:
+                self.stats.misses += 1
+        if entry is None:
+            return _MISSING
+
+        expires_at, future = entry
+        if expires_at <= time.monotonic():
+            with self._lock:
+                self.stats.wasted += 1
+            return _MISSING  # Too old to trust, run it for real
+        try:
+            result = future.result()
+        except Exception:
+            return _MISSING  # Run it for real and let the error surface normally
+        with self._lock:
+            self.stats.hits += 1
+        return result
+
+    def observe(self, name: str, arguments: dict, result) -> None:
+        """Records a completed call and launches speculation for what is likely to follow"""
+        conversation = self._conversation.get()
+        previous = None
+        if conversation is not None:
+            with self._lock:
+                previous = self._previous.get(conversation)
+                self._previous[conversation] = (name, result)
+
+        if self.learn and previous is not None:
+            self._learn(previous[0], previous[1], name, arguments)
+        if isinstance(result, dict):
+            for next_name, next_arguments in self.predict(name, result):
+                self._launch(next_name, next_arguments)
+
+    def _learn(self, previous_name: str, previous_result, name: str, arguments: dict) -> None:
+        fields = previous_result if isinstance(previous_result, dict) else {}
+        with self._lock:
+            self._transitions[(previous_name, name)] += 1
+            for arg, value in arguments.items():
+                field = next((f for f, v in fields.items() if v == value and _hashable(v)), None)
+                if field is not None:
+                    self._sources[(previous_name, name, arg)][("field", field)] += 1
+                elif _hashable(value):
+                    self._sources[(previous_name, name, arg)][("const", value)] += 1
+
+    def predict(self, name: str, result: dict) -> list:
+        """Predicted (tool name, arguments) calls to follow a call of name that returned result"""
+        predictions = {}
+
+        for next_name, template in self.rules.get(name, {}).items():
+            arguments = {}
+            for arg, value in template.items():
+                if isinstance(value, from_result):
+                    if value.field not in result:
+                        break
+                    value = result[value.field]
+                arguments[arg] = value
+            else:
+                # Arguments the rule leaves to the model come from what was learned, if anything
+                arguments = self._complete(name, next_name, result, arguments)
+                if arguments is not None:
+                    predictions[next_name] = arguments
+
+        if self.learn:
+            with self._lock:
+                transitions = [(b, n) for (a, b), n in self._transitions.items() if a == name]
+            for next_name, seen in transitions:
+                if next_name in predictions or seen < self.min_support:
+                    continue
+                arguments = self._complete(name, next_name, result, {})
+                if arguments is not None:
+                    predictions[next_name] = arguments
+
+        return [(n, a) for n, a in predictions.items() if n in self.safe_tools and n in self._functions]
+
+    def _complete(self, name: str, next_name: str, result: dict, arguments: dict):
+        """arguments with every other parameter of next_name filled in from learned sources, or None"""
+        function = self._functions.get(next_name)
+        if function is None:
+            return None
+        arguments = dict(arguments)
+        for arg, parameter in inspect.signature(function).parameters.items():
+            if arg in arguments:
+                continue
+            with self._lock:
+                sources = self._sources.get((name, next_name, arg))
+                learned = sources.most_common(1)[0] if sources and self.learn else None
+            if learned is None or learned[1] < self.min_support:
+                if parameter.default is inspect.Parameter.empty:
+                    return None
+                continue
+            kind, value = learned[0]
+            if kind == "field":
+                if value not in result:
+                    return None
+                value = result[value]
+            arguments[arg] = value
+        return arguments
+
+    def _launch(self, name: str, arguments: dict) -> None:
+        key = call_key(name, arguments)
+        now = time.monotonic()
+        with self._lock:
+            if self._closed:
+                return  # After shutdown every call simply runs the tool
+            for stale_key in [k for k, (expires_at, _) in self._pending.items() if expires_at <= now]:
+                del self._pending[stale_key]
+                self.stats.wasted += 1
+            if key in self._pending:
+                return
+            future = self._executor.submit(self._functions[name], **arguments)
+            self._pending[key] = (now + self.ttl, future)
+            self.stats.launched += 1
+
+    def shutdown(self) -> None:
+        """Stops the speculation threads; unused results count as wasted"""
+        with self._lock:
+            self._closed = True
+            self.stats.wasted += len(self._pending)
+            self._pending.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,485 @@
+"""
+Local stand-in for the Gemini generate_content endpoint
+
+Lets the orchestration code run (and be load-tested) without live API
+access. A StandInModel answers generate_content requests in one of three
+modes:
+
+  record    pass requests through to a real client and save each exchange
+            (function_call parts, usage_metadata, finish_reason) to a file
+  replay    answer from a recording, with configurable injected latency
+  scripted  answer from a fixed script of function calls and text, chosen by
+            how many model turns the conversation already has
+
+Any mode can also enforce a per-window request and token quota, rejecting
+requests over it with the same 429 RESOURCE_EXHAUSTED error the API sends.
+
+StandInClient mirrors the client.models / client.aio.models interface so it
+can be dropped in where a genai.Client is used. serve_standin() exposes the
+same model over HTTP at the REST path the SDK calls, so a real genai.Client
+pointed at its base_url works unchanged:
+
+    python -m fc_toolkit.standin --replay recording.jsonl.gz --latency 0.2 --port 8765
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from google.genai import errors, types
+
+from .history import estimate_tokens
+
+
+class ReplayMiss(LookupError):
+    """Raised in replay mode when no recorded exchange matches a request"""
+
+
+def as_contents(contents) -> list:
+    """Normalizes the contents argument of generate_content to a list of Content"""
+    if contents is None:
+        return []
+    if not isinstance(contents, (list, tuple)):
+        contents = [contents]
+
+    normalized, loose = [], None
+    for item in contents:
+        if isinstance(item, dict):
+            item = types.Content.model_validate(item)
+        if isinstance(item, str):
+            item = types.Part(text=item)
+        if isinstance(item, types.Part):
+            # Consecutive loose strings and parts are sent as one user turn
+            if loose is None:
+                loose = types.Content(role="user", parts=[])
+                normalized.append(loose)
+            loose.parts.append(item)
+        else:
+            loose = None
+            normalized.append(item)
+    return normalized
+
+
+def _part_key(part: types.Part):
+    if part.function_call:
+        return ["call", part.function_call.name, dict(part.function_call.args or {})]
+    if part.function_response:
+        return ["response", part.function_response.name, part.function_response.response]
+    if part.text is not None:
+        return ["text", part.text]
+    return ["other"]
+
+
+def exchange_key(model: str, contents: list, tool_names) -> str:
+    """Replay key for a request: the model, the conversation and the tool names offered.
+
+    Generation settings are left out on purpose so a recording keeps matching
+    when they are tweaked, and the key is the same whether the request came
+    through StandInClient or over HTTP.
+    """
+    flattened = [[content.role or "user", _part_key(part)] for content in contents for part in content.parts or ()]
+    payload = {"model": model.split("/")[-1], "contents": flattened, "tools": sorted(tool_names)}
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _config_tool_names(config) -> set:
+    if isinstance(config, dict):
+        config = types.GenerateContentConfig.model_validate(config)
+    names = set()
+    for tool in getattr(config, "tools", None) or ():
+        if callable(tool):
+            names.add(tool.__name__)
+        for declaration in getattr(tool, "function_declarations", None) or ():
+            names.add(declaration.name)
+    return names
+
+
+def _open(path: str, mode: str):
+    return gzip.open(path, mode + "t", encoding="utf-8") if path.endswith(".gz") else open(path, mode, encoding="utf-8")
+
+
+def load_recording(path: str) -> dict:
+    """Reads a recording file into a {key: GenerateContentResponse} dict"""
+    recording = {}
+    with _open(path, "r") as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                recording[entry["key"]] = types.GenerateContentResponse.model_validate(entry["response"])
+    return recording
+
+
+# -- Scripted responses ------------------------------------------------------
+
+def function_call_step(*calls) -> dict:
+    """A script step answering with function calls, each given as (name, args)"""
+    return {"function_calls": [{"name": name, "args": args} for name, args in calls]}
+
+
+def text_step(text) -> dict:
+    """A script step answering with text; text may be a function of the contents"""
+    return {"text": text}
+
+
+def build_response(step, contents: list) -> types.GenerateContentResponse:
+    """Turns a script step into a GenerateContentResponse with usage_metadata and finish_reason"""
+    if isinstance(step, types.GenerateContentResponse):
+        return step
+    if callable(step):
+        step = step(contents)
+        if isinstance(step, types.GenerateContentResponse):
+            return step
+
+    if "function_calls" in step:
+        parts = [types.Part(function_call=types.FunctionCall(name=c["name"], args=c.get("args") or {}))
+                 for c in step["function_calls"]]
+    else:
+        text = step["text"](contents) if callable(step["text"]) else step["text"]
+        parts = [types.Part(text=text)]
+
+    content = types.Content(role="model", parts=parts)
+    prompt_tokens = estimate_tokens(contents)
+    candidate_tokens = estimate_tokens([content])
+    return types.GenerateContentResponse(
+        candidates=[types.Candidate(content=content, finish_reason=types.FinishReason.STOP, index=0)],
+        usage_metadata=types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=prompt_tokens,
+            candidates_token_count=candidate_tokens,
+            total_token_count=prompt_tokens + candidate_tokens,
+        ),
+        model_version="stand-in",
+    )
+
+
+# -- The stand-in model ------------------------------------------------------
+
+@dataclass
+class StandInStats:
+    requests: int = 0
+    replay_hits: int = 0
+    replay_misses: int = 0
+    recorded: int = 0
+    throttled: int = 0
+
+
+class StandInModel:
+    """Answers generate_content requests locally.
+
+    Args:
+        mode: "scripted", "replay" or "record"
+        script: Scripted mode steps. The step used is the number of model turns
+            already in the request, so one script serves any number of
+            concurrent sessions. May also be a function(contents, config) -> step.
+        recording: Path of the recording file to replay from or record to
+        client: The real genai.Client to pass requests to in record mode
+        latency: Injected delay per request: seconds, a (low, high) range, or a function returning seconds
+        seed: Seed for the latency range, for repeatable runs
+        chunk_chars: Characters of text per chunk when streaming
+        chunk_delay: Seconds between streamed chunks
+        quota_requests: Requests allowed per quota_window; more are rejected with a 429
+        quota_tokens: Tokens (prompt + response) allowed per quota_window; more are rejected with a 429
+        quota_window: Length of the sliding quota window in seconds
+    """
+
+    def __init__(self, mode: str = "scripted", script=None, recording: str = None, client=None,
+                 latency=0.0, seed: int = None, chunk_chars: int = 40, chunk_delay: float = 0.0,
+                 quota_requests: int = None, quota_tokens: int = None, quota_window: float = 60.0):
+        if mode not in ("scripted", "replay", "record"):
+            raise ValueError(f"Unknown stand-in mode: {mode}")
+        if mode == "record" and (client is None or recording is None):
+            raise ValueError("record mode needs a client and a recording path")
+        if mode == "replay" and recording is None:
+            raise ValueError("replay mode needs a recording path")
+
+        self.mode = mode
+        self.script = script or []
+        self.recording_path = recording
+        self.client = client
+        self.latency = latency
+        self.chunk_chars = chunk_chars
+        self.chunk_delay = chunk_delay
+        self.quota_requests = quota_requests
+        self.quota_tokens = quota_tokens
+        self.quota_window = quota_window
+        self.stats = StandInStats()
+        # [time, tokens] of every request accepted inside the current quota window
+        self._usage = deque()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._recording = load_recording(recording) if mode == "replay" else {}
+
+    def delay(self) -> float:
+        """Seconds to wait before answering the next request"""
+        if callable(self.latency):
+            return self.latency()
+        if isinstance(self.latency, (tuple, list)):
+            with self._lock:
+                return self._random.uniform(*self.latency)
+        return self.latency or 0.0
+
+    def _check_quota(self) -> list:
+        """Admits a request, or raises the 429 the API returns when the request or token quota is used up
+
+        Returns:
+            The [time, tokens] entry booked for the request; its tokens are filled in by _charge.
+        """
+        now = time.monotonic()
+        with self._lock:
+            while self._usage and self._usage[0][0] <= now - self.quota_window:
+                self._usage.popleft()
+            over_requests = self.quota_requests is not None and len(self._usage) >= self.quota_requests
+            over_tokens = self.quota_tokens is not None and sum(t for _, t in self._usage) >= self.quota_tokens
+            if over_requests or over_tokens:
+                self.stats.throttled += 1
+                retry_after = self._usage[0][0] + self.quota_window - now
+            else:
+                entry = [now, 0]
+                self._usage.append(entry)
+                return entry
+
+        raise errors.ClientError(429, {"error": {
+            "code": 429,
+            "message": "Resource has been exhausted (e.g. check quota).",
+            "status": "RESOURCE_EXHAUSTED",
+            "details": [{"@type": "type.googleapis.com/google.rpc.RetryInfo",
+                         "retryDelay": f"{max(retry_after, 0):.3f}s"}],
+        }})
+
+    def _charge(self, entry: list, response: types.GenerateContentResponse) -> None:
+        """Books the tokens of an accepted request against the token quota"""
+        usage = response.usage_metadata
+        with self._lock:
+            entry[1] = (usage.total_token_count or 0) if usage is not None else 0
+
+    def respond(self, model: str, contents, config=None, tool_names=None) -> types.GenerateContentResponse:
+        """Produces the response for a request, without the injected latency"""
+        contents = as_contents(contents)
+        with self._lock:
+            self.stats.requests += 1
+
+        if self.quota_requests is not None or self.quota_tokens is not None:
+            entry = self._check_quota()
+            response = self._respond(model, contents, config, tool_names)
+            self._charge(entry, response)
+            return response
+        return self._respond(model, contents, config, tool_names)
+
+    def _respond(self, model: str, contents: list, config, tool_names) -> types.GenerateContentResponse:
+        if self.mode == "scripted":
+            if callable(self.script):
+                return build_response(self.script(contents, config), contents)
+            model_turns = sum(1 for content in contents if content.role == "model")
+            step = self.script[min(model_turns, len(self.script) - 1)]
+            return build_response(step, contents)
+
+        names = tool_names if tool_names is not None else _config_tool_names(config)
+        key = exchange_key(model, contents, names)
+
+        if self.mode == "replay":
+            response = self._recording.get(key)
+            with self._lock:
+                if response is None:
+                    self.stats.replay_misses += 1
+                else:
+                    self.stats.replay_hits += 1
+            if response is None:
+                raise ReplayMiss(f"No recorded response for this request (key {key[:12]})")
+            return response
+
+        # Record mode: ask the real model and append the exchange to the recording
+        response = self.client.models.generate_content(model=model, contents=contents, config=config)
+        line = json.dumps({"key": key, "model": model,
+                           "response": response.model_dump(mode="json", exclude_none=True)},
+                          separators=(",", ":"))
+        with self._lock, _open(self.recording_path, "a") as f:
+            f.write(line + "\n")
+            self.stats.recorded += 1
+        return response
+
+
+def stream_chunks(response: types.GenerateContentResponse, chunk_chars: int) -> list:
+    """Splits a response into the chunks generate_content_stream would yield.
+
+    Text is cut into pieces of chunk_chars characters, each function call is a
+    chunk of its own, and the last chunk carries finish_reason and usage_metadata.
+    """
+    candidate = response.candidates[0] if response.candidates else None
+    parts = candidate.content.parts if candidate and candidate.content else []
+
+    pieces = []
+    for part in parts or ():
+        if part.text:
+            pieces.extend(types.Part(text=part.text[i:i + chunk_chars])
+                          for i in range(0, len(part.text), chunk_chars))
+        else:
+            pieces.append(part)
+
+    chunks = [types.GenerateContentResponse(candidates=[
+        types.Candidate(content=types.Content(role="model", parts=[piece]), index=0)]) for piece in pieces]
+    if not chunks:
+        chunks = [types.GenerateContentResponse(candidates=[types.Candidate(index=0)])]
+
+    chunks[-1].candidates[0].finish_reason = candidate.finish_reason if candidate else types.FinishReason.STOP
+    chunks[-1].usage_metadata = response.usage_metadata
+    return chunks
+
+
+class _Models:
+    def __init__(self, model: StandInModel):
+        self._model = model
+
+    def generate_content(self, *, model: str, contents, config=None):
+        response = self._model.respond(model, contents, config)
+        delay = self._model.delay()
+        if self._model.chunk_delay:
+            # A blocking call waits for the whole response to be generated
+            delay += self._model.chunk_delay * (len(stream_chunks(response, self._model.chunk_chars)) - 1)
+        if delay:
+            time.sleep(delay)
+        return response
+
+    def generate_content_stream(self, *, model: str, contents, config=None):
+        response = self._model.respond(model, contents, config)
+        delay = self._model.delay()
+        if delay:
+            time.sleep(delay)
+        for index, chunk in enumerate(stream_chunks(response, self._model.chunk_chars)):
+            if index and self._model.chunk_delay:
+                time.sleep(self._model.chunk_delay)
+            yield chunk
+
+
+class _AsyncModels:
+    def __init__(self, model: StandInModel):
+        self._model = model
+
+    async def generate_content(self, *, model: str, contents, config=None):
+        response = self._model.respond(model, contents, config)
+        delay = self._model.delay()
+        if delay:
+            await asyncio.sleep(delay)
+        return response
+
+
+class _Aio:
+    def __init__(self, model: StandInModel):
+        self.models = _AsyncModels(model)
+
+
+class StandInClient:
+    """Drop-in replacement for genai.Client backed by a StandInModel"""
+
+    def __init__(self, model: StandInModel = None, **kwargs):
+        self.model = model or StandInModel(**kwargs)
+        self.models = _Models(self.model)
+        self.aio = _Aio(self.model)
+
+
+def client_from_env(**client_kwargs):
+    """Returns a genai.Client, or a stand-in when $FC_STANDIN asks for one.
+
+    FC_STANDIN=record:<file> passes requests to the real API and records them,
+    FC_STANDIN=replay:<file> answers from that recording without network access.
+    FC_STANDIN_LATENCY adds a delay (seconds) to every replayed response.
+    """
+    import os
+
+    from google import genai
+
+    setting = os.environ.get("FC_STANDIN", "")
+    if not setting:
+        return genai.Client(**client_kwargs)
+
+    mode, _, path = setting.partition(":")
+    latency = float(os.environ.get("FC_STANDIN_LATENCY", "0") or 0)
+    if mode == "record":
+        return StandInClient(mode="record", recording=path, client=genai.Client(**client_kwargs))
+    if mode == "replay":
+        return StandInClient(mode="replay", recording=path, latency=latency)
+    raise ValueError(f"FC_STANDIN must be record:<file> or replay:<file>, got {setting!r}")
+
+
+# -- HTTP front end ----------------------------------------------------------
+
+def serve_standin(model: StandInModel, host: str = "127.0.0.1", port: int = 0):
+    """Serves the stand-in at the Gemini REST path in a background thread.
+
+    Point a real client at it with
+    genai.Client(api_key="local", http_options=types.HttpOptions(base_url=base_url)).
+
+    Returns:
+        A (server, base_url) tuple. Call server.shutdown() when done.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            path = self.path.split("?", 1)[0]
+            if not path.endswith(":generateContent"):
+                return self._send(404, {"error": {"code": 404, "message": f"Unsupported path {path}"}})
+
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            model_name = path.rsplit("/", 1)[-1].split(":", 1)[0]
+            contents = [types.Content.model_validate(c) for c in body.get("contents", [])]
+            names = {d["name"] for tool in body.get("tools", []) for d in tool.get("functionDeclarations", [])}
+
+            try:
+                response = model.respond(model_name, contents, tool_names=names)
+            except ReplayMiss as e:
+                return self._send(404, {"error": {"code": 404, "message": str(e), "status": "NOT_FOUND"}})
+            except errors.APIError as e:
+                return self._send(e.code, e.details)
+
+            delay = model.delay()
+            if delay:
+                time.sleep(delay)
+            self._send(200, response.model_dump(mode="json", by_alias=True, exclude_none=True))
+
+        def _send(self, status: int, payload: dict):
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the Gemini generate_content endpoint")
+    parser.add_argument("--replay", required=True, help="recording file to answer from")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    server, base_url = serve_standin(StandInModel(mode="replay", recording=args.replay, latency=args.latency),
+                                     args.host, args.port)
+    print(f"Stand-in serving {args.replay} at {base_url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Streaming responses with early tool dispatch
+
+With the blocking generate_content, nothing happens until the whole response
+has arrived. Streaming with generate_content_stream lets two things start
+earlier:
+
+  - each function_call part is handed to a worker thread the moment its chunk
+    arrives, so tools run while later parts are still being generated
+  - final-answer text is passed to the caller chunk by chunk as it arrives
+"""
+
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from google.genai import types
+
+from .dispatch import ToolDispatcher
+from .parallel import DEFAULT_MAX_WORKERS
+
+
+@dataclass
+class StreamedTurn:
+    """Everything one streamed model turn produced.
+
+    Attributes:
+        model_content: The full model Content, rebuilt from the chunks, to append to the history
+        text: All answer text the model streamed in this turn, thoughts left out
+        function_calls: The FunctionCalls, in the order they arrived
+        function_responses: The user Content with every function_response part (None if no calls)
+        finish_reason: finish_reason of the final chunk
+        usage_metadata: usage_metadata of the final chunk
+    """
+    model_content: types.Content
+    text: str = ""
+    function_calls: list = field(default_factory=list)
+    function_responses: types.Content = None
+    finish_reason: object = None
+    usage_metadata: object = None
+
+
+def _run_tool(dispatcher: ToolDispatcher, function_call):
+    if dispatcher.is_async(function_call.name):
+        return asyncio.run(dispatcher.call_async(function_call.name, function_call.args))
+    return dispatcher.call(function_call.name, function_call.args)
+
+
+def _merge_text(parts: list) -> types.Part:
+    """One Part for a run of streamed text parts, keeping its thought flag and thought_signature"""
+    signature = next((part.thought_signature for part in parts if part.thought_signature), None)
+    return types.Part(text="".join(part.text for part in parts), thought=parts[0].thought,
+                      thought_signature=signature)
+
+
+def _starts_new_run(run: list, part: types.Part) -> bool:
+    # Thoughts and answer text stay apart, and every signature keeps a part of its own to be echoed back on
+    if bool(part.thought) != bool(run[0].thought):
+        return True
+    return bool(part.thought_signature) and any(earlier.thought_signature for earlier in run)
+
+
+def stream_turn(client, *, model: str, contents, config, dispatcher: ToolDispatcher,
+                on_text=None, executor: ThreadPoolExecutor = None) -> StreamedTurn:
+    """Streams one model turn, starting each function call as soon as it arrives.
+
+    Args:
+        client: A genai.Client (or StandInClient)
+        model: Model name
+        contents: The conversation so far
+        config: GenerateContentConfig with the tools (automatic function calling off)
+        dispatcher: ToolDispatcher used to execute the calls
+        on_text: Called with each answer text chunk as it arrives
+        executor: Thread pool to run tools on; a temporary one is used if not given
+
+    Returns:
+        A StreamedTurn. Its function_responses are complete, in call order.
+    """
+    owns_executor = executor is None
+    if owns_executor:
+        executor = ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS)
+
+    parts, text_buffer, text_chunks = [], [], []
+    function_calls, futures = [], []
+    finish_reason = usage_metadata = None
+
+    try:
+        for chunk in client.models.generate_content_stream(model=model, contents=contents, config=config):
+            if chunk.usage_metadata is not None:
+                usage_metadata = chunk.usage_metadata
+            if not chunk.candidates:
+                continue
+            candidate = chunk.candidates[0]
+            if candidate.finish_reason is not None:
+                finish_reason = candidate.finish_reason
+            if candidate.content is None:
+                continue
+
+            for part in candidate.content.parts or ():
+                if part.function_call:
+                    # Start the tool straight away, the rest of the response can keep streaming
+                    function_calls.append(part.function_call)
+                    futures.append(executor.submit(
+                        contextvars.copy_context().run, _run_tool, dispatcher, part.function_call))
+                elif part.text is not None:
+                    # Text chunks are merged back into one part; a chunk may carry only a thought_signature
+                    if text_buffer and _starts_new_run(text_buffer, part):
+                        parts.append(_merge_text(text_buffer))
+                        text_buffer = []
+                    text_buffer.append(part)
+                    # Thoughts stay in the history but aren't part of the answer
+                    if part.text and not part.thought:
+                        text_chunks.append(part.text)
+                        if on_text is not None:
+                            on_text(part.text)
+                    continue
+                if text_buffer:
+                    parts.append(_merge_text(text_buffer))
+                    text_buffer = []
+                parts.append(part)
+
+        if text_buffer:
+            parts.append(_merge_text(text_buffer))
+
+        function_responses = None
+        if function_calls:
+            function_responses = types.Content(role="user", parts=[
+                dispatcher.response_part(call.name, future.result())
+                for call, future in zip(function_calls, futures)])
+    finally:
+        if owns_executor:
+            executor.shutdown(wait=False)
+
+    return StreamedTurn(
+        model_content=types.Content(role="model", parts=parts),
+        text="".join(text_chunks),
+        function_calls=function_calls,
+        function_responses=function_responses,
+        finish_reason=finish_reason,
+        usage_metadata=usage_metadata,
+    )
+
+
+def stream_conversation(client, *, model: str, contents: list, config, dispatcher: ToolDispatcher,
+                        on_text=None, max_rounds: int = 10, max_workers: int = DEFAULT_MAX_WORKERS) -> StreamedTurn:
+    """Streams turns, executing function calls early, until the model gives a final answer.
+
+    contents is extended in place with every model turn and function response,
+    so it holds the whole conversation afterwards.
+
+    Returns:
+        The final StreamedTurn (the one without function calls, or the last one
+        if max_rounds was reached).
+    """
+    if max_rounds < 1:
+        raise ValueError("max_rounds must be at least 1")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for _ in range(max_rounds):
+            turn = stream_turn(client, model=model, contents=contents, config=config,
+                               dispatcher=dispatcher, on_text=on_text, executor=executor)
+            contents.append(turn.model_content)
+            if not turn.function_calls:
+                return turn
+            contents.append(turn.function_responses)
+    return turn
@@ -0,0 +1,185 @@
+"""
+Token usage accounting and budgets
+
+Records the usage_metadata of every generate_content response per request,
+per session and per tool declaration set, and enforces budgets before a
+request is sent: a request projected to go over max_prompt_tokens is first
+compacted (when its contents are a ConversationHistory) and otherwise
+refused, and a session that has used up max_session_tokens is refused.
+"""
+
+import json
+import threading
+from collections import defaultdict, deque
+from dataclasses import dataclass
+
+from .history import ConversationHistory, estimate_tokens
+from .standin import as_contents
+
+
+class TokenBudgetExceeded(Exception):
+    """Raised instead of sending a request that would go over a token budget.
+
+    Attributes:
+        budget: Which budget was hit, "prompt" or "session"
+        projected: The projected (or already used) token count
+        limit: The configured limit
+    """
+
+    def __init__(self, budget: str, projected: int, limit: int):
+        super().__init__(f"{budget} token budget exceeded: {projected} > {limit}")
+        self.budget = budget
+        self.projected = projected
+        self.limit = limit
+
+
+@dataclass
+class UsageTotals:
+    """Summed usage_metadata counts"""
+    requests: int = 0
+    prompt_tokens: int = 0
+    candidates_tokens: int = 0
+    total_tokens: int = 0
+
+    def add(self, prompt: int, candidates: int, total: int) -> None:
+        self.requests += 1
+        self.prompt_tokens += prompt
+        self.candidates_tokens += candidates
+        self.total_tokens += total
+
+
+@dataclass
+class UsageRecord:
+    """Usage of a single request"""
+    session: str
+    tool_set: str
+    projected_prompt_tokens: int
+    prompt_tokens: int
+    candidates_tokens: int
+    total_tokens: int
+
+
+def tool_set_key(config) -> str:
+    """Identifies the set of function declarations in a config, e.g. "check_balance,transfer_money" """
+    names = []
+    for tool in getattr(config, "tools", None) or ():
+        for declaration in getattr(tool, "function_declarations", None) or ():
+            names.append(declaration.name)
+        if callable(tool):
+            names.append(tool.__name__)
+    return ",".join(sorted(names)) or "(none)"
+
+
+def _tools_tokens(config) -> int:
+    """Rough token cost of the tool declarations sent with every request"""
+    total = 0
+    for tool in getattr(config, "tools", None) or ():
+        if hasattr(tool, "model_dump_json"):
+            total += len(tool.model_dump_json(exclude_none=True)) // 4
+        elif callable(tool):
+            total += len(tool.__name__ + (tool.__doc__ or "")) // 4
+        else:
+            total += len(json.dumps(tool, default=str)) // 4
+    return total
+
+
+class UsageTracker:
+    """Keeps running token totals and enforces budgets.
+
+    Args:
+        max_prompt_tokens: Refuse (or compact) requests projected above this many prompt tokens
+        max_session_tokens: Refuse requests for a session once it has used this many total tokens
+        count_tokens: Function estimating the tokens of a list of Content objects
+        keep_records: How many per-request records to keep
+    """
+
+    def __init__(self, max_prompt_tokens: int = None, max_session_tokens: int = None,
+                 count_tokens=estimate_tokens, keep_records: int = 1000):
+        self.max_prompt_tokens = max_prompt_tokens
+        self.max_session_tokens = max_session_tokens
+        self.count_tokens = count_tokens
+        self.totals = UsageTotals()
+        self.sessions = defaultdict(UsageTotals)
+        self.tool_sets = defaultdict(UsageTotals)
+        self.records = deque(maxlen=keep_records)
+        # Actual / estimated prompt tokens, learned from responses to correct projections
+        self.calibration = 1.0
+        self._tool_tokens = {}
+        self._lock = threading.Lock()
+
+    def _tool_set_tokens(self, config) -> int:
+        key = tool_set_key(config)
+        with self._lock:
+            tokens = self._tool_tokens.get(key)
+        if tokens is None:
+            tokens = _tools_tokens(config)
+            with self._lock:
+                self._tool_tokens[key] = tokens
+        return tokens
+
+    def project_prompt_tokens(self, contents, config=None) -> int:
+        """Estimates the prompt tokens of a request: contents plus tool declarations.
+
+        contents takes any form generate_content accepts: a string, a Content,
+        or a list of either.
+        """
+        estimate = self.count_tokens(as_contents(contents))
+        tool_tokens = self._tool_set_tokens(config)
+        with self._lock:
+            calibration = self.calibration
+        return int((estimate + tool_tokens) * calibration)
+
+    def check(self, contents, config=None, session: str = "default") -> int:
+        """Raises TokenBudgetExceeded if the request would break a budget, else returns its projection"""
+        if self.max_session_tokens is not None:
+            with self._lock:
+                used = self.sessions[session].total_tokens
+            if used >= self.max_session_tokens:
+                raise TokenBudgetExceeded("session", used, self.max_session_tokens)
+
+        projected = self.project_prompt_tokens(contents, config)
+        if self.max_prompt_tokens is not None and projected > self.max_prompt_tokens:
+            raise TokenBudgetExceeded("prompt", projected, self.max_prompt_tokens)
+        return projected
+
+    def record(self, response, config=None, session: str = "default", projected: int = None) -> UsageRecord:
+        """Adds a response's usage_metadata to the totals"""
+        usage = getattr(response, "usage_metadata", None)
+        prompt = getattr(usage, "prompt_token_count", None) or 0
+        candidates = getattr(usage, "candidates_token_count", None) or 0
+        total = getattr(usage, "total_token_count", None) or prompt + candidates
+        key = tool_set_key(config)
+
+        with self._lock:
+            self.totals.add(prompt, candidates, total)
+            self.sessions[session].add(prompt, candidates, total)
+            self.tool_sets[key].add(prompt, candidates, total)
+            if projected and prompt:
+                # Exponential moving average of how far off the estimates are
+                raw = projected / self.calibration
+                self.calibration = 0.8 * self.calibration + 0.2 * (prompt / raw)
+
+        record = UsageRecord(session, key, projected or 0, prompt, candidates, total)
+        self.records.append(record)
+        return record
+
+    def generate_content(self, client, *, model: str, contents, config=None, session: str = "default"):
+        """Calls client.models.generate_content within the budgets and records the usage.
+
+        contents may be a ConversationHistory, in which case it is compacted
+        further when the request would otherwise exceed max_prompt_tokens.
+        """
+        if isinstance(contents, ConversationHistory):
+            budget = contents.token_budget
+            if self.max_prompt_tokens is not None:
+                # Leave room for the tool declarations and the estimate correction
+                with self._lock:
+                    calibration = self.calibration
+                room = int(self.max_prompt_tokens / calibration) - self._tool_set_tokens(config)
+                budget = min(budget, max(0, room))
+            contents = contents.contents(token_budget=budget)
+
+        projected = self.check(contents, config, session)
+        response = client.models.generate_content(model=model, contents=contents, config=config)
+        self.record(response, config, session, projected)
+        return response
@@ -0,0 +1,217 @@
+"""
+Argument validators compiled from declaration schemas
+
+The model's function_call.args are loosely typed: integers arrive as 3.0,
+booleans as "true", required keys go missing. Each declaration's parameters
+schema is compiled once into a validator that coerces what it safely can and
+collects everything else as problems, so a bad call is rejected with a
+structured error before the tool ever runs.
+
+Supported: string, integer, number, boolean, array, object, enum, required,
+minimum/maximum and ranges written in the description as "(1-10)".
+"""
+
+import re
+
+from google.genai import types
+
+from .errors import ToolError
+
+# Matches ranges such as "(1-10)" or "(1 - 7)" in a parameter description
+_RANGE_RE = re.compile(r"\((-?\d+(?:\.\d+)?)\s*-\s*(-?\d+(?:\.\d+)?)\)")
+_INT_RE = re.compile(r"^[+-]?\d+$")
+
+
+class InvalidArguments(ToolError):
+    """Raised when a call's arguments don't match the declaration.
+
+    Attributes:
+        problems: List of {"argument": ..., "problem": ...} dicts, one per issue found
+    """
+
+    def __init__(self, problems: list):
+        message = "; ".join(f"{p['argument']}: {p['problem']}" for p in problems)
+        super().__init__("invalid_arguments", f"Invalid arguments: {message}", problems)
+        self.problems = problems
+
+
+class _Invalid(Exception):
+    """Internal signal that a single value could not be coerced"""
+
+
+def _schema_dict(schema) -> dict:
+    """Normalizes a types.Schema or a declaration dict schema to a plain dict with lowercase types"""
+    if isinstance(schema, types.Schema):
+        schema = schema.model_dump(mode="json", exclude_none=True)
+    return schema or {}
+
+
+def _type_name(schema: dict) -> str:
+    return str(schema.get("type", "")).lower()
+
+
+def _coerce_integer(value):
+    if isinstance(value, bool):
+        raise _Invalid("expected an integer, got a boolean")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and _INT_RE.match(value.strip()):
+        return int(value)
+    raise _Invalid(f"expected an integer, got {value!r}")
+
+
+def _coerce_number(value):
+    if isinstance(value, bool):
+        raise _Invalid("expected a number, got a boolean")
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    raise _Invalid(f"expected a number, got {value!r}")
+
+
+def _coerce_boolean(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+        return value.strip().lower() == "true"
+    raise _Invalid(f"expected a boolean, got {value!r}")
+
+
+def _coerce_string(value):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        # IDs sometimes come back as numbers
+        return str(value)
+    raise _Invalid(f"expected a string, got {value!r}")
+
+
+_SCALARS = {
+    "integer": _coerce_integer,
+    "number": _coerce_number,
+    "boolean": _coerce_boolean,
+    "string": _coerce_string,
+}
+
+
+def _compile(schema: dict):
+    """Turns one schema node into a function value -> coerced value (raises _Invalid)"""
+    type_name = _type_name(schema)
+    steps = []
+
+    if type_name in _SCALARS:
+        steps.append(_SCALARS[type_name])
+    elif type_name == "array":
+        item = _compile(_schema_dict(schema.get("items")))
+
+        def check_array(value):
+            if not isinstance(value, (list, tuple)):
+                raise _Invalid(f"expected a list, got {value!r}")
+            return [item(v) for v in value]
+        steps.append(check_array)
+    elif type_name == "object" and schema.get("properties"):
+        nested = compile_schema(schema)
+
+        def check_object(value):
+            if not isinstance(value, dict):
+                raise _Invalid(f"expected an object, got {value!r}")
+            try:
+                return nested(value)
+            except InvalidArguments as e:
+                raise _Invalid("; ".join(f"{p['argument']}: {p['problem']}" for p in e.problems))
+        steps.append(check_object)
+
+    if schema.get("enum"):
+        allowed = tuple(schema["enum"])
+        allowed_set = frozenset(allowed)
+
+        def check_enum(value):
+            if value not in allowed_set:
+                raise _Invalid(f"must be one of {', '.join(map(str, allowed))}")
+            return value
+        steps.append(check_enum)
+
+    low, high = schema.get("minimum"), schema.get("maximum")
+    range_match = _RANGE_RE.search(schema.get("description") or "")
+    if range_match and type_name in ("integer", "number"):
+        low = float(range_match.group(1)) if low is None else low
+        high = float(range_match.group(2)) if high is None else high
+    if low is not None or high is not None:
+        def check_range(value):
+            if (low is not None and value < low) or (high is not None and value > high):
+                raise _Invalid(f"must be between {_fmt(low)} and {_fmt(high)}")
+            return value
+        steps.append(check_range)
+
+    if len(steps) == 1:
+        return steps[0]
+
+    def run(value):
+        for step in steps:
+            value = step(value)
+        return value
+    return run
+
+
+def _fmt(bound) -> str:
+    if bound is None:
+        return "any"
+    return str(int(bound)) if float(bound).is_integer() else str(bound)
+
+
+def compile_schema(parameters):
+    """Compiles a parameters schema into a validator.
+
+    Args:
+        parameters: The "parameters" object schema, as a dict or types.Schema
+
+    Returns:
+        A function taking the raw args mapping and returning a new dict of
+        coerced arguments. It raises InvalidArguments listing every problem.
+    """
+    parameters = _schema_dict(parameters)
+    properties = {name: _compile(_schema_dict(schema))
+                  for name, schema in (parameters.get("properties") or {}).items()}
+    required = tuple(parameters.get("required") or ())
+
+    def validate(args) -> dict:
+        coerced = dict(args) if args else {}
+        problems = []
+
+        for name in required:
+            if coerced.get(name) is None:
+                problems.append({"argument": name, "problem": "is required"})
+
+        for name, value in list(coerced.items()):
+            check = properties.get(name)
+            if value is None:
+                # An explicit null for an optional argument means "use the default"
+                del coerced[name]
+            elif check is not None:
+                try:
+                    coerced[name] = check(value)
+                except _Invalid as e:
+                    problems.append({"argument": name, "problem": str(e)})
+
+        if problems:
+            raise InvalidArguments(problems)
+        return coerced
+
+    return validate
+
+
+def compile_declaration(declaration):
+    """Compiles the parameters of a declaration dict or types.FunctionDeclaration.
+
+    Returns:
+        A (name, validator) tuple.
+    """
+    if isinstance(declaration, types.FunctionDeclaration):
+        return declaration.name, compile_schema(declaration.parameters)
+    return declaration["name"], compile_schema(declaration.get("parameters"))